@@ -6,7 +6,9 @@ a = Analysis(
     pathex=['.'],
     binaries=[],
     datas=[('translations.json', '.')],
-    hiddenimports=['PIL.Image'],
+    # Crypto e zipfile são importados dentro das funções que os usam (para abrir
+    # a janela mais rápido); ficam listados aqui para o pacote sempre incluí-los
+    hiddenimports=['PIL.Image', 'Crypto.Cipher.AES', 'zipfile'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -16,6 +18,9 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# Em modo arquivo único o executável é extraído para uma pasta temporária a cada
+# execução, o que domina o tempo de abertura; para inicialização mais rápida,
+# gere em modo pasta (exclude_binaries=True no EXE + COLLECT).
 exe = EXE(
     pyz,
     a.scripts,
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Execução de tarefas em segundo plano para a interface Tkinter
+
+As operações demoradas (backup, restauração, exclusão) rodam em um pool de
+threads. As threads nunca tocam nos widgets: o progresso e o resultado vão
+para uma fila que a thread do Tk esvazia periodicamente com root.after.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Intervalo mínimo entre dois avisos de progresso da mesma tarefa
+PROGRESS_INTERVAL = 0.05
+
+
+class JobCancelled(Exception):
+    """Levantada dentro de uma tarefa quando o usuário pede o cancelamento"""
+
+
+class JobContext:
+    """Canal entre a tarefa (na thread de trabalho) e a interface"""
+
+    def __init__(self, job: "Job"):
+        self._job = job
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """
+        Raises:
+            JobCancelled: Se o cancelamento foi pedido
+        """
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(self, done_bytes: int, total_bytes: int):
+        """Envia o progresso para a interface, sem verificar cancelamento"""
+        now = time.monotonic()
+        if done_bytes < total_bytes and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        self._job.runner._events.put(("progress", self._job, (done_bytes, total_bytes)))
+
+    def progress(self, done_bytes: int, total_bytes: int):
+        """
+        Envia o progresso e interrompe a tarefa se o cancelamento foi pedido
+
+        Raises:
+            JobCancelled: Se o cancelamento foi pedido
+        """
+        self.check_cancelled()
+        self.report(done_bytes, total_bytes)
+
+
+class Job:
+    """Tarefa enviada ao JobRunner"""
+
+    def __init__(self, runner: "JobRunner", job_id: int, name: str,
+                 on_progress: Optional[Callable], on_done: Optional[Callable],
+                 on_error: Optional[Callable]):
+        self.runner = runner
+        self.id = job_id
+        self.name = name
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.started = time.monotonic()
+        self.finished = False
+
+    def cancel(self):
+        """Pede o cancelamento (a tarefa para no próximo ponto de verificação)"""
+        self.cancel_event.set()
+
+
+class JobRunner:
+    """Pool de threads cujos callbacks são executados na thread do Tk"""
+
+    def __init__(self, root, max_workers: int = 2, poll_interval_ms: int = 100):
+        """
+        Args:
+            root: Janela Tk (usada apenas para agendar a leitura da fila)
+            max_workers: Número máximo de tarefas simultâneas
+            poll_interval_ms: Intervalo de leitura da fila
+        """
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repo-job")
+        self._events = queue.Queue()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, Job] = {}
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        """Indica se há tarefas em andamento"""
+        return bool(self._jobs)
+
+    def submit(self, name: str, func: Callable, *args,
+               on_progress: Optional[Callable] = None,
+               on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> Job:
+        """
+        Executa func(context, *args, **kwargs) em segundo plano
+
+        Args:
+            name: Nome da tarefa
+            func: Função da tarefa; recebe um JobContext como primeiro argumento
+            on_progress: Chamado na thread do Tk com (job, feitos, total, bytes_por_segundo)
+            on_done: Chamado na thread do Tk com (job, resultado)
+            on_error: Chamado na thread do Tk com (job, exceção); JobCancelled indica cancelamento
+
+        Returns:
+            Job: Tarefa criada
+        """
+        job = Job(self, next(self._ids), name, on_progress, on_done, on_error)
+        self._jobs[job.id] = job
+        context = JobContext(job)
+
+        def run():
+            try:
+                result = func(context, *args, **kwargs)
+            except BaseException as e:
+                self._events.put(("error", job, e))
+            else:
+                self._events.put(("done", job, result))
+
+        self._executor.submit(run)
+        self._schedule_poll()
+        return job
+
+    def cancel_all(self):
+        """Pede o cancelamento de todas as tarefas em andamento"""
+        for job in list(self._jobs.values()):
+            job.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """Cancela as tarefas e encerra o pool"""
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """Esvazia a fila de eventos na thread do Tk"""
+        self._polling = False
+        latest_progress = {}
+        finished = []
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # Só o último progresso de cada tarefa interessa
+                latest_progress[job.id] = (job, payload)
+            else:
+                finished.append((kind, job, payload))
+
+        for job, (done_bytes, total_bytes) in latest_progress.values():
+            if job.on_progress and not job.finished:
+                elapsed = max(time.monotonic() - job.started, 1e-6)
+                job.on_progress(job, done_bytes, total_bytes, done_bytes / elapsed)
+
+        for kind, job, payload in finished:
+            job.finished = True
+            self._jobs.pop(job.id, None)
+            callback = job.on_done if kind == "done" else job.on_error
+            if callback:
+                callback(job, payload)
+            elif kind == "error":
+                print(f"Erro na tarefa {job.name}: {payload}")
+
+        if self._jobs:
+            self._schedule_poll()
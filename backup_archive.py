@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formato de backup em arquivo compactado R.E.P.O
+
+Cada backup histórico pode ser gravado como um único .zip. O diretório
+central do zip funciona como índice: a lista e os tamanhos dos arquivos são
+lidos sem descompactar nada, e cada arquivo pode ser extraído sozinho.
+
+A compressão é decidida arquivo a arquivo por uma estimativa rápida de
+entropia: saves .es3 são criptografados (AES) e não se compactam, então são
+guardados sem compressão; os demais arquivos são compactados.
+
+Além dos arquivos da pasta, o zip guarda um manifesto (ARCHIVE_MANIFEST) com
+hash, tamanho e mtime exato de cada arquivo, já que o zip só tem precisão de
+2 segundos. Hash e tamanho são calculados sobre os bytes gravados no zip,
+durante a própria gravação.
+
+O zipfile só é importado quando um backup compactado é usado, para não pesar
+na inicialização da interface.
+"""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import zipfile
+
+ARCHIVE_SUFFIX = ".zip"
+ARCHIVE_MANIFEST = ".repo_manifest.json"
+ARCHIVE_FORMAT = 1
+ENTROPY_SAMPLE_SIZE = 64 * 1024
+# Acima disso (bits por byte) o conteúdo é tratado como já compactado/criptografado
+STORE_ENTROPY_THRESHOLD = 7.5
+# Arquivos grandes e compressíveis usam LZMA; os pequenos, DEFLATE (mais rápido de abrir)
+LZMA_MIN_SIZE = 1024 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def byte_entropy(data: bytes) -> float:
+    """
+    Calcula a entropia de Shannon de um trecho de bytes
+
+    Returns:
+        float: Entropia em bits por byte (0 a 8)
+    """
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+def choose_compression(file_path: str, size: int) -> int:
+    """
+    Escolhe o método de compressão de um arquivo pelo início do seu conteúdo
+
+    Args:
+        file_path: Arquivo a analisar
+        size: Tamanho do arquivo
+
+    Returns:
+        int: zipfile.ZIP_STORED, ZIP_DEFLATED ou ZIP_LZMA
+    """
+    import zipfile
+
+    with open(file_path, 'rb') as f:
+        sample = f.read(ENTROPY_SAMPLE_SIZE)
+    if byte_entropy(sample) >= STORE_ENTROPY_THRESHOLD:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_LZMA if size >= LZMA_MIN_SIZE else zipfile.ZIP_DEFLATED
+
+
+def _write_member(archive: "zipfile.ZipFile", file_path: str, rel_path: str) -> Dict:
+    """
+    Grava um arquivo no zip calculando o hash dos bytes gravados
+
+    Returns:
+        Dict: Entrada do manifesto (sha256, size e mtime_ns) do que entrou no zip
+    """
+    import zipfile
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(file_path, 'rb') as src:
+        # mtime de antes da leitura: se o arquivo mudar durante a gravação, o
+        # próximo backup incremental o relê
+        stat = os.fstat(src.fileno())
+        info = zipfile.ZipInfo.from_file(file_path, rel_path, strict_timestamps=False)
+        info.compress_type = choose_compression(file_path, stat.st_size)
+        with archive.open(info, 'w') as dst:
+            for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+                digest.update(block)
+                dst.write(block)
+                size += len(block)
+    return {"sha256": digest.hexdigest(), "size": size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_archive(source_path: str, archive_path: str, scan: Dict,
+                  on_written: Optional[Callable[[int], None]] = None) -> Tuple[int, Dict]:
+    """
+    Grava uma pasta como backup em arquivo compactado
+
+    O zip é montado num arquivo temporário e só aparece com o nome final
+    quando está completo. O manifesto descreve os bytes lidos durante a
+    gravação, e não os da leitura de scan (o jogo pode ter gravado o save
+    entre as duas).
+
+    Args:
+        source_path: Pasta de origem
+        archive_path: Caminho do .zip a criar
+        scan: Arquivos ("files": caminho -> sha256/size/mtime_ns) e pastas ("dirs")
+        on_written: Chamado com o tamanho de cada arquivo gravado; pode
+            levantar uma exceção para interromper
+
+    Returns:
+        Tuple[int, Dict]: Tamanho do .zip gravado e os arquivos do manifesto
+            (caminho -> sha256/size/mtime_ns)
+    """
+    import zipfile
+
+    directory = os.path.dirname(archive_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', allowZip64=True, strict_timestamps=False) as archive:
+            for rel_dir in scan["dirs"]:
+                archive.writestr(zipfile.ZipInfo(rel_dir + "/"), b"")
+            files = {}
+            for rel_path in scan["files"]:
+                file_path = os.path.join(source_path, *rel_path.split("/"))
+                files[rel_path] = _write_member(archive, file_path, rel_path)
+                if on_written:
+                    on_written(files[rel_path]["size"])
+            manifest = {
+                "format": ARCHIVE_FORMAT,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "files": files,
+                "dirs": scan["dirs"]
+            }
+            archive.writestr(ARCHIVE_MANIFEST, json.dumps(manifest, separators=(',', ':')),
+                             compress_type=zipfile.ZIP_DEFLATED)
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return os.path.getsize(archive_path), files
+
+
+def read_archive_index(archive_path: str) -> Dict:
+    """
+    Lê apenas o diretório central de um backup compactado
+
+    Args:
+        archive_path: Caminho do .zip
+
+    Returns:
+        Dict: Número de arquivos ("file_count"), tamanho original ("size") e
+            tamanho compactado ("compressed_size")
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se o arquivo não for um zip válido
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir() and info.filename != ARCHIVE_MANIFEST]
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Backup compactado inválido: {e}") from e
+    return {
+        "file_count": len(members),
+        "size": sum(info.file_size for info in members),
+        "compressed_size": sum(info.compress_size for info in members)
+    }
+
+
+def load_archive_manifest(archive: "zipfile.ZipFile") -> Dict:
+    """
+    Carrega o manifesto de um backup compactado aberto
+
+    Backups sem manifesto (criados por outra ferramenta) são descritos a
+    partir do diretório central, sem hash e com o mtime do zip.
+    """
+    try:
+        return json.loads(archive.read(ARCHIVE_MANIFEST))
+    except KeyError:
+        files = {}
+        dirs = []
+        for info in archive.infolist():
+            if info.is_dir():
+                dirs.append(info.filename.rstrip("/"))
+                continue
+            mtime = datetime(*info.date_time).timestamp()
+            files[info.filename] = {"sha256": None, "size": info.file_size, "mtime_ns": int(mtime * 1e9)}
+        return {"format": ARCHIVE_FORMAT, "files": files, "dirs": dirs}
+
+
+def read_archive_manifest(archive_path: str) -> Dict:
+    """
+    Lê o manifesto de um backup compactado (arquivos com hash, tamanho e mtime)
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se o arquivo não for um zip válido
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            return load_archive_manifest(archive)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Backup compactado inválido: {e}") from e
+
+
+def _member_path(dest_path: str, rel_path: str) -> str:
+    """Monta o caminho de destino de um membro, recusando caminhos fora de dest_path"""
+    parts = rel_path.split("/")
+    if rel_path.startswith("/") or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"Caminho inválido no backup: {rel_path}")
+    return os.path.join(dest_path, *parts)
+
+
+def _extract_member(archive: "zipfile.ZipFile", rel_path: str, dest_file: str, mtime_ns: int):
+    with archive.open(rel_path) as src, open(dest_file, 'wb') as dst:
+        for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+            dst.write(block)
+    os.utime(dest_file, ns=(mtime_ns, mtime_ns))
+
+
+def extract_archive(archive_path: str, dest_path: str,
+                    on_extracted: Optional[Callable[[int], None]] = None):
+    """
+    Extrai um backup compactado inteiro para uma pasta nova
+
+    Args:
+        archive_path: Caminho do .zip
+        dest_path: Pasta de destino (não pode existir)
+        on_extracted: Chamado com o tamanho de cada arquivo extraído; pode
+            levantar uma exceção para interromper
+    """
+    import zipfile
+
+    with zipfile.ZipFile(archive_path) as archive:
+        manifest = load_archive_manifest(archive)
+        os.makedirs(dest_path)
+        for rel_dir in manifest["dirs"]:
+            os.makedirs(_member_path(dest_path, rel_dir), exist_ok=True)
+        for rel_path, entry in manifest["files"].items():
+            dest_file = _member_path(dest_path, rel_path)
+            os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+            _extract_member(archive, rel_path, dest_file, entry["mtime_ns"])
+            if on_extracted:
+                on_extracted(entry["size"])
+
+
+def extract_archive_file(archive_path: str, rel_path: str, dest_file: str):
+    """
+    Extrai um único arquivo de um backup compactado, sem ler os demais
+
+    Args:
+        archive_path: Caminho do .zip
+        rel_path: Caminho do arquivo dentro do backup (separado por "/")
+        dest_file: Arquivo de destino
+
+    Raises:
+        FileNotFoundError: Se o arquivo não estiver no backup
+    """
+    import zipfile
+
+    with zipfile.ZipFile(archive_path) as archive:
+        entry = load_archive_manifest(archive)["files"].get(rel_path)
+        if entry is None:
+            raise FileNotFoundError(rel_path)
+        _extract_member(archive, rel_path, dest_file, entry["mtime_ns"])
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Política de retenção dos backups históricos R.E.P.O
+
+Cada backup cria um <pasta>_backup_<timestamp> novo; sem limpeza a pasta de
+backups cresce sem limite (e a lista da interface fica mais lenta de ler).
+A política decide, por pasta de save, quais backups históricos manter:
+
+- keep_last: os N mais recentes
+- keep_hourly / keep_daily / keep_weekly: o mais recente de cada uma das N
+  últimas horas / dias / semanas (ISO) que têm backup
+- max_bytes: depois das regras acima, exclui os backups mais antigos (de
+  todas as pastas) até o total caber no limite
+
+Um backup é mantido se qualquer regra o mantiver. O valor 0 desliga a regra;
+sem nenhuma regra keep_*, todos os backups passam para a etapa de max_bytes.
+O backup mais recente de cada pasta nunca é excluído, e o backup atual
+(<pasta>/) não entra na conta.
+
+No repositório deduplicado os objetos são compartilhados entre backups, então
+o espaço liberado por um backup é o manifesto mais os objetos que só ele
+referencia; a estimativa conta as referências de todos os manifestos.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from backup_store import BackupStore, ProgressCallback, original_folder_name, scan_backups
+
+RETENTION_KEYS = ("keep_last", "keep_hourly", "keep_daily", "keep_weekly", "max_bytes")
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Chave do período de cada regra de intervalo
+_BUCKETS = {
+    "keep_hourly": lambda time: (time.year, time.month, time.day, time.hour),
+    "keep_daily": lambda time: (time.year, time.month, time.day),
+    "keep_weekly": lambda time: time.isocalendar()[:2],
+}
+
+
+def load_policy(config: Optional[Dict]) -> Dict[str, int]:
+    """
+    Lê a política de retenção (chave "retention" do config.json)
+
+    Valores ausentes, inválidos ou negativos viram 0 (regra desligada).
+
+    Returns:
+        Dict[str, int]: Valor de cada chave de RETENTION_KEYS
+    """
+    policy = {}
+    for key in RETENTION_KEYS:
+        try:
+            policy[key] = max(0, int((config or {}).get(key, 0)))
+        except (TypeError, ValueError):
+            policy[key] = 0
+    return policy
+
+
+def policy_enabled(policy: Dict[str, int]) -> bool:
+    """Verifica se alguma regra da política está ligada"""
+    return any(policy.get(key) for key in RETENTION_KEYS)
+
+
+def backup_time(backup: Dict) -> datetime:
+    """
+    Data de um backup histórico, pelo timestamp no nome
+
+    Backups com nome fora do padrão usam a data de criação do arquivo. O
+    sufixo de backups do mesmo segundo (_02, _03...) é ignorado.
+    """
+    _, _, suffix = backup["name"].rpartition("_backup_")
+    try:
+        return datetime.strptime(suffix[:15], TIMESTAMP_FORMAT)
+    except ValueError:
+        return datetime.fromtimestamp(backup["created"])
+
+
+def select_kept(times: List[datetime], policy: Dict[str, int]) -> List[bool]:
+    """
+    Aplica as regras keep_* aos backups de uma pasta
+
+    Args:
+        times: Datas dos backups, do mais recente para o mais antigo
+        policy: Política de retenção
+
+    Returns:
+        List[bool]: Se cada backup é mantido, na mesma ordem de times
+    """
+    if not any(policy.get(key) for key in RETENTION_KEYS[:-1]):
+        return [True] * len(times)
+
+    kept = [index < policy.get("keep_last", 0) for index in range(len(times))]
+    for key, bucket in _BUCKETS.items():
+        limit = policy.get(key, 0)
+        seen = set()
+        for index, time in enumerate(times):
+            if len(seen) >= limit:
+                break
+            period = bucket(time)
+            if period not in seen:
+                # O primeiro backup de cada período é o mais recente dele
+                seen.add(period)
+                kept[index] = True
+    if kept:
+        kept[0] = True
+    return kept
+
+
+def plan_retention(store: BackupStore, policy: Dict[str, int],
+                   folders: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Calcula quais backups históricos a política exclui, sem excluir nada
+
+    Args:
+        store: Repositório de backups
+        policy: Política de retenção (load_policy)
+        folders: Pastas de save a considerar (padrão: todas); o limite
+            max_bytes vale para o total de todas as pastas
+
+    Returns:
+        Dict: Backups a excluir ("delete": nome, pasta e regra responsável),
+            bytes que serão liberados ("estimated_bytes") e total dos
+            backups históricos antes e depois ("total_bytes", "remaining_bytes")
+    """
+    folders = set(folders) if folders else None
+    backups, _ = scan_backups(store.saves_base_path)
+    by_folder = {}
+    for backup in backups:
+        if backup["kind"] == "historical":
+            by_folder.setdefault(original_folder_name(backup["name"]), []).append(
+                (backup_time(backup), backup["name"])
+            )
+
+    # Tamanho próprio de cada backup e contagem de referências dos objetos
+    own_bytes = {}
+    objects = {}
+    object_sizes = {}
+    references = Counter()
+    for entries in by_folder.values():
+        for _, name in entries:
+            own_bytes[name], objects[name] = store.measure(name)
+            object_sizes.update(objects[name])
+            references.update(objects[name].keys())
+    total = sum(own_bytes.values()) + sum(object_sizes.values())
+
+    def release(name: str) -> int:
+        freed = own_bytes[name]
+        for digest in objects[name]:
+            references[digest] -= 1
+            if not references[digest]:
+                freed += object_sizes[digest]
+        return freed
+
+    delete = []
+    candidates = []
+    remaining = total
+    for folder_name, entries in sorted(by_folder.items()):
+        if folders is not None and folder_name not in folders:
+            continue
+        entries.sort(reverse=True)
+        kept = select_kept([time for time, _ in entries], policy)
+        for (time, name), keep in zip(entries, kept):
+            if not keep:
+                remaining -= release(name)
+                delete.append({"backup": name, "folder": folder_name, "reason": "policy"})
+            elif name != entries[0][1]:
+                candidates.append((time, name, folder_name))
+
+    max_bytes = policy.get("max_bytes", 0)
+    if max_bytes:
+        # Os mais antigos primeiro, de qualquer pasta
+        for _, name, folder_name in sorted(candidates):
+            if remaining <= max_bytes:
+                break
+            remaining -= release(name)
+            delete.append({"backup": name, "folder": folder_name, "reason": "max_bytes"})
+
+    return {
+        "delete": delete,
+        "estimated_bytes": total - remaining,
+        "total_bytes": total,
+        "remaining_bytes": remaining
+    }
+
+
+def apply_retention(store: BackupStore, policy: Dict[str, int],
+                    folders: Optional[Iterable[str]] = None, dry_run: bool = False,
+                    progress: ProgressCallback = None) -> Dict:
+    """
+    Exclui os backups históricos que a política não mantém
+
+    Args:
+        store: Repositório de backups
+        policy: Política de retenção (load_policy)
+        folders: Pastas de save a considerar (padrão: todas)
+        dry_run: Só calcula o plano, sem excluir
+        progress: Callback de progresso (bytes liberados, bytes totais)
+
+    Returns:
+        Dict: O plano de plan_retention e os bytes realmente liberados
+            ("freed", 0 em dry_run)
+    """
+    plan = plan_retention(store, policy, folders)
+    plan["freed"] = 0
+    if plan["delete"] and not dry_run:
+        plan["freed"] = store.delete_many([entry["backup"] for entry in plan["delete"]], progress=progress)
+    return plan
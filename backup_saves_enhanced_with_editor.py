@@ -28,11 +28,24 @@ Integra funcionalidades do R.E.P.O-Save-Editor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-import shutil
 import json
+import queue
 from datetime import datetime
+from itertools import islice
 import platform
 from save_editor_core import SaveEditorCore
+from save_schema import WORLD_FIELDS
+from backup_store import (BackupStore, BACKUP_DIR_NAME, format_size,
+                          scan_backups, scan_save_folders)
+from save_index import SaveIndex
+from backup_archive import read_archive_index
+from copy_engine import COPY_STRATEGIES, DEFAULT_COPY_WORKERS
+from backup_retention import apply_retention, load_policy, plan_retention, policy_enabled
+from backup_scrub import scrub
+from save_diff import diff_backup
+from background_jobs import JobCancelled, JobRunner
+import instrumentation
+from instrumentation import phase, profile_call
 import sys
 
 def resource_path(relative_path):
@@ -86,9 +99,14 @@ class ModernStyle:
 class SaveEditorWindow:
     """Janela para edição de saves do jogo R.E.P.O"""
     
-    def __init__(self, parent, save_file_path, translations, current_language):
+    # Filhos criados por vez ao expandir um objeto ou lista na aba JSON
+    JSON_PAGE_SIZE = 500
+    JSON_PREVIEW_LENGTH = 120
+    
+    def __init__(self, parent, save_file_path, translations, current_language, compact=False):
         self.parent = parent
         self.save_file_path = save_file_path
+        self.compact = compact
         self.translations = translations
         self.current_language = current_language
         self.save_editor = SaveEditorCore()
@@ -205,26 +223,12 @@ class SaveEditorWindow:
         # Obter dados do mundo
         world_data = self.save_editor.get_world_data()
         
-        # Criar campos de entrada
+        # Criar campos de entrada (um por campo do esquema)
         self.world_entries = {}
-        
-        # Nome da equipe
-        self.create_entry_field(world_frame, "team_name", world_data.get("team_name", ""), 0)
-        
-        # Nível
-        self.create_entry_field(world_frame, "level", world_data.get("level", 1), 1, entry_type="int")
-        
-        # Moeda
-        self.create_entry_field(world_frame, "currency", world_data.get("currency", 0), 2, entry_type="int")
-        
-        # Vidas
-        self.create_entry_field(world_frame, "lives", world_data.get("lives", 3), 3, entry_type="int")
-        
-        # Estação de carregamento
-        self.create_entry_field(world_frame, "charging_station", world_data.get("charging_station", 100), 4, entry_type="int")
-        
-        # Total de carga
-        self.create_entry_field(world_frame, "total_haul", world_data.get("total_haul", 0), 5, entry_type="int")
+        for row, field in enumerate(WORLD_FIELDS.values()):
+            entry_type = "int" if field.type is int else "str"
+            self.create_entry_field(world_frame, field.name, world_data.get(field.name, field.default), row,
+                                    entry_type=entry_type)
         
     def create_players_tab(self):
         """Cria a aba de dados dos jogadores"""
@@ -233,6 +237,7 @@ class SaveEditorWindow:
         
         # Obter dados dos jogadores
         players_data = self.save_editor.get_player_data()
+        self.player_entries = {}
         
         if not players_data:
             no_players_label = tk.Label(
@@ -249,16 +254,14 @@ class SaveEditorWindow:
         players_notebook = ttk.Notebook(players_frame)
         players_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        self.player_entries = {}
-        
         for player in players_data:
             player_frame = tk.Frame(players_notebook, bg=ModernStyle.BG_LIGHT)
             players_notebook.add(player_frame, text=f"{player["name"]} (ID: {player["id"]})")
             
-            self.player_entries[player["id"]] = {}
+            self.player_entries[player["id"]] = {"health": None, "upgrades": {}}
             
-            # Vida do jogador
-            self.create_player_entry_field(player_frame, player["id"], "health", player["health"], 0)
+            # Vida do jogador (o upgrade de vida também se chama "health")
+            self.create_player_entry_field(player_frame, player["id"], "health", player["health"], 0, upgrade=False)
             
             # Upgrades
             upgrades = player["upgrades"]
@@ -268,35 +271,204 @@ class SaveEditorWindow:
                 row += 1
                 
     def create_raw_json_tab(self):
-        """Cria a aba de edição JSON bruta"""
+        """Cria a aba de edição JSON bruta (árvore montada sob demanda)"""
         json_frame = tk.Frame(self.notebook, bg=ModernStyle.BG_MEDIUM)
         self.notebook.add(json_frame, text=self.get_text("raw_json"))
         
-        # Área de texto para JSON
-        text_frame = tk.Frame(json_frame, bg=ModernStyle.BG_MEDIUM)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Edições pendentes (caminho -> novo valor), aplicadas só ao salvar
+        self.json_edits = {}
+        self.json_dirty = False
+        # Item da árvore -> caminho no JSON
+        self.json_paths = {}
+        # Item "mais itens" -> (item pai, caminho do pai, próximo índice)
+        self.json_more = {}
+        self.json_selected = None
         
-        # Scrollbar
-        scrollbar = tk.Scrollbar(text_frame)
+        # Estilo da árvore
+        style = ttk.Style()
+        style.configure("Treeview", background=ModernStyle.BG_DARK, fieldbackground=ModernStyle.BG_DARK,
+                        foreground=ModernStyle.TEXT_PRIMARY, font=("Consolas", 10))
+        style.configure("Treeview.Heading", background=ModernStyle.BG_LIGHT, foreground=ModernStyle.TEXT_PRIMARY)
+        
+        # Árvore do JSON
+        tree_frame = tk.Frame(json_frame, bg=ModernStyle.BG_MEDIUM)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        
+        scrollbar = tk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Text widget
-        self.json_text = tk.Text(
-            text_frame,
+        self.json_tree = ttk.Treeview(tree_frame, columns=("value",), yscrollcommand=scrollbar.set)
+        self.json_tree.heading("#0", text=self.get_text("key"))
+        self.json_tree.heading("value", text=self.get_text("value"))
+        self.json_tree.column("#0", width=250, stretch=False)
+        self.json_tree.tag_configure("modified", foreground=ModernStyle.WARNING_ORANGE)
+        self.json_tree.tag_configure("more", foreground=ModernStyle.TEXT_MUTED)
+        self.json_tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.json_tree.yview)
+        
+        self.json_tree.bind("<<TreeviewOpen>>", self.on_json_open)
+        self.json_tree.bind("<<TreeviewSelect>>", self.on_json_select)
+        self.json_tree.bind("<Double-1>", self.on_json_activate)
+        
+        # Edição do valor selecionado
+        edit_frame = tk.Frame(json_frame, bg=ModernStyle.BG_MEDIUM)
+        edit_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.json_value_entry = tk.Entry(
+            edit_frame,
             bg=ModernStyle.BG_DARK,
             fg=ModernStyle.TEXT_PRIMARY,
+            disabledbackground=ModernStyle.BG_MEDIUM,
             font=("Consolas", 10),
-            yscrollcommand=scrollbar.set,
-            wrap=tk.WORD
+            relief=tk.FLAT,
+            bd=1,
+            state=tk.DISABLED
         )
-        self.json_text.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.json_text.yview)
+        self.json_value_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.json_value_entry.bind("<Return>", lambda event: self.apply_json_value())
         
-        # Inserir JSON atual
+        apply_btn = tk.Button(
+            edit_frame,
+            text=self.get_text("apply"),
+            command=self.apply_json_value,
+            bg=ModernStyle.BG_LIGHT,
+            fg=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 10),
+            relief=tk.FLAT,
+            padx=15
+        )
+        apply_btn.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # Só o primeiro nível é criado agora; o resto, ao expandir
         if self.save_editor.is_file_loaded():
-            json_str = json.dumps(self.save_editor.json_data, indent=2, ensure_ascii=False)
-            self.json_text.insert(tk.END, json_str)
+            self.insert_json_children("", (), self.save_editor.json_data)
+            
+    def get_json_value(self, path):
+        """Obtém o valor atual de um caminho, considerando as edições pendentes"""
+        for length in range(len(path), -1, -1):
+            if path[:length] in self.json_edits:
+                value = self.json_edits[path[:length]]
+                break
+        else:
+            length = 0
+            value = self.save_editor.json_data
+        for key in path[length:]:
+            value = value[key]
+        return value
+        
+    def json_preview(self, value):
+        """Texto exibido na coluna de valor"""
+        if isinstance(value, dict):
+            return f"{{{len(value)}}}"
+        if isinstance(value, list):
+            return f"[{len(value)}]"
+        text = json.dumps(value, ensure_ascii=False)
+        if len(text) > self.JSON_PREVIEW_LENGTH:
+            text = text[:self.JSON_PREVIEW_LENGTH] + "…"
+        return text
+        
+    def insert_json_children(self, parent, path, value, start=0):
+        """Insere na árvore uma página de filhos de um objeto ou lista"""
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        end = start + self.JSON_PAGE_SIZE
+        for key, child in islice(items, start, end):
+            child_path = path + (key,)
+            tags = ("modified",) if child_path in self.json_edits else ()
+            item = self.json_tree.insert(parent, tk.END, text=str(key), values=(self.json_preview(child),), tags=tags)
+            self.json_paths[item] = child_path
+            if isinstance(child, (dict, list)) and child:
+                # Marcador só para exibir a seta; os filhos são criados ao expandir
+                self.json_tree.insert(item, tk.END, text="…", tags=("placeholder",))
+                
+        if len(value) > end:
+            more = self.json_tree.insert(
+                parent, tk.END,
+                text=self.get_text("more_items").format(count=len(value) - end),
+                tags=("more",)
+            )
+            self.json_more[more] = (parent, path, end)
+            
+    def on_json_open(self, event):
+        """Cria os filhos de um nó na primeira vez em que é expandido"""
+        item = self.json_tree.focus()
+        children = self.json_tree.get_children(item)
+        if len(children) == 1 and self.json_tree.tag_has("placeholder", children[0]):
+            self.json_tree.delete(children[0])
+            path = self.json_paths[item]
+            self.insert_json_children(item, path, self.get_json_value(path))
+            
+    def on_json_activate(self, event):
+        """Duplo clique: carrega a próxima página ou edita o valor"""
+        item = self.json_tree.identify_row(event.y)
+        if item in self.json_more:
+            parent, path, start = self.json_more.pop(item)
+            self.json_tree.delete(item)
+            self.insert_json_children(parent, path, self.get_json_value(path), start)
+        elif item in self.json_paths and str(self.json_value_entry.cget("state")) == tk.NORMAL:
+            self.json_value_entry.focus_set()
+            self.json_value_entry.select_range(0, tk.END)
+            
+    def on_json_select(self, event):
+        """Mostra o valor selecionado no campo de edição (só valores simples)"""
+        selection = self.json_tree.selection()
+        item = selection[0] if selection else None
+        self.json_selected = item if item in self.json_paths else None
+        
+        self.json_value_entry.config(state=tk.NORMAL)
+        self.json_value_entry.delete(0, tk.END)
+        if self.json_selected is None:
+            self.json_value_entry.config(state=tk.DISABLED)
+            return
             
+        value = self.get_json_value(self.json_paths[self.json_selected])
+        if isinstance(value, (dict, list)):
+            self.json_value_entry.config(state=tk.DISABLED)
+        else:
+            self.json_value_entry.insert(0, value if isinstance(value, str) else json.dumps(value))
+            
+    def apply_json_value(self):
+        """Guarda a edição do valor selecionado como pendente"""
+        item = self.json_selected
+        if item is None or str(self.json_value_entry.cget("state")) != tk.NORMAL:
+            return
+            
+        path = self.json_paths[item]
+        current = self.get_json_value(path)
+        text = self.json_value_entry.get()
+        # Textos continuam textos; os demais valores são lidos como JSON
+        if isinstance(current, str):
+            value = text
+        else:
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError as e:
+                messagebox.showerror(self.get_text("error"), f"JSON inválido: {str(e)}")
+                return
+                
+        if type(value) is type(current) and value == current:
+            return
+            
+        # Edições feitas antes dentro deste valor deixam de valer
+        for edited in [edited for edited in self.json_edits if edited[:len(path)] == path]:
+            del self.json_edits[edited]
+        self.json_edits[path] = value
+        self.json_dirty = True
+        
+        for child in self.json_tree.get_children(item):
+            self.forget_json_item(child)
+        self.json_tree.item(item, values=(self.json_preview(value),), tags=("modified",))
+        if isinstance(value, (dict, list)) and value:
+            self.json_tree.insert(item, tk.END, text="…", tags=("placeholder",))
+        self.on_json_select(None)
+        
+    def forget_json_item(self, item):
+        """Remove um item da árvore e os seus registros"""
+        for child in self.json_tree.get_children(item):
+            self.forget_json_item(child)
+        self.json_paths.pop(item, None)
+        self.json_more.pop(item, None)
+        self.json_tree.delete(item)
+        
     def create_entry_field(self, parent, field_name, value, row, entry_type="str"):
         """Cria um campo de entrada para dados do mundo"""
         # Label
@@ -324,9 +496,9 @@ class SaveEditorWindow:
         # Configurar grid
         parent.grid_columnconfigure(1, weight=1)
         
-        self.world_entries[field_name] = {"entry": entry, "type": entry_type}
+        self.world_entries[field_name] = {"entry": entry, "type": entry_type, "initial": str(value)}
         
-    def create_player_entry_field(self, parent, player_id, field_name, value, row):
+    def create_player_entry_field(self, parent, player_id, field_name, value, row, upgrade=True):
         """Cria um campo de entrada para dados do jogador"""
         # Label
         label = tk.Label(
@@ -355,37 +527,49 @@ class SaveEditorWindow:
         # Configurar grid
         parent.grid_columnconfigure(1, weight=1)
         
-        if player_id not in self.player_entries:
-            self.player_entries[player_id] = {}
-        self.player_entries[player_id][field_name] = entry
+        field = {"entry": entry, "initial": str(value)}
+        if upgrade:
+            self.player_entries[player_id]["upgrades"][field_name] = field
+        else:
+            self.player_entries[player_id]["health"] = field
         
     def save_changes(self):
         """Salva as alterações no arquivo"""
         try:
-            # Atualizar dados do mundo
+            # Só os campos alterados são validados e aplicados
             world_data = {}
             for field_name, field_info in self.world_entries.items():
                 value = field_info["entry"].get()
+                if value == field_info["initial"]:
+                    continue
                 if field_info["type"] == "int":
                     value = int(value)
                 world_data[field_name] = value
                 
             # Validar e atualizar dados do mundo
-            valid, message = self.save_editor.validate_world_data(world_data)
-            if not valid:
-                messagebox.showerror(self.get_text("error"), message)
-                return
-                
-            self.save_editor.update_world_data(world_data)
+            if world_data:
+                valid, message = self.save_editor.validate_world_data(world_data, partial=True)
+                if not valid:
+                    messagebox.showerror(self.get_text("error"), message)
+                    return
+                    
+                self.save_editor.update_world_data(world_data)
             
             # Atualizar dados dos jogadores
             for player_id, player_fields in self.player_entries.items():
-                health = int(player_fields["health"].get())
+                health = None
+                health_field = player_fields["health"]
+                if health_field and health_field["entry"].get() != health_field["initial"]:
+                    health = int(health_field["entry"].get())
                 upgrades = {}
-                for field_name, entry in player_fields.items():
-                    if field_name != "health":
-                        upgrades[field_name] = int(entry.get())
+                for field_name, field_info in player_fields["upgrades"].items():
+                    value = field_info["entry"].get()
+                    if value != field_info["initial"]:
+                        upgrades[field_name] = int(value)
                         
+                if health is None and not upgrades:
+                    continue
+                    
                 # Validar e atualizar dados do jogador
                 valid, message = self.save_editor.validate_player_data(player_id, health, upgrades)
                 if not valid:
@@ -394,18 +578,16 @@ class SaveEditorWindow:
                     
                 self.save_editor.update_player_data(player_id, health, upgrades)
             
-            # Atualizar JSON bruto se foi modificado
-            json_content = self.json_text.get("1.0", tk.END).strip()
-            if json_content:
-                try:
-                    new_json_data = json.loads(json_content)
-                    self.save_editor.json_data = new_json_data
-                except json.JSONDecodeError as e:
-                    messagebox.showerror(self.get_text("error"), f"JSON inválido: {str(e)}")
-                    return
+            # Edições da aba JSON são aplicadas por último (e só se houver alguma)
+            if self.json_dirty:
+                for path, value in self.json_edits.items():
+                    if not self.save_editor.set_value(path, value):
+                        messagebox.showerror(self.get_text("error"), f"Valor inválido: {'/'.join(map(str, path))}")
+                        return
             
             # Salvar arquivo
-            success, message = self.save_editor.save_file(self.save_file_path)
+            # Sem alterações, save_file não grava nada
+            success, message = self.save_editor.save_file(self.save_file_path, compact=self.compact)
             if success:
                 messagebox.showinfo(self.get_text("success"), message)
                 self.window.destroy()
@@ -420,9 +602,22 @@ class SaveEditorWindow:
 class BackupSavesEnhancedApp:
     """Aplicação principal de backup e edição de saves"""
     
+    # Intervalo para conferir os avisos do backup automático
+    WATCH_POLL_MS = 500
+    
     def __init__(self, root):
         self.root = root
         self.current_language = "pt"
+        self.incremental_backup = True
+        self.copy_workers = DEFAULT_COPY_WORKERS
+        self.copy_strategy = "auto"
+        self.delta_saves = False
+        self.backup_format = "store"
+        self.compact_saves = False
+        self.retention = load_policy(None)
+        self.watch_saves = False
+        self.instrumentation = False
+        self.profile_jobs = False
         
         # Carregar traduções
         # Caminho ajustado para a estrutura de pasta única
@@ -437,6 +632,27 @@ class BackupSavesEnhancedApp:
         
         # Carregar configurações
         self.load_config()
+        self.apply_instrumentation()
+        
+        # Cache dos resumos dos saves (ao lado do config.json)
+        self.save_index = SaveIndex(resource_path("save_index.json"))
+        
+        # Backup, restauração e exclusão rodam em segundo plano
+        self.jobs = JobRunner(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<F12>", lambda event: self.show_debug_panel())
+        
+        # A leitura das listas também, para a janela aparecer antes do disco ser lido
+        self.list_jobs = JobRunner(self.root, max_workers=1)
+        self.lists_loading = False
+        self.lists_stale = False
+        self.lists_status = None
+        
+        # Backup automático: o monitor avisa numa fila, esvaziada pela thread do Tk
+        self.watcher = None
+        self.watch_poll_id = None
+        self.watch_events = queue.Queue()
+        self.watch_pending = []
         
         # Criar interface
         self.create_widgets()
@@ -444,6 +660,9 @@ class BackupSavesEnhancedApp:
         # Atualizar listas
         self.update_lists()
         
+        if self.watch_saves:
+            self.start_watching()
+        
     def setup_main_window(self):
         """Configura a janela principal"""
         self.root.title(self.get_text("app_title"))
@@ -488,7 +707,18 @@ class BackupSavesEnhancedApp:
                 config = json.load(f)
                 self.current_language = config.get('language', 'pt')
                 self.saves_base_path = config.get('saves_path', self.saves_base_path)
-        except (FileNotFoundError, json.JSONDecodeError):
+                self.incremental_backup = config.get('incremental_backup', True)
+                self.copy_workers = max(1, int(config.get('copy_workers', DEFAULT_COPY_WORKERS)))
+                if config.get('copy_strategy') in COPY_STRATEGIES:
+                    self.copy_strategy = config['copy_strategy']
+                self.backup_format = config.get('backup_format', 'store')
+                self.compact_saves = bool(config.get('compact_saves', False))
+                self.delta_saves = bool(config.get('delta_saves', False))
+                self.retention = load_policy(config.get('retention'))
+                self.watch_saves = bool(config.get('watch_saves', False))
+                self.instrumentation = bool(config.get('instrumentation', False))
+                self.profile_jobs = bool(config.get('profile_jobs', False))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
             pass
             
     def save_config(self):
@@ -496,7 +726,17 @@ class BackupSavesEnhancedApp:
         config_file = resource_path("config.json")
         config = {
             'language': self.current_language,
-            'saves_path': self.saves_base_path
+            'saves_path': self.saves_base_path,
+            'incremental_backup': self.incremental_backup,
+            'copy_workers': self.copy_workers,
+            'copy_strategy': self.copy_strategy,
+            'backup_format': self.backup_format,
+            'compact_saves': self.compact_saves,
+            'delta_saves': self.delta_saves,
+            'retention': self.retention,
+            'watch_saves': self.watch_saves,
+            'instrumentation': self.instrumentation,
+            'profile_jobs': self.profile_jobs
         }
         try:
             with open(config_file, 'w', encoding='utf-8') as f:
@@ -591,6 +831,22 @@ class BackupSavesEnhancedApp:
         )
         refresh_btn.pack(side=tk.RIGHT, padx=5, pady=15)
         
+        # Backup automático ao gravar um save
+        self.watch_var = tk.BooleanVar(value=self.watch_saves)
+        watch_check = tk.Checkbutton(
+            config_frame,
+            text="👁 " + self.get_text("auto_backup"),
+            variable=self.watch_var,
+            command=self.toggle_watch,
+            bg=ModernStyle.BG_MEDIUM,
+            fg=ModernStyle.TEXT_PRIMARY,
+            selectcolor=ModernStyle.BG_DARK,
+            activebackground=ModernStyle.BG_MEDIUM,
+            activeforeground=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 9)
+        )
+        watch_check.pack(side=tk.RIGHT, padx=5, pady=15)
+        
         # Frame principal com duas colunas
         main_frame = tk.Frame(self.root, bg=ModernStyle.BG_DARK)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -726,11 +982,53 @@ class BackupSavesEnhancedApp:
         )
         delete_btn.pack(side=tk.LEFT, padx=5)
         
+        # Botão Limpar Backups Antigos (política de retenção)
+        prune_btn = tk.Button(
+            button_frame,
+            text="🧹 " + self.get_text("prune_backups"),
+            command=self.prune_backups,
+            bg=ModernStyle.BG_LIGHT,
+            fg=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 11, "bold"),
+            relief=tk.FLAT,
+            padx=20,
+            pady=10
+        )
+        prune_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Botão Verificar Backups
+        verify_btn = tk.Button(
+            button_frame,
+            text="🛡️ " + self.get_text("verify_backups"),
+            command=self.verify_backups,
+            bg=ModernStyle.BG_LIGHT,
+            fg=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 11, "bold"),
+            relief=tk.FLAT,
+            padx=20,
+            pady=10
+        )
+        verify_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Botão Comparar Backup com o save atual
+        compare_btn = tk.Button(
+            button_frame,
+            text="🔍 " + self.get_text("compare_backup"),
+            command=self.compare_backup,
+            bg=ModernStyle.BG_LIGHT,
+            fg=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 11, "bold"),
+            relief=tk.FLAT,
+            padx=20,
+            pady=10
+        )
+        compare_btn.pack(side=tk.LEFT, padx=5)
+        
         # Botão Sair
         exit_btn = tk.Button(
             button_frame,
             text="❌ " + self.get_text("exit"),
-            command=self.root.quit,
+            command=self.on_close,
             bg=ModernStyle.BG_LIGHT,
             fg=ModernStyle.TEXT_PRIMARY,
             font=("Segoe UI", 11),
@@ -741,9 +1039,12 @@ class BackupSavesEnhancedApp:
         exit_btn.pack(side=tk.RIGHT, padx=5)
         
         # Barra de status
+        status_frame = tk.Frame(self.root, bg=ModernStyle.BG_MEDIUM)
+        status_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
         self.status_var = tk.StringVar(value=self.get_text("ready"))
         status_bar = tk.Label(
-            self.root,
+            status_frame,
             textvariable=self.status_var,
             font=("Segoe UI", 9),
             bg=ModernStyle.BG_MEDIUM,
@@ -752,7 +1053,35 @@ class BackupSavesEnhancedApp:
             relief=tk.FLAT,
             bd=1
         )
-        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+        status_bar.pack(fill=tk.X, side=tk.LEFT, expand=True)
+        
+        # Progresso da tarefa em segundo plano
+        self.cancel_btn = tk.Button(
+            status_frame,
+            text=self.get_text("cancel"),
+            command=self.jobs.cancel_all,
+            bg=ModernStyle.BG_LIGHT,
+            fg=ModernStyle.TEXT_PRIMARY,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            padx=10,
+            state=tk.DISABLED
+        )
+        self.cancel_btn.pack(side=tk.RIGHT, padx=5)
+        
+        self.rate_var = tk.StringVar(value="")
+        tk.Label(
+            status_frame,
+            textvariable=self.rate_var,
+            font=("Segoe UI", 9),
+            bg=ModernStyle.BG_MEDIUM,
+            fg=ModernStyle.TEXT_SECONDARY,
+            width=12,
+            anchor=tk.E
+        ).pack(side=tk.RIGHT)
+        
+        self.progress_bar = ttk.Progressbar(status_frame, length=200, mode="determinate", maximum=1)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5, pady=2)
         
     def show_language_menu(self):
         """Mostra o menu de seleção de idioma"""
@@ -825,62 +1154,172 @@ class BackupSavesEnhancedApp:
             self.folder_var.set(folder)
             self.save_config()
             self.update_lists()
+            if self.watcher:
+                self.stop_watching()
+                self.start_watching()
             
-    def update_lists(self):
-        """Atualiza as listas de saves e backups"""
-        # Limpar listas
-        self.saves_listbox.delete(0, tk.END)
-        self.backups_listbox.delete(0, tk.END)
-        
-        # Verificar se a pasta existe
-        if not os.path.exists(self.saves_base_path):
-            self.status_var.set(self.get_text("folder_not_found"))
+    def update_lists(self, status_message=None):
+        """Atualiza as listas de saves e backups em segundo plano"""
+        # Mensagem exibida quando as listas terminarem de carregar
+        self.lists_status = status_message or self.get_text("ready")
+        if self.lists_loading:
+            # Já há uma leitura em andamento: repetir quando ela terminar
+            self.lists_stale = True
             return
+        self.lists_loading = True
+        self.lists_stale = False
+        self.status_var.set(self.get_text("loading_lists"))
+        self.list_jobs.submit("update_lists", self.run_profiled, "update_lists", self.collect_lists, self.saves_base_path,
+                              on_done=self.show_lists, on_error=self.show_lists_error)
+        
+    def collect_lists(self, job, saves_base_path):
+        """Lê as pastas e monta as linhas das listas (executado fora da thread do Tk)"""
+        # Verificar se a pasta existe
+        if not os.path.exists(saves_base_path):
+            return {"error": "folder_not_found"}
             
-        # Listar pastas de save
+        with phase("lists.walk") as timer:
+            # Listar backups (uma passada só; os nomes viram um conjunto para consulta)
+            try:
+                backups, backup_dirs = scan_backups(saves_base_path)
+            except PermissionError:
+                backups, backup_dirs = [], set()
+                
+            # Listar pastas de save
+            try:
+                save_folders = scan_save_folders(saves_base_path, backup_dirs)
+            except PermissionError:
+                return {"error": "permission_denied"}
+            timer.add(files=len(backups) + len(save_folders))
+            
+        save_lines = []
         try:
-            for item in os.listdir(self.saves_base_path):
-                item_path = os.path.join(self.saves_base_path, item)
-                if os.path.isdir(item_path) and item != "backup":
-                    # Verificar se tem backup
-                    backup_path = os.path.join(self.saves_base_path, "backup", item)
-                    has_backup = "✅" if os.path.exists(backup_path) else "❌"
-                    
-                    # Obter data de modificação
-                    mod_time = os.path.getmtime(item_path)
-                    mod_date = datetime.fromtimestamp(mod_time).strftime("%d/%m %H:%M")
+            with phase("lists.summaries", files=len(save_folders)):
+                for folder in save_folders:
+                    has_backup = "✅" if folder["has_backup"] else "❌"
+                    mod_date = datetime.fromtimestamp(folder["modified"]).strftime("%d/%m %H:%M")
+                    display_text = f"{has_backup} {folder['name']} | {mod_date}"
                     
-                    display_text = f"{has_backup} {item} | {mod_date}"
-                    self.saves_listbox.insert(tk.END, display_text)
-                    
-        except PermissionError:
-            self.status_var.set(self.get_text("permission_denied"))
+                    # Resumo do save (descriptografado só se o arquivo mudou)
+                    summary = self.save_index.folder_summary(folder["path"])
+                    if summary:
+                        display_text += f" | {self.format_save_summary(summary)}"
+                    save_lines.append(display_text)
+        finally:
+            self.save_index.prune(saves_base_path)
+            self.save_index.save()
+            
+        backup_types = {
+            "historical": "🕒 " + self.get_text("historical"),
+            "current": "⚡ " + self.get_text("current")
+        }
+        backup_lines = []
+        for backup in backups:
+            display_text = (
+                f"{backup_types[backup['kind']]} {backup['name']} | "
+                f"{datetime.fromtimestamp(backup['created']).strftime('%d/%m %H:%M')}"
+            )
+            if backup["format"] == "archive":
+                # Só o diretório central do zip é lido
+                try:
+                    info = read_archive_index(backup["path"])
+                    display_text += (
+                        f" | 📦 {info['file_count']} {self.get_text('files')}, "
+                        f"{format_size(info['size'])} → {format_size(info['compressed_size'])}"
+                    )
+                except (OSError, ValueError):
+                    display_text += " | 📦 ⚠️"
+            backup_lines.append(display_text)
+        return {"saves": save_lines, "backups": backup_lines}
+        
+    def show_lists(self, job, result):
+        """Preenche as listas com o resultado de collect_lists"""
+        self.lists_loading = False
+        if self.lists_stale:
+            self.update_lists(self.lists_status)
             return
             
-        # Listar backups
-        backup_folder = os.path.join(self.saves_base_path, "backup")
-        if os.path.exists(backup_folder):
-            try:
-                for item in os.listdir(backup_folder):
-                    item_path = os.path.join(backup_folder, item)
-                    if os.path.isdir(item_path):
-                        # Obter data de criação
-                        create_time = os.path.getctime(item_path)
-                        create_date = datetime.fromtimestamp(create_time).strftime("%d/%m %H:%M")
-                        
-                        # Determinar tipo de backup
-                        if "_backup_" in item:
-                            backup_type = "🕒 " + self.get_text("historical")
-                        else:
-                            backup_type = "⚡ " + self.get_text("current")
-                            
-                        display_text = f"{backup_type} {item} | {create_date}"
-                        self.backups_listbox.insert(tk.END, display_text)
-                        
-            except PermissionError:
-                pass
-                
-        self.status_var.set(self.get_text("ready"))
+        self.saves_listbox.delete(0, tk.END)
+        self.backups_listbox.delete(0, tk.END)
+        if "error" in result:
+            self.status_var.set(self.get_text(result["error"]))
+            return
+        if result["saves"]:
+            self.saves_listbox.insert(tk.END, *result["saves"])
+        if result["backups"]:
+            self.backups_listbox.insert(tk.END, *result["backups"])
+        self.status_var.set(self.lists_status)
+        
+    def show_lists_error(self, job, error):
+        """Mostra um erro inesperado ao ler as listas"""
+        self.lists_loading = False
+        if self.lists_stale:
+            self.update_lists(self.lists_status)
+            return
+        self.status_var.set(f"{self.get_text('error')}: {str(error)}")
+        
+    def format_save_summary(self, summary):
+        """Formata o resumo de um save para exibição na lista"""
+        return (
+            f"{summary['team_name']} · {self.get_text('level')} {summary['level']} · "
+            f"{self.get_text('currency')} {summary['currency']} · "
+            f"{self.get_text('lives')} {summary['lives']} · 👥 {summary['player_count']}"
+        )
+        
+    def on_close(self):
+        """Cancela as tarefas em andamento e fecha o programa"""
+        if self.watcher:
+            self.watcher.stop(timeout=1)
+        self.jobs.shutdown(wait=False)
+        self.list_jobs.shutdown(wait=False)
+        self.root.quit()
+        
+    def run_profiled(self, job, name, func, *args):
+        """Executa func(job, *args), sob o cProfile se estiver ligado no painel de depuração"""
+        return profile_call(name, func, job, *args)
+        
+    def open_store(self):
+        """Repositório de backups com as opções do config.json"""
+        return BackupStore(self.saves_base_path, self.copy_workers, self.copy_strategy, self.delta_saves)
+        
+    def start_job(self, name, func, *args, on_done, error_prefix, not_found_path=None):
+        """Executa uma operação em segundo plano, mostrando o progresso na barra de status"""
+        if self.jobs.busy:
+            messagebox.showwarning(self.get_text("warning"), self.get_text("operation_in_progress"))
+            return
+        
+        def on_error(job, error):
+            self.finish_job()
+            if isinstance(error, JobCancelled):
+                self.status_var.set(self.get_text("operation_cancelled"))
+                return
+            if isinstance(error, FileNotFoundError) and not_found_path:
+                error_msg = f"{error_prefix}: {self.get_text('backup_not_found')}: {not_found_path}"
+            else:
+                error_msg = f"{error_prefix}: {str(error)}"
+            self.status_var.set(error_msg)
+            messagebox.showerror(self.get_text("error"), error_msg)
+        
+        def on_success(job, result):
+            self.finish_job()
+            on_done(result)
+        
+        self.status_var.set(self.get_text(name))
+        self.progress_bar.configure(value=0, maximum=1)
+        self.cancel_btn.configure(state=tk.NORMAL)
+        self.jobs.submit(name, self.run_profiled, name, func, *args, on_progress=self.show_job_progress,
+                         on_done=on_success, on_error=on_error)
+        
+    def show_job_progress(self, job, done_bytes, total_bytes, bytes_per_sec):
+        """Atualiza a barra de progresso (executado na thread do Tk)"""
+        self.progress_bar.configure(value=done_bytes, maximum=max(total_bytes, 1))
+        self.rate_var.set(f"{format_size(int(bytes_per_sec))}/s")
+        
+    def finish_job(self):
+        """Limpa a barra de progresso ao fim de uma tarefa"""
+        self.progress_bar.configure(value=0, maximum=1)
+        self.rate_var.set("")
+        self.cancel_btn.configure(state=tk.DISABLED)
         
     def make_backup(self):
         """Faz backup da pasta selecionada"""
@@ -892,33 +1331,93 @@ class BackupSavesEnhancedApp:
         # Obter nome da pasta selecionada
         selected_text = self.saves_listbox.get(selection[0])
         folder_name = selected_text.split(" | ")[0][2:].strip()  # Remove emoji e espaços
+        self.backup_folder(folder_name)
+        
+    def backup_folder(self, folder_name, automatic=False):
+        """Faz backup de uma pasta de save em segundo plano (automatic: sem janelas de aviso)"""
+        def run(job, store, folder_name, incremental, archive, retention):
+            # Backup atual + backup histórico (deduplicado ou .zip); o
+            # cancelamento interrompe antes de gravar o manifesto, e depois
+            # dele o backup atual é atualizado até o fim
+            result = store.backup_folder(folder_name, incremental=incremental, progress=job.progress,
+                                         archive=archive, report=job.report)
+            if result["changed"] and policy_enabled(retention):
+                # Com o backup novo gravado, a limpeza da pasta vai até o fim
+                result["retention"] = apply_retention(store, retention, [folder_name], progress=job.report)
+            return result
+        
+        def on_done(result):
+            # A mensagem aparece quando as listas terminarem de atualizar
+            transferred = format_size(result["stats"]["bytes_transferred"])
+            if result["changed"]:
+                status = f"{self.get_text('backup_success')} ({transferred} {self.get_text('transferred')})"
+                if automatic:
+                    status = f"{status} · {self.get_text('auto_backup')}: {folder_name}"
+                if result.get("retention", {}).get("delete"):
+                    status += " · " + self.format_retention(result["retention"])
+                self.update_lists(status)
+            elif not automatic:
+                self.update_lists(self.get_text("backup_unchanged"))
+            if not automatic:
+                messagebox.showinfo(
+                    self.get_text("success"),
+                    self.get_text("backup_created") if result["changed"] else self.get_text("backup_unchanged")
+                )
+        
+        self.start_job("backing_up", run, self.open_store(), folder_name,
+                       self.incremental_backup, self.backup_format == "archive", dict(self.retention), on_done=on_done,
+                       error_prefix=self.get_text("backup_error"))
+        
+    def toggle_watch(self):
+        """Liga ou desliga o backup automático"""
+        self.watch_saves = self.watch_var.get()
+        self.save_config()
+        if self.watch_saves:
+            self.start_watching()
+        else:
+            self.stop_watching()
+            self.status_var.set(self.get_text("auto_backup_off"))
         
-        source_path = os.path.join(self.saves_base_path, folder_name)
-        backup_base_path = os.path.join(self.saves_base_path, "backup")
-        
-        # Criar pasta de backup se não existir
-        os.makedirs(backup_base_path, exist_ok=True)
+    def start_watching(self):
+        """Começa a observar a pasta de saves"""
+        # Importado só aqui: o monitor (e o ctypes) não pesam na inicialização
+        from save_watcher import SaveWatcher
         
+        watcher = SaveWatcher(self.saves_base_path, self.watch_events.put)
         try:
-            # Backup atual (substitui o anterior)
-            current_backup_path = os.path.join(backup_base_path, folder_name)
-            if os.path.exists(current_backup_path):
-                shutil.rmtree(current_backup_path)
-            shutil.copytree(source_path, current_backup_path)
-            
-            # Backup histórico (com timestamp)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            historical_backup_path = os.path.join(backup_base_path, f"{folder_name}_backup_{timestamp}")
-            shutil.copytree(source_path, historical_backup_path)
-            
-            self.status_var.set(self.get_text("backup_success"))
-            self.update_lists()
-            messagebox.showinfo(self.get_text("success"), self.get_text("backup_created"))
-            
-        except Exception as e:
-            error_msg = f"{self.get_text("backup_error")}: {str(e)}"
-            self.status_var.set(error_msg)
-            messagebox.showerror(self.get_text("error"), error_msg)
+            watcher.start()
+        except OSError as e:
+            self.watch_var.set(False)
+            self.watch_saves = False
+            self.status_var.set(f"{self.get_text('error')}: {self.get_text('auto_backup')}: {str(e)}")
+            return
+        self.watcher = watcher
+        self.status_var.set(f"{self.get_text('auto_backup_on')} ({watcher.backend})")
+        self.watch_poll_id = self.root.after(self.WATCH_POLL_MS, self.poll_watcher)
+        
+    def stop_watching(self):
+        """Para de observar a pasta de saves"""
+        if self.watcher:
+            self.watcher.stop(timeout=1)
+            self.watcher = None
+        if self.watch_poll_id:
+            self.root.after_cancel(self.watch_poll_id)
+            self.watch_poll_id = None
+        self.watch_pending.clear()
+        
+    def poll_watcher(self):
+        """Inicia o backup das pastas avisadas pelo monitor (executado na thread do Tk)"""
+        while True:
+            try:
+                folder_name = self.watch_events.get_nowait()
+            except queue.Empty:
+                break
+            if folder_name not in self.watch_pending:
+                self.watch_pending.append(folder_name)
+        # Uma pasta por vez, e só quando nenhuma outra operação está em andamento
+        if self.watch_pending and not self.jobs.busy:
+            self.backup_folder(self.watch_pending.pop(0), automatic=True)
+        self.watch_poll_id = self.root.after(self.WATCH_POLL_MS, self.poll_watcher)
             
     def edit_save(self):
         """Abre o editor de saves para a pasta selecionada"""
@@ -1016,7 +1515,8 @@ class BackupSavesEnhancedApp:
         
         # Abrir editor de saves
         try:
-            SaveEditorWindow(self.root, save_file_path, self.translations, self.current_language)
+            SaveEditorWindow(self.root, save_file_path, self.translations, self.current_language,
+                             compact=self.compact_saves)
         except Exception as e:
             messagebox.showerror(self.get_text("error"), f"Erro ao abrir editor: {str(e)}")
             
@@ -1059,7 +1559,7 @@ class BackupSavesEnhancedApp(BackupSavesEnhancedApp):
             messagebox.showerror(self.get_text("error"), self.get_text("invalid_backup_selection"))
             return
 
-        backup_path = os.path.join(self.saves_base_path, "backup", actual_backup_name)
+        backup_path = os.path.join(self.saves_base_path, BACKUP_DIR_NAME, actual_backup_name)
 
         if not messagebox.askyesno(
             self.get_text("confirm_restore_title"),
@@ -1067,27 +1567,17 @@ class BackupSavesEnhancedApp(BackupSavesEnhancedApp):
         ):
             return
 
-        try:
-            original_save_folder_name = actual_backup_name.split("_backup_")[0] if "_backup_" in actual_backup_name else actual_backup_name
-            original_save_path = os.path.join(self.saves_base_path, original_save_folder_name)
-
-            if os.path.exists(original_save_path):
-                shutil.rmtree(original_save_path)
+        def run(job, store, backup_name):
+            # A restauração é preparada à parte; cancelar antes da troca não altera o save
+            return store.restore(backup_name, progress=job.progress)
 
-            shutil.copytree(backup_path, original_save_path)
-
-            self.status_var.set(self.get_text("restore_success"))
-            self.update_lists()
+        def on_done(result):
+            self.update_lists(self.get_text("restore_success"))
             messagebox.showinfo(self.get_text("success"), self.get_text("backup_restored"))
 
-        except FileNotFoundError:
-            error_msg = f"{self.get_text('restore_error')}: {self.get_text('backup_not_found')}: {backup_path}"
-            self.status_var.set(error_msg)
-            messagebox.showerror(self.get_text("error"), error_msg)
-        except Exception as e:
-            error_msg = f"{self.get_text('restore_error')}: {str(e)}"
-            self.status_var.set(error_msg)
-            messagebox.showerror(self.get_text("error"), error_msg)
+        self.start_job("restoring", run, self.open_store(), actual_backup_name,
+                       on_done=on_done, error_prefix=self.get_text("restore_error"),
+                       not_found_path=backup_path)
 
     def delete_backup(self):
         """Exclui o backup selecionado"""
@@ -1103,7 +1593,7 @@ class BackupSavesEnhancedApp(BackupSavesEnhancedApp):
             messagebox.showerror(self.get_text("error"), self.get_text("invalid_backup_selection"))
             return
 
-        backup_path = os.path.join(self.saves_base_path, "backup", actual_backup_name)
+        backup_path = os.path.join(self.saves_base_path, BACKUP_DIR_NAME, actual_backup_name)
 
         if not messagebox.askyesno(
             self.get_text("confirm_delete_title"),
@@ -1111,20 +1601,260 @@ class BackupSavesEnhancedApp(BackupSavesEnhancedApp):
         ):
             return
 
-        try:
-            if os.path.exists(backup_path):
-                shutil.rmtree(backup_path)
-                self.status_var.set(self.get_text("delete_success"))
-                self.update_lists()
-                messagebox.showinfo(self.get_text("success"), self.get_text("backup_deleted"))
-            else:
-                error_msg = f"{self.get_text('delete_error')}: {self.get_text('backup_not_found')}: {backup_path}"
-                self.status_var.set(error_msg)
-                messagebox.showerror(self.get_text("error"), error_msg)
-        except Exception as e:
-            error_msg = f"{self.get_text('delete_error')}: {str(e)}"
-            self.status_var.set(error_msg)
-            messagebox.showerror(self.get_text("error"), error_msg)
+        def run(job, store, backup_name):
+            # Depois de começar, a exclusão não pode parar no meio
+            job.check_cancelled()
+            return store.delete(backup_name, progress=job.report)
+
+        def on_done(freed):
+            self.update_lists(self.get_text("delete_success"))
+            messagebox.showinfo(self.get_text("success"), self.get_text("backup_deleted"))
+
+        self.start_job("deleting", run, self.open_store(), actual_backup_name,
+                       on_done=on_done, error_prefix=self.get_text("delete_error"),
+                       not_found_path=backup_path)
+
+    def format_retention(self, result):
+        """Resume o resultado de uma limpeza de backups antigos"""
+        return self.get_text("retention_result").format(
+            count=len(result["delete"]), freed=format_size(result["freed"])
+        )
+
+    def prune_backups(self):
+        """Exclui os backups históricos que a política de retenção não mantém"""
+        if not policy_enabled(self.retention):
+            messagebox.showinfo(self.get_text("prune_backups"), self.get_text("retention_disabled"))
+            return
+
+        def run_plan(job, store, retention):
+            job.check_cancelled()
+            return plan_retention(store, retention)
+
+        def run_delete(job, store, backup_names):
+            # Depois de começar, a exclusão não pode parar no meio
+            job.check_cancelled()
+            return store.delete_many(backup_names, progress=job.report)
+
+        def on_planned(plan):
+            if not plan["delete"]:
+                self.status_var.set(self.get_text("retention_nothing"))
+                return
+            if not messagebox.askyesno(
+                self.get_text("confirm_prune_title"),
+                self.get_text("confirm_prune_message").format(
+                    count=len(plan["delete"]), freed=format_size(plan["estimated_bytes"])
+                )
+            ):
+                self.status_var.set("")
+                return
+
+            def on_deleted(freed):
+                status = "✅ " + self.format_retention({"delete": plan["delete"], "freed": freed})
+                self.update_lists(status)
+                messagebox.showinfo(self.get_text("success"), status)
+
+            self.start_job("pruning", run_delete, store, [entry["backup"] for entry in plan["delete"]],
+                           on_done=on_deleted, error_prefix=self.get_text("prune_error"))
+
+        store = self.open_store()
+        self.start_job("pruning", run_plan, store, dict(self.retention),
+                       on_done=on_planned, error_prefix=self.get_text("prune_error"))
+
+    def verify_backups(self):
+        """Confere hashes e descriptografia do backup selecionado (ou de todos, sem seleção)"""
+        backup_names = None
+        selection = self.backups_listbox.curselection()
+        if selection:
+            backup_name = self.extract_backup_name(self.backups_listbox.get(selection[0]))
+            if not backup_name:
+                messagebox.showerror(self.get_text("error"), self.get_text("invalid_backup_selection"))
+                return
+            backup_names = [backup_name]
+
+        def run(job, store, backup_names):
+            return scrub(store, backup_names, workers=store.copy_workers, progress=job.progress)
+
+        def on_done(results):
+            failed = [result for result in results if not result["ok"]]
+            summary = self.get_text("verify_result").format(count=len(results), failed=len(failed))
+            self.status_var.set(("⚠️ " if failed else "✅ ") + summary)
+            if not failed:
+                messagebox.showinfo(self.get_text("success"), summary)
+                return
+            lines = []
+            for result in failed[:10]:
+                problems = result.get("problems") or [{"file": "", "error": result.get("error")}]
+                lines.extend(f"{result['backup']}/{problem['file']}: {problem['error']}" for problem in problems[:3])
+            messagebox.showwarning(self.get_text("warning"), summary + "\n\n" + "\n".join(lines))
+
+        self.start_job("verifying", run, self.open_store(), backup_names,
+                       on_done=on_done, error_prefix=self.get_text("verify_error"))
+
+    def compare_backup(self):
+        """Mostra o que mudou entre o backup selecionado e o save atual"""
+        selection = self.backups_listbox.curselection()
+        if not selection:
+            messagebox.showwarning(self.get_text("warning"), self.get_text("select_backup"))
+            return
+        backup_name = self.extract_backup_name(self.backups_listbox.get(selection[0]))
+        if not backup_name:
+            messagebox.showerror(self.get_text("error"), self.get_text("invalid_backup_selection"))
+            return
+
+        def run(job, store, backup_name):
+            return diff_backup(store, backup_name)
+
+        def on_done(results):
+            changed = [result for result in results if result["status"] != "same"]
+            self.status_var.set(self.get_text("compare_result").format(count=len(changed)))
+            if not changed:
+                messagebox.showinfo(self.get_text("compare_backup"), self.get_text("no_differences"))
+                return
+            self.show_diff(backup_name, changed)
+
+        self.start_job("comparing", run, self.open_store(), backup_name,
+                       on_done=on_done, error_prefix=self.get_text("compare_error"),
+                       not_found_path=os.path.join(self.saves_base_path, BACKUP_DIR_NAME, backup_name))
+
+    def show_diff(self, backup_name, results):
+        """Janela com os arquivos e os caminhos alterados"""
+        window = tk.Toplevel(self.root)
+        window.title(f"{self.get_text('compare_backup')}: {backup_name}")
+        window.geometry("900x500")
+        window.configure(bg=ModernStyle.BG_DARK)
+        window.transient(self.root)
+
+        tree_frame = tk.Frame(window, bg=ModernStyle.BG_DARK)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        scrollbar = tk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        tree = ttk.Treeview(tree_frame, columns=("old", "new"), yscrollcommand=scrollbar.set)
+        tree.heading("#0", text=self.get_text("key"))
+        tree.heading("old", text=self.get_text("backup"))
+        tree.heading("new", text=self.get_text("current"))
+        tree.column("#0", width=400)
+        tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=tree.yview)
+
+        def preview(value):
+            if value is None:
+                return ""
+            text = json.dumps(value, ensure_ascii=False)
+            return text if len(text) <= 80 else text[:80] + "…"
+
+        for result in results:
+            parent = tree.insert("", tk.END, text=f"📄 {result['file']}", values=(result["status"], result.get("error", "")),
+                                 open=True)
+            for change in result.get("changes", []):
+                tree.insert(parent, tk.END, text=change["path"], values=(preview(change["old"]), preview(change["new"])))
+
+    def apply_instrumentation(self):
+        """Liga ou desliga a medição de tempos conforme o config.json"""
+        if self.instrumentation:
+            instrumentation.enable(resource_path("profiles") if self.profile_jobs else None)
+        else:
+            instrumentation.disable()
+
+    def show_debug_panel(self):
+        """Painel de depuração (F12) com os tempos medidos de cada fase"""
+        window = tk.Toplevel(self.root)
+        window.title(self.get_text("debug_panel"))
+        window.geometry("1000x450")
+        window.configure(bg=ModernStyle.BG_DARK)
+        window.transient(self.root)
+
+        options_frame = tk.Frame(window, bg=ModernStyle.BG_DARK)
+        options_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        instrumentation_var = tk.BooleanVar(value=self.instrumentation)
+        profile_var = tk.BooleanVar(value=self.profile_jobs)
+
+        def toggle():
+            self.instrumentation = instrumentation_var.get()
+            self.profile_jobs = profile_var.get()
+            self.apply_instrumentation()
+            self.save_config()
+
+        for text, variable in ((self.get_text("measure_times"), instrumentation_var),
+                               (self.get_text("profile_jobs"), profile_var)):
+            tk.Checkbutton(
+                options_frame,
+                text=text,
+                variable=variable,
+                command=toggle,
+                bg=ModernStyle.BG_DARK,
+                fg=ModernStyle.TEXT_PRIMARY,
+                selectcolor=ModernStyle.BG_LIGHT,
+                activebackground=ModernStyle.BG_DARK,
+                activeforeground=ModernStyle.TEXT_PRIMARY,
+                font=("Segoe UI", 9)
+            ).pack(side=tk.LEFT, padx=5)
+
+        columns = ("count", "total_s", "mean_ms", "p50_ms", "p95_ms", "max_ms", "bytes", "files", "mb_per_s",
+                   "histogram")
+        tree = ttk.Treeview(window, columns=columns, show="tree headings")
+        tree.heading("#0", text=self.get_text("phase"))
+        tree.column("#0", width=140)
+        for column in columns:
+            tree.heading(column, text=self.get_text("histogram") if column == "histogram" else column)
+            tree.column(column, width=200 if column == "histogram" else 70, anchor=tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Atualização a cada segundo enquanto a janela estiver aberta
+        refresh_id = None
+
+        def refresh():
+            nonlocal refresh_id
+            tree.delete(*tree.get_children())
+            for row in instrumentation.snapshot():
+                histogram = " ".join(str(row[label]) for label in instrumentation.HISTOGRAM_LABELS)
+                tree.insert("", tk.END, text=row["phase"], values=(
+                    row["count"], row["total_s"], row["mean_ms"], row["p50_ms"], row["p95_ms"], row["max_ms"],
+                    format_size(row["bytes"]), row["files"], row["mb_per_s"] or "", histogram
+                ))
+            refresh_id = window.after(1000, refresh)
+
+        def on_destroy(event):
+            if event.widget is window and refresh_id:
+                window.after_cancel(refresh_id)
+
+        def reset():
+            instrumentation.reset()
+            tree.delete(*tree.get_children())
+
+        def export():
+            file_path = filedialog.asksaveasfilename(
+                parent=window,
+                title=self.get_text("export_timings"),
+                defaultextension=".json",
+                filetypes=[("JSON", "*.json"), ("CSV", "*.csv")]
+            )
+            if not file_path:
+                return
+            try:
+                instrumentation.export(file_path)
+                self.status_var.set(f"{self.get_text('export_timings')}: {file_path}")
+            except OSError as e:
+                messagebox.showerror(self.get_text("error"), str(e), parent=window)
+
+        button_frame = tk.Frame(window, bg=ModernStyle.BG_DARK)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        for text, command in (("🗑️ " + self.get_text("reset_timings"), reset),
+                              ("💾 " + self.get_text("export_timings"), export)):
+            tk.Button(
+                button_frame,
+                text=text,
+                command=command,
+                bg=ModernStyle.BG_LIGHT,
+                fg=ModernStyle.TEXT_PRIMARY,
+                font=("Segoe UI", 9),
+                relief=tk.FLAT,
+                padx=15,
+                pady=5
+            ).pack(side=tk.LEFT, padx=5)
+
+        window.bind("<Destroy>", on_destroy)
+        refresh()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificação de integridade dos backups R.E.P.O (scrub)
+
+Relê os backups e confere cada arquivo contra o tamanho e o SHA-256
+registrados quando o backup foi criado (manifesto do repositório, manifesto
+do .zip ou índice do backup atual), apontando arquivos corrompidos, truncados
+ou ausentes. Cada .es3 também é descriptografado e o JSON interpretado, para
+garantir que uma restauração vai abrir no jogo.
+
+O trabalho é dividido em tarefas independentes executadas em paralelo:
+- cada objeto do repositório deduplicado é conferido uma única vez, mesmo
+  que muitos backups o referenciem; um objeto guardado como delta é
+  reconstruído (BackupStore.read_object) e conferido contra o hash original;
+- cada .zip é extraído (como na restauração, que confere o CRC do zip) para
+  uma pasta temporária e conferido;
+- cada arquivo das pastas de backup é conferido separadamente.
+A leitura para o hash usa buffers grandes (hash_file) e o hashlib e o AES
+liberam o GIL, então threads bastam.
+
+Backups históricos legados (pastas) não têm hashes registrados: só os .es3
+são testados.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backup_archive import extract_archive
+from backup_store import BackupStore, ProgressCallback, check_file, scan_backups
+from copy_engine import DEFAULT_COPY_WORKERS
+from save_editor_core import SaveEditorCore, load_json
+
+SAVE_SUFFIX = ".es3"
+
+# Conferência de um arquivo: (caminho, sha256, tamanho, se deve descriptografar);
+# objetos guardados como delta não têm caminho
+FileCheck = Tuple[Optional[str], Optional[str], Optional[int], bool]
+
+
+def test_decrypt(core: SaveEditorCore, file_path: str) -> Optional[str]:
+    """
+    Descriptografa um .es3 e interpreta o JSON, sem guardar o resultado
+
+    Returns:
+        Optional[str]: Descrição do problema, ou None se o save abre
+    """
+    try:
+        data = core.decrypt_es3(file_path)
+    except Exception as e:
+        return f"não foi possível descriptografar ({type(e).__name__}: {e})"
+    try:
+        load_json(data)
+    except ValueError as e:
+        return f"JSON inválido após descriptografar ({e})"
+    return None
+
+
+def _check(core: SaveEditorCore, check: FileCheck) -> Optional[str]:
+    file_path, sha256, size, decrypt = check
+    problem = check_file(file_path, sha256, size)
+    if problem is None and decrypt:
+        problem = test_decrypt(core, file_path)
+    return problem
+
+
+def _check_delta(core: SaveEditorCore, store: BackupStore, digest: str, size: int, decrypt: bool) -> Optional[str]:
+    """Reconstrói um objeto guardado como delta e confere o resultado"""
+    cache = {}
+    try:
+        data = store.read_object(digest, cache)
+    except Exception as e:
+        return f"não foi possível reconstruir o delta ({type(e).__name__}: {e})"
+    if len(data) != size:
+        return f"tamanho {len(data)} em vez de {size}"
+    if decrypt:
+        try:
+            load_json(store.read_plaintext(digest, cache))
+        except ValueError as e:
+            return f"JSON inválido após descriptografar ({e})"
+    return None
+
+
+def _check_archive(core: SaveEditorCore, archive_path: str, expected: Dict, decrypt: bool) -> Dict[str, str]:
+    """Extrai um .zip numa pasta temporária e confere os arquivos extraídos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dest_path = os.path.join(tmp, "backup")
+        try:
+            extract_archive(archive_path, dest_path)
+        except Exception as e:
+            return {"": f"não foi possível extrair ({type(e).__name__}: {e})"}
+        problems = {}
+        for rel_path, entry in expected.items():
+            check = (os.path.join(dest_path, *rel_path.split("/")), entry.get("sha256"), entry.get("size"),
+                     decrypt and rel_path.endswith(SAVE_SUFFIX))
+            problem = _check(core, check)
+            if problem:
+                problems[rel_path] = problem
+        return problems
+
+
+def _plan(store: BackupStore, backup: Dict, decrypt: bool, checks: Dict, archives: Dict) -> Dict:
+    """
+    Monta as tarefas de um backup
+
+    Args:
+        checks: Tarefas de arquivo (chave -> FileCheck), compartilhadas entre
+            backups (objetos do repositório aparecem uma única vez)
+        archives: Tarefas de .zip (nome -> manifesto)
+
+    Returns:
+        Dict: Resultado parcial do backup, com os arquivos e a chave da tarefa de cada um
+    """
+    name = backup["name"]
+    result = {"backup": name, "format": backup["format"], "files": {}}
+    expected = store.expected_files(name)
+    result["checksums"] = expected is not None
+
+    if backup["format"] == "archive":
+        archives[name] = expected
+        result["files"] = {rel_path: ("archive", name) for rel_path in expected}
+        return result
+
+    if backup["format"] == "snapshot":
+        for rel_path, entry in expected.items():
+            key = ("object", entry["sha256"])
+            # Um objeto conferido uma vez vale para todos os backups; se algum
+            # deles for .es3, a tarefa inclui a descriptografia
+            previous = checks.get(key)
+            needs_decrypt = decrypt and (rel_path.endswith(SAVE_SUFFIX) or bool(previous and previous[3]))
+            object_path = None if store.is_delta(entry["sha256"]) else store.object_path(entry["sha256"])
+            checks[key] = (object_path, entry["sha256"], entry["size"], needs_decrypt)
+            result["files"][rel_path] = key
+        return result
+
+    backup_dir = os.path.join(store.backup_path, name)
+    if expected is None:
+        # Sem registro: todos os arquivos da pasta, só com o teste dos .es3
+        expected = {}
+        for current, _, file_names in os.walk(backup_dir):
+            rel_dir = os.path.relpath(current, backup_dir).replace(os.sep, "/")
+            for file_name in file_names:
+                expected[file_name if rel_dir == "." else f"{rel_dir}/{file_name}"] = {}
+    for rel_path, entry in expected.items():
+        key = ("file", name, rel_path)
+        checks[key] = (os.path.join(backup_dir, *rel_path.split("/")), entry.get("sha256"), entry.get("size"),
+                       decrypt and rel_path.endswith(SAVE_SUFFIX))
+        result["files"][rel_path] = key
+    return result
+
+
+def scrub(store: BackupStore, backup_names: Optional[Iterable[str]] = None, decrypt: bool = True,
+          workers: int = DEFAULT_COPY_WORKERS, progress: ProgressCallback = None) -> List[Dict]:
+    """
+    Confere a integridade de backups em paralelo
+
+    Args:
+        store: Repositório de backups
+        backup_names: Backups a conferir (padrão: todos, atuais e históricos)
+        decrypt: Se deve descriptografar cada .es3 (e interpretar o JSON)
+        workers: Número de tarefas simultâneas
+        progress: Callback de progresso (bytes conferidos, bytes totais); se
+            levantar uma exceção, a verificação é interrompida
+
+    Returns:
+        List[Dict]: Um resultado por backup: nome, formato, "ok", número de
+            arquivos, se havia hashes registrados ("checksums") e os
+            problemas encontrados ("problems": arquivo e descrição)
+    """
+    backups, _ = scan_backups(store.saves_base_path)
+    by_name = {backup["name"]: backup for backup in backups}
+    names = list(backup_names) if backup_names is not None else list(by_name)
+
+    results = []
+    checks: Dict[tuple, FileCheck] = {}
+    archives: Dict[str, Dict] = {}
+    for name in names:
+        if name not in by_name:
+            results.append({"backup": name, "ok": False, "error": "backup não encontrado"})
+            continue
+        try:
+            results.append(_plan(store, by_name[name], decrypt, checks, archives))
+        except Exception as e:
+            results.append({"backup": name, "format": by_name[name]["format"], "ok": False,
+                            "error": f"{type(e).__name__}: {e}"})
+
+    def size_of(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    tasks: List[Tuple[tuple, Callable, tuple, int]] = [
+        (key, _check, (check,), size_of(check[0])) if check[0] is not None
+        else (key, _check_delta, (store, check[1], check[2], check[3]), check[2])
+        for key, check in checks.items()
+    ] + [
+        (("archive", name), _check_archive, (store.archive_path(name), expected, decrypt),
+         size_of(store.archive_path(name)))
+        for name, expected in archives.items()
+    ]
+    total_bytes = sum(size for _, _, _, size in tasks)
+    done_bytes = 0
+    core = SaveEditorCore()
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(func, core, *task_args): (key, size) for key, func, task_args, size in tasks}
+        try:
+            for future in as_completed(futures):
+                key, size = futures[future]
+                try:
+                    outcomes[key] = future.result()
+                except Exception as e:
+                    outcomes[key] = f"{type(e).__name__}: {e}"
+                done_bytes += size
+                if progress:
+                    progress(done_bytes, total_bytes)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    for index, result in enumerate(results):
+        files = result.get("files")
+        if files is None:
+            continue
+        problems = []
+        for rel_path, key in files.items():
+            outcome = outcomes.get(key)
+            if isinstance(outcome, dict):
+                # Tarefa de .zip: problemas por arquivo ("" é o .zip inteiro)
+                outcome = outcome.get(rel_path) or outcome.get("")
+            if outcome:
+                problems.append({"file": rel_path, "error": outcome})
+        results[index] = {"backup": result["backup"], "format": result["format"], "ok": not problems,
+                          "files": len(files), "checksums": result["checksums"], "problems": problems}
+    return results
@@ -0,0 +1,1502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Armazenamento de Backups R.E.P.O
+
+Guarda os backups históricos num repositório endereçado por conteúdo:
+- Cada arquivo é gravado uma única vez em .store/objects, nomeado pelo seu SHA-256
+- Cada backup histórico é apenas um manifesto que aponta para esses objetos
+- Um novo backup só grava os arquivos cujo conteúdo mudou
+
+Estrutura dentro de saves/backup/:
+    <pasta>/                         backup atual (cópia simples da pasta)
+    <pasta>_backup_<timestamp>/      backups históricos antigos (formato legado)
+    <pasta>_backup_<timestamp>.zip   backups históricos em arquivo compactado (backup_archive)
+    .store/objects/ab/<sha256>       conteúdo dos arquivos
+    .store/objects/ab/<sha256>.delta .es3 guardado como diferença para outro save (save_delta)
+    .store/snapshots/<nome>.json     manifestos dos backups históricos
+    .store/index/<pasta>.json        índice (tamanho, mtime, hash) do último backup de cada pasta
+    .store/staging/                  restaurações em preparo
+    .store/trash/                    pastas substituídas por uma restauração, removidas em segundo plano
+                                     (.swap-pending marca uma troca ainda não concluída)
+    .store/staging|trash/<pasta>/.lock  travado pelo processo que usa a pasta; sem a
+                                     trava, a pasta é de uma restauração interrompida
+
+No modo incremental, arquivos com tamanho e mtime iguais aos do índice não são
+relidos, e se nada mudou na pasta nenhum backup novo é criado.
+
+Com delta_saves, um .es3 novo é guardado como a diferença entre o texto
+descriptografado dele e o da versão anterior do mesmo arquivo, mais o IV
+original; a restauração reconstrói o texto e criptografa de novo com o mesmo
+IV, o que reproduz o arquivo byte a byte. Os deltas formam uma cadeia até um
+objeto inteiro, limitada a DELTA_CHAIN_LIMIT; saves que não se reproduzem
+(GZip) ou cujo delta não compensa são guardados inteiros.
+
+As cópias usam a estratégia do repositório (copy_engine.COPY_STRATEGIES): com
+"reflink", objetos, backup atual e restaurações são clones copy-on-write
+quando o sistema de arquivos suporta. Com "hardlink", os arquivos do backup
+atual viram links para os objetos, então o backup atual não ocupa espaço
+extra; a pasta de save nunca recebe links, e as demais cópias são normais. Os
+objetos são gravados somente leitura e nunca são alterados no lugar: um save
+do backup atual editado no programa é substituído (os.replace), e o link
+desfeito, sem tocar nos snapshots.
+
+Manifestos (repositório e .zip) e o índice guardam o SHA-256 de cada arquivo:
+a restauração confere a cópia preparada contra eles antes de trocá-la com a
+pasta de save (veja também backup_scrub).
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import IO, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from backup_archive import (ARCHIVE_SUFFIX, extract_archive, extract_archive_file,
+                            read_archive_index, read_archive_manifest, write_archive)
+from copy_engine import (COPY_STRATEGIES, DEFAULT_COPY_WORKERS, copy_file, copy_files, copy_tree, remove_file,
+                         resolve_strategy)
+from instrumentation import phase
+from save_delta import apply_delta, make_delta, pack_delta_object, read_delta_base, unpack_delta_object
+from save_editor_core import BLOCK_SIZE, SaveEditorCore, write_file_atomic
+
+BACKUP_DIR_NAME = "backup"
+STORE_DIR_NAME = ".store"
+MANIFEST_FORMAT = 1
+HASH_BUFFER_SIZE = 1024 * 1024
+SAVE_SUFFIX = ".es3"
+DELTA_SUFFIX = ".delta"
+# Deltas seguidos até a próxima cópia inteira de um save
+DELTA_CHAIN_LIMIT = 16
+# Cópias de um arquivo que mudou durante a leitura (o jogo gravando o save)
+CAPTURE_ATTEMPTS = 3
+# Marca de uma troca em andamento dentro da pasta da lixeira (veja _swap_in)
+SWAP_MARKER = ".swap-pending"
+# Objetos mais novos que isso nunca são coletados: podem ser de um backup em
+# andamento (em outro processo) que ainda não gravou o manifesto
+GC_GRACE_SECONDS = 3600
+# Trava das pastas em staging/ e trash/ (veja _lock_holder)
+HOLDER_LOCK = ".lock"
+# Uma pasta recém-criada ainda sem a trava não é considerada abandonada
+HOLDER_GRACE_SECONDS = 60
+
+# Data do backup no nome; backups do mesmo segundo ganham um sufixo (_02, _03...)
+_TIMESTAMP = re.compile(r"\d{8}_\d{6}(_\d{2,})?")
+
+# Recebe (bytes processados, bytes totais); pode levantar uma exceção para interromper
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+class _ProgressTracker:
+    """Acumula o progresso de uma operação e o repassa ao callback"""
+
+    def __init__(self, callback: ProgressCallback, total: int = 0):
+        self.callback = callback
+        self.total = total
+        self.done = 0
+
+    def add_total(self, num_bytes: int):
+        self.total += num_bytes
+
+    def advance(self, num_bytes: int):
+        self.done += num_bytes
+        if self.callback:
+            self.callback(self.done, self.total)
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Calcula o SHA-256 de um arquivo
+
+    Args:
+        file_path: Caminho do arquivo
+
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.sha256()
+    # Um único buffer reaproveitado em todas as leituras
+    buffer = memoryview(bytearray(HASH_BUFFER_SIZE))
+    with open(file_path, 'rb', buffering=0) as f:
+        for length in iter(lambda: f.readinto(buffer), 0):
+            digest.update(buffer[:length])
+    return digest.hexdigest()
+
+
+def _copy_hashed(source_file: str, dest_file: str) -> Tuple[str, int]:
+    """
+    Copia um arquivo calculando o SHA-256 dos bytes copiados, numa única leitura
+
+    Returns:
+        Tuple[str, int]: Hash e tamanho do que foi gravado em dest_file
+    """
+    digest = hashlib.sha256()
+    buffer = memoryview(bytearray(HASH_BUFFER_SIZE))
+    size = 0
+    with open(source_file, 'rb', buffering=0) as src, open(dest_file, 'wb') as dst:
+        for length in iter(lambda: src.readinto(buffer), 0):
+            chunk = buffer[:length]
+            digest.update(chunk)
+            dst.write(chunk)
+            size += length
+    return digest.hexdigest(), size
+
+
+def check_file(file_path: str, sha256: Optional[str] = None, size: Optional[int] = None) -> Optional[str]:
+    """
+    Confere um arquivo contra o tamanho e o hash registrados
+
+    Args:
+        file_path: Arquivo a conferir
+        sha256: Hash esperado (None para não conferir o conteúdo)
+        size: Tamanho esperado (None para não conferir)
+
+    Returns:
+        Optional[str]: Descrição do problema, ou None se o arquivo confere
+    """
+    try:
+        actual_size = os.path.getsize(file_path)
+    except FileNotFoundError:
+        return "arquivo ausente"
+    if size is not None and actual_size != size:
+        if actual_size < size:
+            return f"arquivo truncado ({actual_size} de {size} bytes)"
+        return f"tamanho diferente ({actual_size} bytes, esperado {size})"
+    if sha256 and hash_file(file_path) != sha256:
+        return "conteúdo corrompido (SHA-256 diferente)"
+    return None
+
+
+def original_folder_name(backup_name: str) -> str:
+    """
+    Obtém o nome da pasta de save a partir do nome de um backup
+
+    Args:
+        backup_name: Nome do backup (atual ou histórico)
+
+    Returns:
+        str: Nome da pasta de save original
+    """
+    return backup_name.split("_backup_")[0] if "_backup_" in backup_name else backup_name
+
+
+def format_size(num_bytes: int) -> str:
+    """
+    Formata um número de bytes para exibição
+
+    Args:
+        num_bytes: Quantidade de bytes
+
+    Returns:
+        str: Texto como "512 B", "1.5 KB" ou "3.2 MB"
+    """
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def scan_backups(saves_base_path: str) -> Tuple[List[Dict], Set[str]]:
+    """
+    Lista os backups de uma pasta de saves em uma única passada com os.scandir
+
+    Args:
+        saves_base_path: Pasta base dos saves
+
+    Returns:
+        Tuple[List[Dict], Set[str]]: Backups encontrados (nome, tipo
+            "current"/"historical", formato "directory"/"snapshot"/"archive"
+            e data de criação) e o conjunto de nomes das pastas de backup,
+            para consultas em O(1)
+    """
+    backup_path = os.path.join(saves_base_path, BACKUP_DIR_NAME)
+    backups = []
+    archives = []
+    backup_dirs = set()
+    try:
+        with os.scandir(backup_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name.endswith(ARCHIVE_SUFFIX) and entry.is_file():
+                    archives.append({
+                        "name": entry.name[:-len(ARCHIVE_SUFFIX)],
+                        "kind": "historical",
+                        "format": "archive",
+                        "path": entry.path,
+                        "created": entry.stat().st_ctime
+                    })
+                    continue
+                if not entry.is_dir():
+                    continue
+                backup_dirs.add(entry.name)
+                backups.append({
+                    "name": entry.name,
+                    "kind": "historical" if "_backup_" in entry.name else "current",
+                    "format": "directory",
+                    "created": entry.stat().st_ctime
+                })
+    except (FileNotFoundError, NotADirectoryError):
+        return backups, backup_dirs
+
+    # Backups históricos do repositório deduplicado
+    snapshots = []
+    try:
+        with os.scandir(os.path.join(backup_path, STORE_DIR_NAME, "snapshots")) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    snapshots.append({
+                        "name": entry.name[:-5],
+                        "kind": "historical",
+                        "format": "snapshot",
+                        "created": entry.stat().st_ctime
+                    })
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    snapshots.extend(archives)
+    snapshots.sort(key=lambda backup: backup["name"])
+    backups.extend(snapshots)
+    return backups, backup_dirs
+
+
+def scan_save_folders(saves_base_path: str, backup_dirs: Set[str]) -> List[Dict]:
+    """
+    Lista as pastas de save em uma única passada com os.scandir
+
+    Args:
+        saves_base_path: Pasta base dos saves
+        backup_dirs: Nomes das pastas de backup (de scan_backups)
+
+    Returns:
+        List[Dict]: Pastas de save (nome, caminho, data de modificação e se tem backup)
+
+    Raises:
+        PermissionError: Se a pasta não puder ser lida
+    """
+    folders = []
+    with os.scandir(saves_base_path) as entries:
+        for entry in entries:
+            if entry.name == BACKUP_DIR_NAME or not entry.is_dir():
+                continue
+            folders.append({
+                "name": entry.name,
+                "path": entry.path,
+                "modified": entry.stat().st_mtime,
+                "has_backup": entry.name in backup_dirs
+            })
+    return folders
+
+
+def _write_json_atomic(file_path: str, data: Dict):
+    """Grava um JSON em arquivo temporário e o move para o destino"""
+    directory = os.path.dirname(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _try_lock(f: IO) -> bool:
+    """Trava um arquivo aberto sem esperar; False se outro já o travou"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _lock_holder(holder: str) -> IO:
+    """
+    Marca uma pasta de staging/ ou trash/ como em uso por este processo
+
+    A trava dura enquanto o arquivo devolvido estiver aberto, e o sistema a
+    solta quando o processo termina, mesmo numa falha: assim uma restauração
+    interrompida se distingue de uma em andamento em outro processo (a
+    interface e a linha de comando podem restaurar ao mesmo tempo).
+    """
+    f = open(os.path.join(holder, HOLDER_LOCK), 'wb')
+    _try_lock(f)
+    return f
+
+
+def _holder_abandoned(holder: str) -> bool:
+    """Verifica se uma pasta de staging/ ou trash/ não pertence a nenhuma restauração em andamento"""
+    try:
+        f = open(os.path.join(holder, HOLDER_LOCK), 'r+b')
+    except FileNotFoundError:
+        # Recém-criada por mkdtemp, antes da trava, ou de uma versão sem travas
+        try:
+            return time.time() - os.stat(holder).st_mtime > HOLDER_GRACE_SECONDS
+        except FileNotFoundError:
+            return False
+    with f:
+        return _try_lock(f)
+
+
+def _make_read_only(file_path: str):
+    """Tira a permissão de escrita de um objeto antes de publicá-lo"""
+    mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    os.chmod(file_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _tree_size(root_path: str) -> int:
+    """Soma o tamanho de todos os arquivos de uma pasta"""
+    return sum(
+        os.path.getsize(os.path.join(root_path, *rel_path.split("/")))
+        for rel_path in _walk_tree(root_path)[0]
+    )
+
+
+def _remove_tree(root_path: str, tracker: _ProgressTracker):
+    """Remove uma pasta arquivo por arquivo, informando os bytes liberados"""
+    for current, dir_names, file_names in os.walk(root_path, topdown=False):
+        for name in file_names:
+            file_path = os.path.join(current, name)
+            size = os.path.getsize(file_path)
+            remove_file(file_path)
+            tracker.advance(size)
+        for name in dir_names:
+            dir_path = os.path.join(current, name)
+            if os.path.islink(dir_path):
+                os.remove(dir_path)
+            else:
+                os.rmdir(dir_path)
+    os.rmdir(root_path)
+
+
+def verify_tree(root_path: str, expected: Dict) -> List[Tuple[str, str]]:
+    """
+    Confere os arquivos de uma pasta contra os registrados num manifesto
+
+    Args:
+        root_path: Pasta a conferir
+        expected: Caminho relativo -> entrada com "sha256" e "size"
+
+    Returns:
+        List[Tuple[str, str]]: (caminho, problema) de cada arquivo que não confere
+    """
+    problems = []
+    for rel_path, entry in expected.items():
+        problem = check_file(os.path.join(root_path, *rel_path.split("/")), entry.get("sha256"), entry.get("size"))
+        if problem:
+            problems.append((rel_path, problem))
+    return problems
+
+
+def _walk_tree(root_path: str):
+    """Percorre uma pasta e devolve (arquivos, pastas) com caminhos relativos no formato posix"""
+    files = []
+    dirs = []
+    for current, dir_names, file_names in os.walk(root_path):
+        rel_dir = os.path.relpath(current, root_path)
+        rel_dir = "" if rel_dir == "." else rel_dir.replace(os.sep, "/")
+        for name in dir_names:
+            dirs.append(f"{rel_dir}/{name}" if rel_dir else name)
+        for name in file_names:
+            files.append(f"{rel_dir}/{name}" if rel_dir else name)
+    return files, dirs
+
+
+class BackupStore:
+    """Repositório de backups deduplicado por conteúdo"""
+
+    def __init__(self, saves_base_path: str, copy_workers: int = DEFAULT_COPY_WORKERS,
+                 copy_strategy: str = "auto", delta_saves: bool = False):
+        """
+        Args:
+            saves_base_path: Pasta base dos saves
+            copy_workers: Número de cópias simultâneas ao atualizar o backup
+                atual e ao restaurar
+            copy_strategy: Estratégia de cópia (copy_engine.COPY_STRATEGIES),
+                resolvida na primeira cópia conforme o suporte da pasta de backups
+            delta_saves: Se os backups históricos devem guardar os .es3 como
+                diferença para a versão anterior (a leitura de deltas já
+                existentes não depende desta opção)
+
+        Raises:
+            ValueError: Se a estratégia não existir
+        """
+        if copy_strategy not in COPY_STRATEGIES:
+            raise ValueError(f"Estratégia de cópia inválida: {copy_strategy}")
+        self.saves_base_path = saves_base_path
+        self.copy_workers = copy_workers
+        self.copy_strategy = copy_strategy
+        self.delta_saves = delta_saves
+        self._resolved_strategy: Optional[str] = None
+        self._core: Optional[SaveEditorCore] = None
+        self.backup_path = os.path.join(saves_base_path, BACKUP_DIR_NAME)
+        self.store_path = os.path.join(self.backup_path, STORE_DIR_NAME)
+        self.objects_path = os.path.join(self.store_path, "objects")
+        self.snapshots_path = os.path.join(self.store_path, "snapshots")
+        self.index_path = os.path.join(self.store_path, "index")
+        self.staging_path = os.path.join(self.store_path, "staging")
+        self.trash_path = os.path.join(self.store_path, "trash")
+
+    def object_path(self, digest: str) -> str:
+        """Caminho de um objeto do repositório pelo seu SHA-256"""
+        return os.path.join(self.objects_path, digest[:2], digest)
+
+    def strategy(self) -> str:
+        """
+        Estratégia de cópia efetiva nesta pasta de backups
+
+        Returns:
+            str: "reflink", "hardlink" ou "copy"
+        """
+        if self._resolved_strategy is None:
+            # O teste é feito na pasta de backups, para não aparecer entre os saves
+            os.makedirs(self.backup_path, exist_ok=True)
+            self._resolved_strategy = resolve_strategy(self.copy_strategy, self.backup_path)
+        return self._resolved_strategy
+
+    def _clone_strategy(self) -> str:
+        """Estratégia das cópias que não podem ser links (a partir da pasta de save ou para ela)"""
+        return "reflink" if self.strategy() == "reflink" else "copy"
+
+    def _delta_path(self, digest: str) -> str:
+        return self.object_path(digest) + DELTA_SUFFIX
+
+    def has_object(self, digest: str) -> bool:
+        """Verifica se um conteúdo está no repositório, inteiro ou como delta"""
+        return os.path.exists(self.object_path(digest)) or os.path.exists(self._delta_path(digest))
+
+    def _touch_object(self, digest: str) -> bool:
+        """
+        Renova o mtime de um objeto que um backup vai referenciar, e o das
+        bases se for um delta
+
+        Um objeto reaproveitado pode não estar em nenhum manifesto (o backup
+        que o referenciava foi excluído); com o mtime novo, collect_garbage
+        não o apaga antes do manifesto do backup em andamento ser gravado.
+
+        Returns:
+            bool: Se o conteúdo pode ser obtido do repositório; False também
+                para um delta com a cadeia incompleta ou corrompida, que então
+                é gravado de novo
+        """
+        try:
+            chain = self.object_chain(digest)
+            for delta_digest in chain[:-1]:
+                os.utime(self._delta_path(delta_digest))
+            os.utime(self.object_path(chain[-1]))
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def is_delta(self, digest: str) -> bool:
+        """Verifica se um conteúdo está guardado como delta (e não inteiro)"""
+        return not os.path.exists(self.object_path(digest)) and os.path.exists(self._delta_path(digest))
+
+    def object_chain(self, digest: str) -> List[str]:
+        """
+        Objetos necessários para obter um conteúdo: ele mesmo e, se for um
+        delta, cada base até chegar a um objeto inteiro
+
+        Returns:
+            List[str]: SHA-256 dos objetos, terminando no objeto inteiro
+
+        Raises:
+            FileNotFoundError: Se algum objeto da cadeia não existir
+            ValueError: Se algum delta estiver corrompido
+        """
+        chain = [digest]
+        while not os.path.exists(self.object_path(digest)):
+            delta_path = self._delta_path(digest)
+            if not os.path.exists(delta_path):
+                raise FileNotFoundError(self.object_path(digest))
+            digest = read_delta_base(delta_path)
+            chain.append(digest)
+            if len(chain) > DELTA_CHAIN_LIMIT + 1:
+                raise ValueError(f"Cadeia de deltas inválida: {chain[0]}")
+        return chain
+
+    def _stored_size(self, digest: str) -> int:
+        """Espaço ocupado por um objeto (inteiro ou delta)"""
+        object_path = self.object_path(digest)
+        if os.path.exists(object_path):
+            return os.path.getsize(object_path)
+        return os.path.getsize(self._delta_path(digest))
+
+    def _save_core(self) -> SaveEditorCore:
+        if self._core is None:
+            self._core = SaveEditorCore()
+        return self._core
+
+    def _read_delta(self, digest: str) -> Tuple[str, bytes, bytes]:
+        with open(self._delta_path(digest), 'rb') as f:
+            return unpack_delta_object(f.read())
+
+    def read_plaintext(self, digest: str, cache: Optional[Dict[str, bytes]] = None) -> bytes:
+        """
+        Texto descriptografado de um .es3 guardado no repositório
+
+        Args:
+            digest: SHA-256 do .es3
+            cache: Textos já obtidos (hash -> texto), reaproveitados e
+                completados ao longo de uma mesma operação
+
+        Returns:
+            bytes: Texto do save (JSON)
+
+        Raises:
+            FileNotFoundError: Se faltar algum objeto da cadeia
+            ValueError: Se algum delta estiver corrompido
+        """
+        cache = {} if cache is None else cache
+        if digest in cache:
+            return cache[digest]
+        chain = self.object_chain(digest)
+        start = next((index for index, item in enumerate(chain) if item in cache), None)
+        if start is None:
+            start = len(chain) - 1
+            cache[chain[start]] = self._save_core().decrypt_es3(self.object_path(chain[start]))
+        plaintext = cache[chain[start]]
+        for item in reversed(chain[:start]):
+            _, _, delta = self._read_delta(item)
+            plaintext = apply_delta(plaintext, delta)
+            cache[item] = plaintext
+        return plaintext
+
+    def read_object(self, digest: str, cache: Optional[Dict[str, bytes]] = None) -> bytes:
+        """
+        Conteúdo original de um objeto; um delta é reconstruído e
+        criptografado de novo com o IV original
+
+        Args:
+            digest: SHA-256 do conteúdo
+            cache: Veja read_plaintext
+
+        Raises:
+            FileNotFoundError: Se faltar algum objeto da cadeia
+            ValueError: Se o conteúdo reconstruído não conferir com o hash
+        """
+        object_path = self.object_path(digest)
+        if os.path.exists(object_path):
+            with open(object_path, 'rb') as f:
+                return f.read()
+        _, iv, _ = self._read_delta(digest)
+        data = self._save_core().encrypt_bytes(self.read_plaintext(digest, cache), iv=iv)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Delta não reproduz o arquivo original: {digest}")
+        return data
+
+    def write_object(self, digest: str, dest_file: str, mtime_ns: Optional[int] = None,
+                     cache: Optional[Dict[str, bytes]] = None) -> int:
+        """
+        Grava o conteúdo de um objeto num arquivo
+
+        Returns:
+            int: Número de bytes gravados
+        """
+        if not self.is_delta(digest):
+            return copy_file(self.object_path(digest), dest_file, preserve_metadata=False,
+                             mtime_ns=mtime_ns, strategy=self._clone_strategy())
+        data = self.read_object(digest, cache)
+        write_file_atomic(dest_file, data)
+        if mtime_ns is not None:
+            os.utime(dest_file, ns=(mtime_ns, mtime_ns))
+        return len(data)
+
+    def _manifest_path(self, snapshot_name: str) -> str:
+        return os.path.join(self.snapshots_path, snapshot_name + ".json")
+
+    def _ensure_dirs(self):
+        os.makedirs(self.objects_path, exist_ok=True)
+        os.makedirs(self.snapshots_path, exist_ok=True)
+        os.makedirs(self.index_path, exist_ok=True)
+
+    def _capture(self, source_file: str, tmp_path: str) -> Tuple[str, int, int]:
+        """
+        Copia um arquivo da pasta de save e calcula o hash da cópia
+
+        O hash, o tamanho e o mtime descrevem os bytes copiados, e não uma
+        leitura anterior: se o jogo gravar o save entre duas leituras, o
+        objeto nunca fica com um conteúdo diferente do seu nome. Se o arquivo
+        mudar durante a cópia, ela é repetida (até CAPTURE_ATTEMPTS vezes);
+        o mtime registrado é sempre o de antes da cópia, então um arquivo que
+        continuou mudando é relido no próximo backup incremental.
+
+        Returns:
+            Tuple[str, int, int]: SHA-256, tamanho e mtime_ns da cópia em tmp_path
+        """
+        for _ in range(CAPTURE_ATTEMPTS):
+            before = os.stat(source_file)
+            if self._clone_strategy() == "reflink":
+                # O clone é uma cópia particular: o hash é calculado sobre ela
+                copy_file(source_file, tmp_path, preserve_metadata=False, strategy="reflink")
+                digest, size = hash_file(tmp_path), os.path.getsize(tmp_path)
+            else:
+                digest, size = _copy_hashed(source_file, tmp_path)
+            after = os.stat(source_file)
+            if (before.st_mtime_ns == after.st_mtime_ns
+                    and before.st_size == after.st_size == size):
+                break
+        return digest, size, before.st_mtime_ns
+
+    def _store_file(self, source_file: str, base_digest: Optional[str] = None) -> Tuple[Dict, int, bool]:
+        """
+        Grava um arquivo da pasta de save no repositório, se o conteúdo for novo
+
+        Args:
+            source_file: Arquivo de origem
+            base_digest: Save anterior, base do delta (com delta_saves)
+
+        Returns:
+            Tuple[Dict, int, bool]: Entrada do arquivo (sha256, size e
+                mtime_ns da cópia), bytes gravados (0 se o objeto já existia)
+                e se foi guardado como delta
+        """
+        os.makedirs(self.objects_path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_path, suffix=".tmp")
+        os.close(fd)
+        try:
+            digest, size, mtime_ns = self._capture(source_file, tmp_path)
+            entry = {"sha256": digest, "size": size, "mtime_ns": mtime_ns}
+            if self._touch_object(digest):
+                return entry, 0, False
+            if base_digest:
+                delta_size = self._store_delta(tmp_path, digest, base_digest)
+                if delta_size:
+                    return entry, delta_size, True
+            object_path = self.object_path(digest)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            _make_read_only(tmp_path)
+            # Um clone pode ter o mtime da origem: o objeto novo deve contar como recente
+            os.utime(tmp_path)
+            os.replace(tmp_path, object_path)
+            return entry, size, False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _store_delta(self, source_file: str, digest: str, base_digest: str) -> int:
+        """
+        Grava um .es3 como delta em relação a outro save do repositório
+
+        Returns:
+            int: Tamanho do delta gravado, ou 0 se o save deve ser guardado
+                inteiro (base ausente ou com cadeia longa, GZip, arquivo
+                alterado durante a leitura ou delta que não compensa)
+        """
+        try:
+            if len(self.object_chain(base_digest)) > DELTA_CHAIN_LIMIT or not self._touch_object(base_digest):
+                return 0
+            with open(source_file, 'rb') as f:
+                original = f.read()
+            core = self._save_core()
+            plaintext = core.decrypt_es3(source_file)
+            base_plaintext = self.read_plaintext(base_digest)
+        except Exception:
+            return 0
+        iv = original[:BLOCK_SIZE]
+        if (hashlib.sha256(original).hexdigest() != digest
+                or core.encrypt_bytes(plaintext, iv=iv) != original):
+            return 0
+        data = pack_delta_object(base_digest, iv, make_delta(base_plaintext, plaintext))
+        if len(data) * 2 > len(original):
+            return 0
+
+        delta_path = self._delta_path(digest)
+        os.makedirs(os.path.dirname(delta_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(delta_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            _make_read_only(tmp_path)
+            os.replace(tmp_path, delta_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(data)
+
+    def list_snapshots(self) -> List[str]:
+        """
+        Lista os backups históricos guardados no repositório
+
+        Returns:
+            List[str]: Nomes dos backups, em ordem cronológica
+        """
+        try:
+            names = [name[:-5] for name in os.listdir(self.snapshots_path) if name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+        return sorted(names)
+
+    def has_snapshot(self, snapshot_name: str) -> bool:
+        """Verifica se um backup histórico existe no repositório"""
+        return os.path.isfile(self._manifest_path(snapshot_name))
+
+    def archive_path(self, backup_name: str) -> str:
+        """Caminho do .zip de um backup histórico compactado"""
+        return os.path.join(self.backup_path, backup_name + ARCHIVE_SUFFIX)
+
+    def has_archive(self, backup_name: str) -> bool:
+        """Verifica se um backup histórico compactado existe"""
+        return os.path.isfile(self.archive_path(backup_name))
+
+    def load_manifest(self, snapshot_name: str) -> Dict:
+        """
+        Carrega o manifesto de um backup histórico
+
+        Args:
+            snapshot_name: Nome do backup
+
+        Returns:
+            Dict: Manifesto do backup
+
+        Raises:
+            FileNotFoundError: Se o backup não existir
+        """
+        with open(self._manifest_path(snapshot_name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def latest_snapshot(self, folder_name: str) -> Optional[str]:
+        """
+        Obtém o backup histórico mais recente de uma pasta de save
+
+        Args:
+            folder_name: Nome da pasta de save
+
+        Returns:
+            Optional[str]: Nome do backup ou None se não houver nenhum
+        """
+        prefix = folder_name + "_backup_"
+        candidates = [
+            name for name in self.list_snapshots()
+            if name.startswith(prefix) and _TIMESTAMP.fullmatch(name[len(prefix):])
+        ]
+        return candidates[-1] if candidates else None
+
+    def _index_file(self, folder_name: str) -> str:
+        return os.path.join(self.index_path, folder_name + ".json")
+
+    def load_index(self, folder_name: str) -> Optional[Dict]:
+        """
+        Carrega o índice incremental de uma pasta de save
+
+        Args:
+            folder_name: Nome da pasta de save
+
+        Returns:
+            Optional[Dict]: Índice ou None se não existir ou estiver corrompido
+        """
+        try:
+            with open(self._index_file(folder_name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _scan_source(self, source_path: str, index: Optional[Dict],
+                     tracker: Optional[_ProgressTracker] = None, store_objects: bool = True,
+                     bases: Optional[Dict] = None) -> Dict:
+        """
+        Lê a pasta de origem, calcula os hashes e grava os objetos novos
+
+        Arquivos com tamanho e mtime iguais aos do índice reaproveitam o hash
+        já conhecido e não são relidos.
+
+        Args:
+            store_objects: Se deve gravar os objetos no repositório (False
+                para backups compactados, que só precisam dos hashes)
+            bases: Arquivos do backup anterior, base dos deltas (com delta_saves)
+
+        Returns:
+            Dict: Entradas dos arquivos, pastas e estatísticas da leitura
+        """
+        tracker = tracker or _ProgressTracker(None)
+        known = index["files"] if index else {}
+        with phase("backup.walk") as timer:
+            files, dirs = _walk_tree(source_path)
+            stats = {
+                rel_path: os.stat(os.path.join(source_path, *rel_path.split("/")))
+                for rel_path in files
+            }
+            timer.add(files=len(files))
+        tracker.add_total(sum(stat.st_size for stat in stats.values()))
+
+        entries = {}
+        changed = set(known) != set(files) or (index is not None and set(index["dirs"]) != set(dirs))
+        bases = bases if self.delta_saves else None
+        hashed_files = 0
+        new_objects = 0
+        delta_objects = 0
+        bytes_written = 0
+        for rel_path in files:
+            file_path = os.path.join(source_path, *rel_path.split("/"))
+            stat = stats[rel_path]
+            old = known.get(rel_path)
+            if (old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns
+                    and (not store_objects or self._touch_object(old["sha256"]))):
+                entry = {"sha256": old["sha256"], "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            elif store_objects:
+                base = bases.get(rel_path) if bases and rel_path.endswith(SAVE_SUFFIX) else None
+                with phase("backup.hash", stat.st_size, 1):
+                    entry, written, is_delta = self._store_file(file_path, base["sha256"] if base else None)
+                hashed_files += 1
+                if written:
+                    new_objects += 1
+                    delta_objects += is_delta
+                    bytes_written += written
+            else:
+                # Backups compactados: write_archive registra o hash do que entrar no .zip
+                with phase("backup.hash", stat.st_size, 1):
+                    digest = hash_file(file_path)
+                hashed_files += 1
+                entry = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if not old or old["sha256"] != entry["sha256"]:
+                changed = True
+            entries[rel_path] = entry
+            tracker.advance(stat.st_size)
+
+        return {
+            "files": entries,
+            "dirs": dirs,
+            "changed": changed or index is None,
+            "stats": {
+                "files": len(entries),
+                "hashed_files": hashed_files,
+                "new_objects": new_objects,
+                "delta_objects": delta_objects,
+                "bytes_written": bytes_written
+            }
+        }
+
+    def create_snapshot(self, source_path: str, snapshot_name: str,
+                        index: Optional[Dict] = None, progress: ProgressCallback = None) -> Dict:
+        """
+        Cria um backup histórico deduplicado de uma pasta
+
+        Args:
+            source_path: Pasta de origem
+            snapshot_name: Nome do backup a criar
+            index: Índice incremental usado para evitar reler arquivos inalterados
+            progress: Callback de progresso (bytes processados, bytes totais)
+
+        Returns:
+            Dict: Manifesto gravado, com estatísticas em "stats"
+        """
+        self._ensure_dirs()
+        scan = self._scan_source(source_path, index, _ProgressTracker(progress))
+        manifest = self._write_manifest(snapshot_name, os.path.basename(os.path.normpath(source_path)), scan)
+        manifest["stats"] = scan["stats"]
+        return manifest
+
+    def _write_manifest(self, snapshot_name: str, folder_name: str, scan: Dict) -> Dict:
+        """Grava o manifesto de um backup histórico a partir do resultado da leitura"""
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "source": folder_name,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "files": scan["files"],
+            "dirs": scan["dirs"]
+        }
+        _write_json_atomic(self._manifest_path(snapshot_name), manifest)
+        return manifest
+
+    def _sync_current(self, source_path: str, current_path: str, manifest: Dict,
+                      previous: Optional[Dict], tracker: Optional[_ProgressTracker] = None,
+                      link_objects: bool = False) -> int:
+        """
+        Atualiza o backup atual copiando só os arquivos que mudaram
+
+        Args:
+            link_objects: Se os objetos do manifesto estão no repositório; com
+                a estratégia "hardlink", os arquivos viram links para eles
+
+        Returns:
+            int: Número de bytes copiados
+        """
+        tracker = tracker or _ProgressTracker(None)
+        previous_files = previous["files"] if previous else {}
+        os.makedirs(current_path, exist_ok=True)
+
+        for rel_dir in manifest["dirs"]:
+            os.makedirs(os.path.join(current_path, *rel_dir.split("/")), exist_ok=True)
+
+        to_copy = []
+        for rel_path, entry in manifest["files"].items():
+            dest = os.path.join(current_path, *rel_path.split("/"))
+            old = previous_files.get(rel_path)
+            if (old and old["sha256"] == entry["sha256"] and os.path.isfile(dest)
+                    and os.path.getsize(dest) == entry["size"]):
+                continue
+            to_copy.append((rel_path, dest, entry["size"]))
+
+        tracker.add_total(sum(size for _, _, size in to_copy))
+        to_link = []
+        if link_objects and self.strategy() == "hardlink":
+            # Objetos guardados como delta não existem inteiros: esses são copiados
+            entries = manifest["files"]
+            for rel_path, dest, _ in to_copy:
+                object_path = self.object_path(entries[rel_path]["sha256"])
+                if os.path.exists(object_path):
+                    # O link tem o mtime do objeto: mudar o dele alteraria o de todos os links
+                    to_link.append((object_path, dest, None))
+            linked = {dest for _, dest, _ in to_link}
+            to_copy = [item for item in to_copy if item[1] not in linked]
+        with phase("backup.copy", files=len(to_link) + len(to_copy)) as timer:
+            bytes_copied = copy_files(to_link, self.copy_workers, tracker.advance, preserve_metadata=False,
+                                      strategy="hardlink")
+            bytes_copied += copy_files(
+                ((os.path.join(source_path, *rel_path.split("/")), dest, None) for rel_path, dest, _ in to_copy),
+                self.copy_workers, tracker.advance, strategy=self._clone_strategy()
+            )
+            timer.add(bytes_copied)
+
+        # Remover o que não existe mais na origem
+        with phase("backup.rmtree") as timer:
+            files, dirs = _walk_tree(current_path)
+            for rel_path in files:
+                if rel_path not in manifest["files"]:
+                    remove_file(os.path.join(current_path, *rel_path.split("/")))
+                    timer.add(files=1)
+            kept_dirs = set(manifest["dirs"])
+            for rel_dir in sorted(dirs, reverse=True):
+                if rel_dir not in kept_dirs:
+                    shutil.rmtree(os.path.join(current_path, *rel_dir.split("/")), ignore_errors=True)
+
+        return bytes_copied
+
+    def backup_folder(self, folder_name: str, incremental: bool = True,
+                      progress: ProgressCallback = None, archive: bool = False,
+                      report: ProgressCallback = None) -> Dict:
+        """
+        Faz backup de uma pasta de save (backup atual + backup histórico)
+
+        Args:
+            folder_name: Nome da pasta dentro de saves_base_path
+            incremental: Se deve pular arquivos inalterados (e o backup inteiro
+                quando nada mudou) usando o índice da pasta
+            progress: Callback de progresso (bytes processados, bytes totais);
+                se levantar uma exceção, o backup é interrompido sem gravar
+                o manifesto nem o índice. Só é usado até o backup histórico
+                ser gravado
+            archive: Se o backup histórico deve ser um .zip em vez de um
+                manifesto do repositório deduplicado
+            report: Callback de progresso que não interrompe, usado depois
+                que o backup histórico foi gravado (atualização do backup
+                atual), quando não há mais como cancelar sem deixar um backup
+                histórico a mais
+
+        Returns:
+            Dict: Nome do backup histórico, se houve mudanças ("changed")
+                e estatísticas da operação, incluindo "bytes_transferred" e a
+                estratégia de cópia usada ("copy_strategy"; com "reflink" e
+                "hardlink" os bytes contados não ocupam espaço novo no disco)
+        """
+        source_path = os.path.join(self.saves_base_path, folder_name)
+        if not os.path.isdir(source_path):
+            raise FileNotFoundError(source_path)
+        current_path = os.path.join(self.backup_path, folder_name)
+
+        if incremental:
+            previous = self.load_index(folder_name)
+        else:
+            previous_name = self.latest_snapshot(folder_name)
+            previous = self.load_manifest(previous_name) if previous_name else None
+        index = previous if incremental else None
+
+        self._ensure_dirs()
+        tracker = _ProgressTracker(progress)
+        scan = self._scan_source(source_path, index, tracker, store_objects=not archive,
+                                 bases=previous["files"] if previous else None)
+
+        if (incremental and not scan["changed"] and os.path.isdir(current_path)
+                and (self.has_snapshot(index["snapshot"]) or self.has_archive(index["snapshot"]))):
+            stats = scan["stats"]
+            stats["current_bytes_copied"] = 0
+            stats["bytes_transferred"] = stats["bytes_written"]
+            stats["copy_strategy"] = self.strategy()
+            return {"snapshot": index["snapshot"], "changed": False, "stats": stats}
+
+        snapshot_name = self._new_snapshot_name(folder_name)
+        if archive:
+            tracker.add_total(sum(entry["size"] for entry in scan["files"].values()))
+            scan["stats"]["bytes_written"], scan["files"] = write_archive(
+                source_path, self.archive_path(snapshot_name), scan, tracker.advance
+            )
+            manifest = scan
+        else:
+            manifest = self._write_manifest(snapshot_name, folder_name, scan)
+        tracker.callback = report
+
+        current_bytes = self._sync_current(source_path, current_path, manifest, previous, tracker,
+                                           link_objects=not archive)
+        _write_json_atomic(self._index_file(folder_name), {
+            "snapshot": snapshot_name,
+            "files": scan["files"],
+            "dirs": scan["dirs"]
+        })
+
+        stats = scan["stats"]
+        stats["current_bytes_copied"] = current_bytes
+        stats["bytes_transferred"] = stats["bytes_written"] + current_bytes
+        stats["copy_strategy"] = self.strategy()
+        return {"snapshot": snapshot_name, "changed": True, "stats": stats}
+
+    def _new_snapshot_name(self, folder_name: str) -> str:
+        """
+        Nome de um backup histórico novo, que não sobrescreve nenhum existente
+
+        O nome tem a resolução de um segundo; dois backups da mesma pasta no
+        mesmo segundo (por exemplo, o backup automático com debounce 0)
+        recebem um sufixo, que mantém a ordem alfabética igual à cronológica.
+        """
+        base_name = f"{folder_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        snapshot_name = base_name
+        number = 1
+        while (self.has_snapshot(snapshot_name) or self.has_archive(snapshot_name)
+               or os.path.exists(os.path.join(self.backup_path, snapshot_name))):
+            number += 1
+            snapshot_name = f"{base_name}_{number:02d}"
+        return snapshot_name
+
+    def _purge_leftovers(self):
+        """
+        Limpa restaurações interrompidas por uma falha
+
+        Só são tocadas as pastas abandonadas (_holder_abandoned): as de uma
+        restauração em andamento, neste ou em outro processo, ficam como
+        estão. Pastas em preparo são descartadas. Uma pasta na lixeira só volta para
+        o lugar se a marca da troca ainda existir (falha entre as duas
+        renomeações) e a pasta de save não existir; sem a marca, a troca foi
+        concluída e a pasta é uma remoção interrompida, que nunca deve voltar
+        (o jogo apaga a pasta do save ao fim de uma partida, então a pasta de
+        save ausente não indica nada).
+        """
+        for root_path in (self.staging_path, self.trash_path):
+            try:
+                with os.scandir(root_path) as entries:
+                    holders = [entry.path for entry in entries if entry.is_dir()]
+            except FileNotFoundError:
+                continue
+            for holder in holders:
+                if not _holder_abandoned(holder):
+                    continue
+                if root_path == self.trash_path:
+                    try:
+                        with open(os.path.join(holder, SWAP_MARKER), 'r', encoding='utf-8') as f:
+                            name = f.read().strip()
+                    except FileNotFoundError:
+                        name = None
+                    old_path = os.path.join(holder, name) if name else None
+                    live_path = os.path.join(self.saves_base_path, name) if name else None
+                    if old_path and os.path.isdir(old_path) and not os.path.exists(live_path):
+                        try:
+                            os.rename(old_path, live_path)
+                        except OSError:
+                            # Outro processo limpando a mesma pasta ao mesmo tempo
+                            continue
+                shutil.rmtree(holder, ignore_errors=True)
+
+    def _swap_in(self, staged_path: str, dest_path: str):
+        """
+        Troca dest_path pela pasta preparada com duas renomeações
+
+        A pasta antiga vai para a lixeira e é apagada em segundo plano; em
+        nenhum momento uma das duas versões fica incompleta no disco.
+
+        Antes da primeira renomeação é gravada a marca SWAP_MARKER na pasta
+        da lixeira, e ela é removida logo depois da segunda: só com a marca
+        _purge_leftovers devolve a pasta antiga ao lugar. A remoção roda numa
+        thread comum (não daemon), então o programa espera ela terminar ao
+        fechar; se for interrompida mesmo assim, o resto é apagado pelo
+        próximo _purge_leftovers.
+        """
+        holder = tempfile.mkdtemp(dir=self.trash_path)
+        lock = _lock_holder(holder)
+        marker = os.path.join(holder, SWAP_MARKER)
+        old_path = None
+        if os.path.exists(dest_path):
+            old_path = os.path.join(holder, os.path.basename(dest_path))
+            with open(marker, 'w', encoding='utf-8') as f:
+                f.write(os.path.basename(dest_path))
+                f.flush()
+                os.fsync(f.fileno())
+            os.rename(dest_path, old_path)
+        try:
+            os.rename(staged_path, dest_path)
+        except BaseException:
+            if old_path:
+                os.rename(old_path, dest_path)
+            lock.close()
+            raise
+        finally:
+            if old_path:
+                os.remove(marker)
+
+        def discard():
+            if old_path:
+                shutil.rmtree(old_path, ignore_errors=True)
+            lock.close()
+            shutil.rmtree(holder, ignore_errors=True)
+
+        threading.Thread(target=discard, name="repo-trash").start()
+
+    def _staged_restore(self, dest_path: str, fill: Callable[[str], None],
+                        expected: Optional[Dict] = None, size: int = 0):
+        """
+        Prepara a restauração numa pasta temporária e só então a coloca no lugar
+
+        Args:
+            dest_path: Pasta de save a substituir
+            fill: Função que cria o conteúdo restaurado no caminho recebido
+            expected: Arquivos registrados no backup (caminho -> sha256/size);
+                se algum não conferir, dest_path não é alterada
+            size: Bytes que fill vai gravar (só para a medição de tempo)
+
+        Raises:
+            ValueError: Se a cópia preparada não conferir com expected
+        """
+        os.makedirs(self.staging_path, exist_ok=True)
+        os.makedirs(self.trash_path, exist_ok=True)
+        with phase("restore.rmtree"):
+            self._purge_leftovers()
+
+        holder = tempfile.mkdtemp(dir=self.staging_path)
+        lock = _lock_holder(holder)
+        try:
+            staged_path = os.path.join(holder, os.path.basename(dest_path))
+            with phase("restore.copy", size):
+                fill(staged_path)
+            if expected is not None:
+                with phase("restore.verify", sum(entry.get("size") or 0 for entry in expected.values()),
+                           len(expected)):
+                    problems = verify_tree(staged_path, expected)
+                if problems:
+                    rel_path, problem = problems[0]
+                    more = f" (e mais {len(problems) - 1})" if len(problems) > 1 else ""
+                    raise ValueError(f"Backup corrompido: {rel_path}: {problem}{more}")
+            with phase("restore.swap"):
+                self._swap_in(staged_path, dest_path)
+        finally:
+            lock.close()
+            with phase("restore.rmtree"):
+                shutil.rmtree(holder, ignore_errors=True)
+
+    def _materialize_snapshot(self, manifest: Dict, dest_path: str, tracker: _ProgressTracker):
+        """Recria o conteúdo de um manifesto numa pasta nova"""
+        os.makedirs(dest_path)
+        for rel_dir in manifest["dirs"]:
+            os.makedirs(os.path.join(dest_path, *rel_dir.split("/")), exist_ok=True)
+        deltas = []
+        copies = []
+        for rel_path, entry in manifest["files"].items():
+            dest = os.path.join(dest_path, *rel_path.split("/"))
+            if self.is_delta(entry["sha256"]):
+                deltas.append((entry, dest))
+            else:
+                copies.append((self.object_path(entry["sha256"]), dest, entry["mtime_ns"]))
+        copy_files(copies, self.copy_workers, tracker.advance, preserve_metadata=False,
+                   strategy=self._clone_strategy())
+        cache = {}
+        for entry, dest in deltas:
+            tracker.advance(self.write_object(entry["sha256"], dest, entry["mtime_ns"], cache))
+
+    def restore_snapshot(self, snapshot_name: str, dest_path: str, progress: ProgressCallback = None,
+                         verify: bool = True):
+        """
+        Recria uma pasta a partir de um backup histórico
+
+        Args:
+            snapshot_name: Nome do backup
+            dest_path: Pasta de destino (será substituída)
+            progress: Callback de progresso (bytes copiados, bytes totais); se
+                levantar uma exceção, dest_path não é alterada
+            verify: Se deve conferir os hashes da cópia antes de substituir dest_path
+        """
+        manifest = self.load_manifest(snapshot_name)
+        tracker = _ProgressTracker(progress, sum(entry["size"] for entry in manifest["files"].values()))
+        self._staged_restore(dest_path, lambda staged_path: self._materialize_snapshot(manifest, staged_path, tracker),
+                             manifest["files"] if verify else None, tracker.total)
+
+    def expected_files(self, backup_name: str) -> Optional[Dict]:
+        """
+        Obtém os arquivos registrados de um backup, com hash e tamanho
+
+        Backups do repositório e .zip usam o próprio manifesto; o backup atual
+        usa o índice da pasta. Backups históricos legados (pastas) não têm
+        registro.
+
+        Args:
+            backup_name: Nome do backup como exibido na lista
+
+        Returns:
+            Optional[Dict]: Caminho -> entrada ("sha256" pode ser None em
+                .zip de outras ferramentas), ou None se não houver registro
+
+        Raises:
+            FileNotFoundError: Se o backup não existir
+        """
+        if self.has_snapshot(backup_name):
+            return self.load_manifest(backup_name)["files"]
+        if self.has_archive(backup_name):
+            return read_archive_manifest(self.archive_path(backup_name))["files"]
+        backup_dir = os.path.join(self.backup_path, backup_name)
+        if not os.path.isdir(backup_dir):
+            raise FileNotFoundError(backup_dir)
+        if "_backup_" in backup_name:
+            return None
+        index = self.load_index(backup_name)
+        return index["files"] if index else None
+
+    def restore(self, backup_name: str, progress: ProgressCallback = None, verify: bool = True) -> str:
+        """
+        Restaura um backup (atual, histórico legado ou do repositório) para a pasta de save original
+
+        O backup é copiado para uma pasta temporária e trocado com a pasta de
+        save por renomeação, então o save nunca fica ausente ou pela metade.
+
+        Args:
+            backup_name: Nome do backup como exibido na lista
+            progress: Callback de progresso (bytes copiados, bytes totais); se
+                levantar uma exceção, a pasta de save não é alterada
+            verify: Se deve conferir a cópia contra os hashes registrados
+                (expected_files) antes de substituir a pasta de save
+
+        Returns:
+            str: Caminho da pasta de save restaurada
+
+        Raises:
+            FileNotFoundError: Se o backup não existir
+            ValueError: Se a cópia não conferir com os hashes registrados
+        """
+        original_save_path = os.path.join(self.saves_base_path, original_folder_name(backup_name))
+
+        if self.has_snapshot(backup_name):
+            self.restore_snapshot(backup_name, original_save_path, progress, verify)
+            return original_save_path
+
+        expected = self.expected_files(backup_name) if verify else None
+        if self.has_archive(backup_name):
+            archive_path = self.archive_path(backup_name)
+            tracker = _ProgressTracker(progress, read_archive_index(archive_path)["size"])
+            self._staged_restore(
+                original_save_path,
+                lambda staged_path: extract_archive(archive_path, staged_path, tracker.advance),
+                expected, tracker.total
+            )
+            return original_save_path
+
+        backup_dir = os.path.join(self.backup_path, backup_name)
+        tracker = _ProgressTracker(progress, _tree_size(backup_dir))
+        self._staged_restore(
+            original_save_path,
+            lambda staged_path: copy_tree(backup_dir, staged_path, self.copy_workers, tracker.advance,
+                                           self._clone_strategy()),
+            expected, tracker.total
+        )
+        return original_save_path
+
+    def extract_file(self, backup_name: str, rel_path: str, dest_file: str):
+        """
+        Copia um único arquivo de um backup, sem restaurar a pasta inteira
+
+        Args:
+            backup_name: Nome do backup como exibido na lista
+            rel_path: Caminho do arquivo dentro do backup (separado por "/")
+            dest_file: Arquivo de destino
+
+        Raises:
+            FileNotFoundError: Se o backup ou o arquivo não existirem
+        """
+        if self.has_snapshot(backup_name):
+            entry = self.load_manifest(backup_name)["files"].get(rel_path)
+            if entry is None:
+                raise FileNotFoundError(rel_path)
+            self.write_object(entry["sha256"], dest_file, entry["mtime_ns"])
+        elif self.has_archive(backup_name):
+            extract_archive_file(self.archive_path(backup_name), rel_path, dest_file)
+        else:
+            copy_file(os.path.join(self.backup_path, backup_name, *rel_path.split("/")), dest_file,
+                      strategy=self._clone_strategy())
+
+    def delete(self, backup_name: str, progress: ProgressCallback = None) -> int:
+        """
+        Exclui um backup e remove os objetos que ficaram sem referência
+
+        Args:
+            backup_name: Nome do backup como exibido na lista
+            progress: Callback de progresso (bytes liberados, bytes totais)
+
+        Returns:
+            int: Número de bytes liberados
+
+        Raises:
+            FileNotFoundError: Se o backup não existir
+        """
+        if self.has_snapshot(backup_name):
+            os.remove(self._manifest_path(backup_name))
+            return self.collect_garbage()
+
+        if self.has_archive(backup_name):
+            archive_path = self.archive_path(backup_name)
+            freed = os.path.getsize(archive_path)
+            os.remove(archive_path)
+            return freed
+
+        backup_dir = os.path.join(self.backup_path, backup_name)
+        if not os.path.isdir(backup_dir):
+            raise FileNotFoundError(backup_dir)
+        tracker = _ProgressTracker(progress, _tree_size(backup_dir))
+        _remove_tree(backup_dir, tracker)
+        return tracker.done
+
+    def measure(self, backup_name: str) -> Tuple[int, Dict[str, int]]:
+        """
+        Mede o espaço ocupado por um backup
+
+        Args:
+            backup_name: Nome do backup como exibido na lista
+
+        Returns:
+            Tuple[int, Dict[str, int]]: Bytes só do backup (manifesto, .zip ou
+                pasta) e objetos do repositório que ele referencia (hash ->
+                tamanho), que podem ser compartilhados com outros backups
+
+        Raises:
+            FileNotFoundError: Se o backup não existir
+        """
+        if self.has_snapshot(backup_name):
+            manifest = self.load_manifest(backup_name)
+            objects = {}
+            for entry in manifest["files"].values():
+                try:
+                    # Um delta também ocupa as bases de que depende
+                    for digest in self.object_chain(entry["sha256"]):
+                        if digest not in objects:
+                            objects[digest] = self._stored_size(digest)
+                except (OSError, ValueError):
+                    objects[entry["sha256"]] = 0
+            return os.path.getsize(self._manifest_path(backup_name)), objects
+
+        if self.has_archive(backup_name):
+            return os.path.getsize(self.archive_path(backup_name)), {}
+
+        backup_dir = os.path.join(self.backup_path, backup_name)
+        if not os.path.isdir(backup_dir):
+            raise FileNotFoundError(backup_dir)
+        return _tree_size(backup_dir), {}
+
+    def delete_many(self, backup_names: List[str], progress: ProgressCallback = None) -> int:
+        """
+        Exclui vários backups e recolhe os objetos sem referência uma única vez
+
+        Args:
+            backup_names: Nomes dos backups como exibidos na lista
+            progress: Callback de progresso (bytes liberados, bytes totais)
+
+        Returns:
+            int: Número de bytes liberados
+
+        Raises:
+            FileNotFoundError: Se algum backup não existir (os anteriores já
+                foram excluídos)
+        """
+        paths = []
+        for backup_name in backup_names:
+            if self.has_snapshot(backup_name):
+                paths.append(self._manifest_path(backup_name))
+            elif self.has_archive(backup_name):
+                paths.append(self.archive_path(backup_name))
+            else:
+                backup_dir = os.path.join(self.backup_path, backup_name)
+                if not os.path.isdir(backup_dir):
+                    raise FileNotFoundError(backup_dir)
+                paths.append(backup_dir)
+        tracker = _ProgressTracker(progress, sum(
+            _tree_size(path) if os.path.isdir(path) else os.path.getsize(path) for path in paths
+        ))
+
+        try:
+            for path in paths:
+                if os.path.isdir(path):
+                    _remove_tree(path, tracker)
+                else:
+                    size = os.path.getsize(path)
+                    os.remove(path)
+                    tracker.advance(size)
+        finally:
+            # Mesmo se a exclusão parar no meio, os manifestos já removidos
+            # não podem deixar objetos órfãos
+            freed = self.collect_garbage()
+        return tracker.done + freed
+
+    def collect_garbage(self) -> int:
+        """
+        Remove objetos que não são referenciados por nenhum manifesto
+
+        Objetos gravados ou reaproveitados há menos de GC_GRACE_SECONDS são
+        mantidos, já que um backup em andamento pode referenciá-los num
+        manifesto que ainda não foi gravado.
+
+        Returns:
+            int: Número de bytes liberados
+        """
+        referenced = set()
+        for name in self.list_snapshots():
+            try:
+                manifest = self.load_manifest(name)
+            except (OSError, json.JSONDecodeError):
+                # Manifesto ilegível: não apagar nada que ele possa referenciar
+                return 0
+            referenced.update(entry["sha256"] for entry in manifest["files"].values())
+
+        # As bases dos deltas também continuam necessárias
+        pending = list(referenced)
+        while pending:
+            digest = pending.pop()
+            if not self.is_delta(digest):
+                continue
+            try:
+                base_digest = read_delta_base(self._delta_path(digest))
+            except (OSError, ValueError):
+                return 0
+            if base_digest not in referenced:
+                referenced.add(base_digest)
+                pending.append(base_digest)
+
+        freed = 0
+        if not os.path.isdir(self.objects_path):
+            return freed
+        recent = time.time() - GC_GRACE_SECONDS
+        for prefix in os.listdir(self.objects_path):
+            prefix_path = os.path.join(self.objects_path, prefix)
+            if not os.path.isdir(prefix_path):
+                continue
+            for name in os.listdir(prefix_path):
+                # Arquivos .tmp pertencem a gravações em andamento
+                digest = name[:-len(DELTA_SUFFIX)] if name.endswith(DELTA_SUFFIX) else name
+                if digest not in referenced and not name.endswith(".tmp"):
+                    object_path = os.path.join(prefix_path, name)
+                    object_stat = os.stat(object_path)
+                    if object_stat.st_mtime > recent:
+                        continue
+                    freed += object_stat.st_size
+                    remove_file(object_path)
+            if not os.listdir(prefix_path):
+                os.rmdir(prefix_path)
+        return freed
@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks do Editor/Backup de Saves R.E.P.O
+
+Gera saves sintéticos em uma pasta temporária e mede o custo das operações
+principais. Uso:
+    python benchmarks.py decrypt
+
+"importtime" é uma verificação: termina com código 1 se um ponto de entrada
+passar de IMPORT_BUDGET_MS ou carregar na inicialização um módulo que deveria
+ser importado só quando usado (LAZY_MODULES).
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from backup_scrub import scrub
+from backup_store import BackupStore, scan_backups, scan_save_folders
+from bulk_operations import bulk_summarize
+from copy_engine import DEFAULT_COPY_WORKERS, copy_tree, supported_strategies
+import instrumentation
+from save_diff import diff_trees
+from save_editor_core import SaveEditorCore, _orjson, derive_key, dump_json, load_json
+from save_watcher import SaveWatcher
+
+# Tempo máximo de importação (cumulativo, -X importtime) dos pontos de entrada
+IMPORT_BUDGET_MS = 100
+# Módulos que só devem ser carregados quando usados (veja save_editor_core, backup_archive e save_watcher)
+LAZY_MODULES = ("Crypto", "zipfile", "orjson", "ctypes")
+ENTRY_POINTS = ["backup_saves_enhanced_with_editor", "repo_backup_cli"]
+
+UPGRADE_KEYS = [
+    "playerUpgradeHealth", "playerUpgradeStamina", "playerUpgradeExtraJump",
+    "playerUpgradeLaunch", "playerUpgradeMapPlayerCount", "playerUpgradeSpeed",
+    "playerUpgradeStrength", "playerUpgradeRange", "playerUpgradeThrow"
+]
+
+
+def make_synthetic_save(player_count: int = 4, item_count: int = 200, seed: int = 0) -> Dict:
+    """
+    Cria um save com a mesma estrutura dos saves do R.E.P.O
+
+    Args:
+        player_count: Número de jogadores
+        item_count: Número de itens em cada dicionário de itens
+        seed: Semente para gerar sempre o mesmo save
+
+    Returns:
+        Dict: Dados do save
+    """
+    rng = random.Random(seed)
+    player_ids = [str(76561190000000000 + rng.randrange(10 ** 9)) for _ in range(player_count)]
+    dictionaries = {
+        "runStats": {
+            "level": 5, "currency": 120, "lives": 3,
+            "chargingStationCharge": 80, "totalHaul": 45210
+        },
+        "playerHealth": {player_id: 100 for player_id in player_ids}
+    }
+    for key in UPGRADE_KEYS:
+        dictionaries[key] = {player_id: rng.randrange(5) for player_id in player_ids}
+    for key in ("itemsPurchased", "itemsPurchasedTotal", "itemsUpgradesPurchased", "item"):
+        dictionaries[key] = {f"Item {key} {n}": rng.randrange(10) for n in range(item_count)}
+    return {
+        "dictionaryOfDictionaries": {"__type": "System.Collections.Generic.Dictionary", "value": dictionaries},
+        "playerNames": {"__type": "System.Collections.Generic.Dictionary",
+                        "value": {player_id: f"Player {n}" for n, player_id in enumerate(player_ids)}},
+        "timePlayed": {"__type": "float", "value": 4711.25},
+        "dateAndTime": {"__type": "string", "value": "2025-05-01"},
+        "teamName": {"__type": "string", "value": "R.E.P.O."}
+    }
+
+
+def write_synthetic_save(path: str, player_count: int = 4, item_count: int = 200,
+                         should_gzip: bool = False, seed: int = 0) -> int:
+    """
+    Grava um save sintético criptografado
+
+    Returns:
+        int: Tamanho do arquivo gravado
+    """
+    data = json.dumps(make_synthetic_save(player_count, item_count, seed), indent=4).encode('utf-8')
+    SaveEditorCore().encrypt_es3(data, path, should_gzip=should_gzip)
+    return os.path.getsize(path)
+
+
+def timeit(func: Callable, repeat: int) -> float:
+    """Executa func repeat vezes e devolve o melhor tempo em segundos"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable) -> int:
+    """Executa func uma vez e devolve o pico de memória alocada em bytes"""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def report(name: str, seconds: float):
+    print(f"{name:<40} {seconds * 1000:10.3f} ms")
+
+
+def bench_decrypt(args) -> List[Dict]:
+    """Custo de descriptografar um save: derivação de chave antiga x nova"""
+    from Crypto.Protocol.KDF import PBKDF2
+    from Crypto.Hash import HMAC, SHA1
+
+    core = SaveEditorCore()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.es3")
+        size = write_synthetic_save(path, item_count=args.items)
+        with open(path, 'rb') as f:
+            iv = f.read(16)
+
+        def legacy_kdf():
+            PBKDF2(core.password, iv, dkLen=16, count=100,
+                   prf=lambda p, s: HMAC.new(p, s, SHA1).digest())
+
+        def native_kdf():
+            derive_key.__wrapped__(core.password, iv)
+
+        def decrypt_cold():
+            derive_key.cache_clear()
+            core.decrypt_es3(path)
+
+        results = [
+            ("kdf: PBKDF2 + HMAC em Python", timeit(legacy_kdf, args.repeat)),
+            ("kdf: hashlib.pbkdf2_hmac", timeit(native_kdf, args.repeat)),
+            ("decrypt_es3 (cache vazio)", timeit(decrypt_cold, args.repeat)),
+            ("decrypt_es3 (chave em cache)", timeit(lambda: core.decrypt_es3(path), args.repeat)),
+        ]
+        legacy_decrypt = results[2][1] - results[1][1] + results[0][1]
+        results.append(("decrypt_es3 estimado com KDF antigo", legacy_decrypt))
+
+    print(f"save de {size} bytes, melhor de {args.repeat} execuções")
+    for name, seconds in results:
+        report(name, seconds)
+    return [{"name": name, "seconds": seconds} for name, seconds in results]
+
+
+def bench_stream(args) -> List[Dict]:
+    """Pico de memória: descriptografia em buffer único x em streaming"""
+    import gzip
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+
+    core = SaveEditorCore()
+
+    def whole_file(path):
+        with open(path, 'rb') as f:
+            encrypted_data = f.read()
+        iv = encrypted_data[:16]
+        cipher = AES.new(derive_key(core.password, iv), AES.MODE_CBC, iv)
+        data = unpad(cipher.decrypt(encrypted_data[16:]), AES.block_size)
+        if data[:2] == b'\x1f\x8b':
+            data = gzip.decompress(data)
+        return len(data)
+
+    def streaming(path):
+        return sum(len(chunk) for chunk in core.iter_decrypt_es3(path))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.es3")
+        size = write_synthetic_save(path, item_count=args.items * 50, should_gzip=True)
+        print(f"save GZip de {size} bytes")
+        for name, func in (("buffer único", whole_file), ("streaming", streaming)):
+            seconds = timeit(lambda: func(path), max(1, args.repeat // 4))
+            peak_bytes = peak_memory(lambda: func(path))
+            print(f"{name:<40} {seconds * 1000:10.3f} ms  pico {peak_bytes / 1024:10.1f} KB")
+            results.append({"name": name, "seconds": seconds, "peak_bytes": peak_bytes})
+    return results
+
+
+def bench_summary(args) -> List[Dict]:
+    """Informações para a lista: open_save_file + get_file_info x read_file_summary"""
+    def full_parse(path):
+        core = SaveEditorCore()
+        core.open_save_file(path)
+        return core.get_file_info()
+
+    def summary(path):
+        return SaveEditorCore().read_file_summary(path)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for item_count in (args.items, args.items * 10, args.items * 50):
+            path = os.path.join(tmp, f"bench_{item_count}.es3")
+            size = write_synthetic_save(path, item_count=item_count)
+            assert full_parse(path) == summary(path)
+            for name, func in (("json.loads completo", full_parse), ("read_file_summary", summary)):
+                seconds = timeit(lambda: func(path), args.repeat)
+                peak_bytes = peak_memory(lambda: func(path))
+                print(f"{name + f' ({size // 1024} KB)':<40} {seconds * 1000:10.3f} ms  pico {peak_bytes / 1024:10.1f} KB")
+                results.append({"name": name, "file_size": size, "seconds": seconds, "peak_bytes": peak_bytes})
+    return results
+
+
+def bench_save(args) -> List[Dict]:
+    """Salvamento no editor: JSON indentado x compacto x save sem alterações"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.es3")
+        write_synthetic_save(path, item_count=args.items * 10)
+        core = SaveEditorCore()
+        core.open_save_file(path)
+        world = core.get_world_data()
+
+        def edited_save(compact):
+            # Alterna a moeda para que sempre haja o que gravar
+            world["currency"] += 1
+            core.update_world_data({"currency": world["currency"]})
+            core.save_file(path, compact=compact)
+
+        for name, func in (("save_file indentado", lambda: edited_save(False)),
+                           ("save_file compacto", lambda: edited_save(True)),
+                           ("save_file sem alterações", lambda: core.save_file(path))):
+            seconds = timeit(func, args.repeat)
+            size = os.path.getsize(path)
+            print(f"{name:<40} {seconds * 1000:10.3f} ms  {size / 1024:10.1f} KB")
+            results.append({"name": name, "seconds": seconds, "file_size": size})
+    return results
+
+
+def same_json(a, b) -> bool:
+    """Compara dois documentos incluindo tipos (int x float) e ordem das chaves"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same_json(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_json(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def bench_json(args) -> List[Dict]:
+    """Interpretar e serializar o JSON do save: json x load_json/dump_json (orjson)"""
+    if _orjson() is None:
+        print("orjson não instalado: load_json/dump_json usam o json")
+
+    results = []
+    for item_count in (args.items, args.items * 10, args.items * 50):
+        document = make_synthetic_save(item_count=item_count)
+        document["teamName"]["value"] = "R.E.P.O. ñ ✓"
+        data = json.dumps(document, indent=4).encode('utf-8')
+        parsed, fast = load_json(data)
+        assert same_json(parsed, document) and same_json(load_json(dump_json(parsed, True, fast))[0], document)
+
+        label = f"({len(data) // 1024} KB)"
+        for name, func in (
+            ("json.loads", lambda: json.loads(data.decode('utf-8'))),
+            ("load_json", lambda: load_json(data)),
+            ("json.dumps indent=4", lambda: json.dumps(parsed, indent=4).encode('utf-8')),
+            ("json.dumps compacto", lambda: json.dumps(parsed, separators=(',', ':')).encode('utf-8')),
+            ("dump_json compacto", lambda: dump_json(parsed, compact=True, fast=fast)),
+        ):
+            seconds = timeit(func, args.repeat)
+            report(f"{name} {label}", seconds)
+            results.append({"name": name, "json_size": len(data), "seconds": seconds})
+    return results
+
+
+def _legacy_listing(saves_base_path: str):
+    """Listagem como era feita antes: listdir + isdir/exists/getmtime por entrada"""
+    saves = []
+    for item in os.listdir(saves_base_path):
+        item_path = os.path.join(saves_base_path, item)
+        if os.path.isdir(item_path) and item != "backup":
+            has_backup = os.path.exists(os.path.join(saves_base_path, "backup", item))
+            saves.append((item, has_backup, os.path.getmtime(item_path)))
+    backups = []
+    backup_folder = os.path.join(saves_base_path, "backup")
+    if os.path.exists(backup_folder):
+        for item in os.listdir(backup_folder):
+            item_path = os.path.join(backup_folder, item)
+            if os.path.isdir(item_path):
+                backups.append((item, os.path.getctime(item_path)))
+    return saves, backups
+
+
+def _scandir_listing(saves_base_path: str):
+    backups, backup_dirs = scan_backups(saves_base_path)
+    return scan_save_folders(saves_base_path, backup_dirs), backups
+
+
+def bench_listing(args) -> List[Dict]:
+    """Listagem de update_lists em uma árvore com muitos backups históricos"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        backup_path = os.path.join(tmp, "backup")
+        os.makedirs(backup_path)
+        save_count = 50
+        for n in range(save_count):
+            os.makedirs(os.path.join(tmp, f"REPO_SAVE_{n}"))
+            os.makedirs(os.path.join(backup_path, f"REPO_SAVE_{n}"))
+        for n in range(args.backups):
+            name = f"REPO_SAVE_{n % save_count}_backup_2025{n // 86400 % 12 + 1:02d}01_{n % 86400:06d}"
+            os.makedirs(os.path.join(backup_path, name))
+        print(f"{save_count} saves, {args.backups} backups históricos")
+
+        legacy = _legacy_listing(tmp)
+        current = _scandir_listing(tmp)
+        assert len(legacy[0]) == len(current[0]) and len(legacy[1]) == len(current[1])
+        for name, func in (("listdir + os.path.*", _legacy_listing), ("os.scandir", _scandir_listing)):
+            seconds = timeit(lambda: func(tmp), args.repeat)
+            report(name, seconds)
+            results.append({"name": name, "backups": args.backups, "seconds": seconds})
+    return results
+
+
+def bench_copy(args) -> List[Dict]:
+    """Cópia de uma pasta com muitos arquivos: shutil.copytree x copy_tree paralelo"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source")
+        for n in range(args.files):
+            folder = os.path.join(source, f"REPO_SAVE_{n % 20}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"file_{n}.es3"), 'wb') as f:
+                f.write(os.urandom(args.file_size))
+        print(f"{args.files} arquivos de {args.file_size // 1024} KB")
+
+        def run(func):
+            dest = os.path.join(tmp, "dest")
+            shutil.rmtree(dest, ignore_errors=True)
+            func(source, dest)
+
+        candidates = [("shutil.copytree", shutil.copytree), ("copy_tree (1 thread)", lambda s, d: copy_tree(s, d, 1))]
+        for workers in sorted({2, 4, args.workers} - {1}):
+            candidates.append((f"copy_tree ({workers} threads)", lambda s, d, w=workers: copy_tree(s, d, w)))
+        for name, func in candidates:
+            seconds = timeit(lambda: run(func), max(1, args.repeat // 4))
+            report(name, seconds)
+            results.append({"name": name, "files": args.files, "seconds": seconds})
+    return results
+
+
+def disk_usage(root_path: str) -> int:
+    """Espaço ocupado por uma pasta, contando cada arquivo (inode) uma única vez"""
+    seen = set()
+    total = 0
+    for current, _, file_names in os.walk(root_path):
+        for file_name in file_names:
+            stat = os.lstat(os.path.join(current, file_name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += getattr(stat, "st_blocks", 0) * 512 or stat.st_size
+    return total
+
+
+def bench_strategy(args) -> List[Dict]:
+    """Backup e restauração com cada estratégia de cópia (copy, reflink, hardlink)"""
+    results = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        supported = supported_strategies(tmp)
+        print(f"{args.saves} pastas com {args.files // args.saves or 1} arquivo(s) de {args.file_size // 1024} KB "
+              f"em {os.path.abspath(tmp)}; suportado: {', '.join(supported)}")
+        for n in range(args.files):
+            folder = os.path.join(tmp, f"REPO_SAVE_{n % args.saves}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"file_{n}.es3"), 'wb') as f:
+                f.write(os.urandom(args.file_size))
+        folders = sorted(name for name in os.listdir(tmp) if name.startswith("REPO_SAVE_"))
+
+        for strategy in ("copy", "reflink", "hardlink"):
+            if strategy not in supported:
+                print(f"{strategy:<40} sem suporte neste sistema de arquivos (cai para copy)")
+            backup_path = os.path.join(tmp, "backup")
+
+            def backup():
+                shutil.rmtree(backup_path, ignore_errors=True)
+                store = BackupStore(tmp, args.workers, strategy)
+                for folder in folders:
+                    store.backup_folder(folder, incremental=False)
+
+            seconds = timeit(backup, max(1, args.repeat // 10))
+            used = disk_usage(backup_path)
+            name = f"backup ({strategy})"
+            print(f"{name:<40} {seconds * 1000:10.3f} ms  {used / 1024 / 1024:10.1f} MB em backup/")
+            results.append({"name": name, "seconds": seconds, "disk_bytes": used, "supported": strategy in supported})
+
+            store = BackupStore(tmp, args.workers, strategy)
+            seconds = timeit(lambda: [store.restore(folder, verify=False) for folder in folders],
+                             max(1, args.repeat // 10))
+            name = f"restauração ({strategy})"
+            report(name, seconds)
+            results.append({"name": name, "seconds": seconds, "supported": strategy in supported})
+    return results
+
+
+def bench_delta(args) -> List[Dict]:
+    """Backups sucessivos de um save com poucos valores alterados: objeto inteiro x delta"""
+    results = []
+    core = SaveEditorCore()
+    data = make_synthetic_save(item_count=args.items)
+    count = max(2, args.repeat)
+    for delta in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = os.path.join(tmp, "REPO_SAVE_0")
+            os.makedirs(folder)
+            store = BackupStore(tmp, delta_saves=delta)
+            seconds = 0.0
+            written = 0
+            for n in range(count):
+                data["dictionaryOfDictionaries"]["value"]["runStats"]["currency"] = n
+                core.encrypt_es3(dump_json(data), os.path.join(folder, "REPO_SAVE_0.es3"))
+                start = time.perf_counter()
+                # incremental=False: os backups do mesmo segundo reaproveitariam o índice
+                result = store.backup_folder("REPO_SAVE_0", incremental=False)
+                seconds += time.perf_counter() - start
+                if n:
+                    written += result["stats"]["bytes_written"]
+            name = f"backup {'com delta' if delta else 'sem delta'}"
+            per_backup = written / (count - 1)
+            print(f"{name:<40} {seconds / count * 1000:10.3f} ms  {per_backup:10.0f} B por backup")
+            results.append({"name": name, "seconds": seconds / count, "bytes_per_backup": per_backup})
+    return results
+
+
+def bench_diff(args) -> List[Dict]:
+    """Comparação estrutural de dois saves com poucos valores alterados, com poucos e muitos jogadores"""
+    results = []
+    for player_count in (4, 100, 1000):
+        old = make_synthetic_save(player_count=player_count, item_count=args.items)
+        new = json.loads(json.dumps(old))
+        values = new["dictionaryOfDictionaries"]["value"]
+        values["runStats"]["currency"] += 1
+        player_id = next(iter(values["playerUpgradeSpeed"]))
+        values["playerUpgradeSpeed"][player_id] += 1
+        seconds = timeit(lambda: diff_trees(old, new), args.repeat)
+        name = f"diff_trees ({player_count} jogadores)"
+        report(name, seconds)
+        results.append({"name": name, "players": player_count, "seconds": seconds,
+                        "changes": len(diff_trees(old, new))})
+    return results
+
+
+def bench_instrumentation(args) -> List[Dict]:
+    """Custo da medição de tempos: abrir e salvar um save com a medição desligada x ligada"""
+    core = SaveEditorCore()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.es3")
+        write_synthetic_save(path, item_count=args.items)
+
+        def open_and_save():
+            core.open_save_file(path)
+            core.set_value(("timePlayed", "value"), random.random())
+            core.save_file(path)
+
+        results = []
+        for name, enabled in (("open + save (medição desligada)", False), ("open + save (medição ligada)", True)):
+            if enabled:
+                instrumentation.enable()
+            try:
+                seconds = timeit(open_and_save, args.repeat)
+            finally:
+                instrumentation.disable()
+            report(name, seconds)
+            results.append({"name": name, "seconds": seconds})
+    for row in instrumentation.snapshot():
+        print(f"  {row['phase']:<12} {row['count']:6d} chamadas  média {row['mean_ms']:8.3f} ms  "
+              f"p95 {row['p95_ms']:8.3f} ms")
+    instrumentation.reset()
+    return results
+
+
+def bench_bulk(args) -> List[Dict]:
+    """Resumo completo de muitos saves: um a um x bulk_summarize em processos"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.saves):
+            path = os.path.join(tmp, f"REPO_SAVE_{n}.es3")
+            write_synthetic_save(path, item_count=args.items, should_gzip=n % 2 == 1, seed=n)
+            paths.append(path)
+        print(f"{args.saves} saves, {os.cpu_count()} CPUs")
+
+        candidates = [("sequencial", 1)] + [(f"{workers} processos", workers)
+                                            for workers in sorted({2, 4, os.cpu_count() or 1} - {1})]
+        for name, workers in candidates:
+            seconds = timeit(lambda: list(bulk_summarize(paths, full=True, workers=workers)),
+                             max(1, args.repeat // 10))
+            report(name, seconds)
+            results.append({"name": name, "saves": args.saves, "seconds": seconds})
+    return results
+
+
+def bench_scrub(args) -> List[Dict]:
+    """Verificação de todos os backups (hash + descriptografia) com 1 e com várias threads"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(args.saves):
+            folder = os.path.join(tmp, f"REPO_SAVE_{n}")
+            os.makedirs(folder)
+            write_synthetic_save(os.path.join(folder, f"REPO_SAVE_{n}.es3"), item_count=args.items,
+                                 should_gzip=n % 2 == 1, seed=n)
+        store = BackupStore(tmp)
+        for n in range(args.saves):
+            store.backup_folder(f"REPO_SAVE_{n}")
+        print(f"{args.saves} saves (backup atual + histórico), {os.cpu_count()} CPUs")
+
+        for decrypt in (False, True):
+            for workers in sorted({1, args.workers}):
+                name = f"{'hash + descriptografia' if decrypt else 'só hash'}, {workers} thread(s)"
+                seconds = timeit(lambda: scrub(store, decrypt=decrypt, workers=workers), max(1, args.repeat // 10))
+                report(name, seconds)
+                results.append({"name": name, "saves": args.saves, "seconds": seconds})
+    return results
+
+
+def measure_import(module: str) -> Dict:
+    """
+    Importa um módulo num processo novo com -X importtime
+
+    Returns:
+        Dict: Tempo cumulativo em segundos ("seconds") e módulos carregados ("modules")
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    seconds = None
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.append(name.strip())
+        if name.strip() == module:
+            seconds = int(cumulative) / 1e6
+    return {"seconds": seconds, "modules": modules}
+
+
+def bench_watch(args) -> List[Dict]:
+    """Backup automático: CPU com a pasta parada e atraso do aviso depois de uma rajada de escritas"""
+    results = []
+    debounce = 0.5
+    for use_inotify in (True, False):
+        with tempfile.TemporaryDirectory() as tmp:
+            save_file = os.path.join(tmp, "REPO_SAVE_1", "REPO_SAVE_1.es3")
+            os.makedirs(os.path.dirname(save_file))
+            notified = []
+            watcher = SaveWatcher(tmp, lambda folder: notified.append(time.perf_counter()),
+                                  debounce=debounce, use_inotify=use_inotify)
+            watcher.start()
+            try:
+                cpu = time.process_time()
+                time.sleep(args.idle)
+                idle_cpu = (time.process_time() - cpu) / args.idle
+
+                # Rajada de 10 escritas com o arquivo aberto, como o jogo gravando aos poucos
+                with open(save_file, 'wb') as f:
+                    for _ in range(10):
+                        f.write(os.urandom(4096))
+                        f.flush()
+                        time.sleep(0.05)
+                closed = time.perf_counter()
+                limit = closed + debounce + watcher.poll_interval + 5
+                while not notified and time.perf_counter() < limit:
+                    time.sleep(0.01)
+                time.sleep(debounce + 1)
+            finally:
+                watcher.stop()
+            latency = notified[0] - closed if notified else float("nan")
+            print(f"{watcher.backend:<10} CPU parado {idle_cpu * 100:6.3f}%  aviso {latency * 1000:8.1f} ms "
+                  f"após fechar (debounce {debounce * 1000:.0f} ms)  avisos: {len(notified)}")
+            results.append({"name": watcher.backend, "idle_cpu": idle_cpu, "latency": latency,
+                            "notifications": len(notified)})
+    return results
+
+
+def bench_importtime(args) -> List[Dict]:
+    """Orçamento de inicialização: tempo de importação e módulos carregados cedo demais"""
+    results = []
+    for module in args.modules or ENTRY_POINTS:
+        try:
+            runs = [measure_import(module) for _ in range(max(1, args.repeat // 4))]
+        except RuntimeError as e:
+            print(f"{module:<40} erro: {e}")
+            results.append({"name": module, "ok": False, "error": str(e)})
+            continue
+        seconds = min(run["seconds"] for run in runs)
+        eager = sorted({name for name in runs[0]["modules"] if name.split(".")[0] in LAZY_MODULES})
+        ok = seconds * 1000 <= args.budget_ms and not eager
+        status = "ok" if ok else "ACIMA DO ORÇAMENTO"
+        print(f"{module:<40} {seconds * 1000:10.3f} ms  (limite {args.budget_ms} ms) {status}")
+        if eager:
+            print(f"    importados na inicialização: {', '.join(eager)}")
+        results.append({"name": module, "ok": ok, "seconds": seconds, "eager_modules": eager})
+    return results
+
+
+BENCHMARKS = {
+    "decrypt": bench_decrypt,
+    "stream": bench_stream,
+    "summary": bench_summary,
+    "listing": bench_listing,
+    "copy": bench_copy,
+    "delta": bench_delta,
+    "diff": bench_diff,
+    "instrumentation": bench_instrumentation,
+    "strategy": bench_strategy,
+    "bulk": bench_bulk,
+    "scrub": bench_scrub,
+    "json": bench_json,
+    "save": bench_save,
+    "watch": bench_watch,
+    "importtime": bench_importtime,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do R.E.P.O Save Editor")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições por medida")
+    parser.add_argument("--items", type=int, default=200, help="Itens por dicionário do save sintético")
+    parser.add_argument("--backups", type=int, default=10000, help="Backups históricos da árvore sintética")
+    parser.add_argument("--files", type=int, default=2000, help="Arquivos da árvore sintética de cópia")
+    parser.add_argument("--file-size", type=int, default=64 * 1024, help="Tamanho de cada arquivo da árvore de cópia")
+    parser.add_argument("--workers", type=int, default=DEFAULT_COPY_WORKERS, help="Threads de cópia a comparar")
+    parser.add_argument("--saves", type=int, default=200, help="Saves sintéticos do benchmark em lote")
+    parser.add_argument("--dir", help="Pasta onde criar a árvore de strategy (ex.: um tmpfs ou um "
+                                      "btrfs/XFS montado em loop; padrão: pasta temporária)")
+    parser.add_argument("--idle", type=float, default=3.0, help="Segundos de pasta parada medidos por watch")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="Limite do tempo de importação (importtime)")
+    parser.add_argument("--modules", nargs="*", help="Módulos medidos por importtime (padrão: pontos de entrada)")
+    args = parser.parse_args(argv)
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    ok = True
+    for name in names:
+        print(f"== {name} ==")
+        results = BENCHMARKS[name](args)
+        ok = ok and all(result.get("ok", True) for result in results)
+    # Verificações com limite (importtime) fazem o script terminar com erro
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Operações em lote sobre muitos arquivos .es3
+
+Descriptografar (AES + PBKDF2), interpretar o JSON e criptografar de novo
+usam CPU e seguram o GIL na maior parte do tempo, então o trabalho é
+dividido entre processos com ProcessPoolExecutor. Os arquivos são enviados
+em lotes para diluir o custo de comunicação entre processos, e cada
+processo mantém o seu próprio SaveEditorCore (com o cache de chaves de
+derive_key). O pool (multiprocessing) só é importado quando usado, para
+não pesar na inicialização da linha de comando.
+
+Cada função devolve um iterador de resultados, um por arquivo, na ordem de
+entrada (ordered=True) ou à medida que os lotes terminam. Um erro em um
+arquivo vira um resultado com "ok": False e não interrompe os demais.
+"""
+
+import os
+import sys
+from contextlib import redirect_stdout
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from save_editor_core import SaveEditorCore, load_json
+
+# Lotes por processo quando chunk_size não é informado
+CHUNKS_PER_WORKER = 4
+# Abaixo disso o custo de iniciar os processos não compensa
+MIN_PARALLEL_ITEMS = 8
+
+_worker_core = None
+
+
+def _init_worker():
+    global _worker_core
+    _worker_core = SaveEditorCore()
+
+
+def _core() -> SaveEditorCore:
+    if _worker_core is None:
+        _init_worker()
+    return _worker_core
+
+
+def _failure(file_path: str, error: Exception) -> Dict:
+    return {"file": file_path, "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+def summarize_file(file_path: str, full: bool = False) -> Dict:
+    """
+    Lê o resumo de um arquivo .es3
+
+    Args:
+        file_path: Caminho do arquivo
+        full: Se deve interpretar o JSON inteiro e incluir os dados do mundo
+            e dos jogadores (senão só os campos do resumo são extraídos)
+
+    Returns:
+        Dict: Resultado com "summary" (e "world"/"players" se full)
+    """
+    core = _core()
+    try:
+        result = {"file": file_path, "ok": True, "size": os.path.getsize(file_path)}
+        if not full:
+            result["summary"] = core.read_file_summary(file_path)
+            return result
+        success, message = core.open_save_file(file_path)
+        if not success:
+            raise ValueError(message)
+        result["summary"] = core.get_file_info()
+        result["world"] = core.get_world_data()
+        result["players"] = core.get_player_data()
+        core.json_data = None
+        return result
+    except Exception as e:
+        core.json_data = None
+        return _failure(file_path, e)
+
+
+def decrypt_file(file_path: str, output_file: str) -> Dict:
+    """Descriptografa um .es3 para um arquivo JSON, em streaming"""
+    try:
+        written = 0
+        with open(output_file, 'wb') as f:
+            for chunk in _core().iter_decrypt_es3(file_path):
+                f.write(chunk)
+                written += len(chunk)
+        return {"file": file_path, "ok": True, "output": output_file, "bytes": written}
+    except Exception as e:
+        return _failure(file_path, e)
+
+
+def encrypt_file(file_path: str, output_file: str, should_gzip: bool = False) -> Dict:
+    """Criptografa um arquivo JSON para .es3, validando o conteúdo"""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        load_json(data)
+        if not _core().encrypt_es3(data, output_file, should_gzip=should_gzip):
+            raise OSError("Erro ao salvar o arquivo")
+        return {"file": file_path, "ok": True, "output": output_file}
+    except Exception as e:
+        return _failure(file_path, e)
+
+
+def _run_batch(func: Callable, batch: List[tuple]) -> List[Dict]:
+    # As mensagens de erro do núcleo (print) não se misturam à saída de quem chamou
+    with redirect_stdout(sys.stderr):
+        return [func(*args) for args in batch]
+
+
+def run_bulk(func: Callable, tasks: Sequence[tuple], workers: Optional[int] = None,
+             chunk_size: Optional[int] = None, ordered: bool = True) -> Iterator[Dict]:
+    """
+    Executa func(*args) para cada tupla de tasks em um pool de processos
+
+    Args:
+        func: Função de nível de módulo (precisa ser serializável)
+        tasks: Argumentos de cada chamada
+        workers: Número de processos (padrão: número de CPUs)
+        chunk_size: Arquivos por lote (padrão: tasks divididas em
+            CHUNKS_PER_WORKER lotes por processo)
+        ordered: Se os resultados saem na ordem de tasks; senão saem à
+            medida que os lotes terminam
+
+    Returns:
+        Iterator[Dict]: Um resultado por tarefa
+    """
+    tasks = list(tasks)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) < MIN_PARALLEL_ITEMS:
+        for args in tasks:
+            yield func(*args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    chunk_size = chunk_size or max(1, -(-len(tasks) // (workers * CHUNKS_PER_WORKER)))
+    batches = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(_run_batch, func, batch) for batch in batches]
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                yield from future.result()
+        finally:
+            # Se o consumidor parar antes do fim, os lotes pendentes são descartados
+            for future in futures:
+                future.cancel()
+
+
+def bulk_summarize(file_paths: Sequence[str], full: bool = False, **options) -> Iterator[Dict]:
+    """
+    Lê o resumo de muitos arquivos .es3 em paralelo
+
+    Args:
+        file_paths: Arquivos a ler
+        full: Veja summarize_file
+        **options: workers, chunk_size e ordered (veja run_bulk)
+    """
+    return run_bulk(summarize_file, [(path, full) for path in file_paths], **options)
+
+
+def bulk_decrypt(pairs: Sequence[tuple], **options) -> Iterator[Dict]:
+    """
+    Descriptografa muitos arquivos em paralelo
+
+    Args:
+        pairs: Pares (arquivo .es3, arquivo JSON de saída)
+        **options: workers, chunk_size e ordered (veja run_bulk)
+    """
+    return run_bulk(decrypt_file, list(pairs), **options)
+
+
+def bulk_encrypt(pairs: Sequence[tuple], should_gzip: bool = False, **options) -> Iterator[Dict]:
+    """
+    Criptografa muitos arquivos em paralelo
+
+    Args:
+        pairs: Pares (arquivo JSON, arquivo .es3 de saída)
+        should_gzip: Se deve comprimir antes de criptografar
+        **options: workers, chunk_size e ordered (veja run_bulk)
+    """
+    return run_bulk(encrypt_file, [(src, dst, should_gzip) for src, dst in pairs], **options)
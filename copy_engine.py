@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de cópia paralela de arquivos
+
+Percorre a árvore uma única vez e copia os arquivos em um pool de threads
+limitado, para que a latência de abrir/fechar cada arquivo não se acumule.
+O conteúdo é copiado pelo kernel sempre que possível (os.copy_file_range,
+depois os.sendfile no Linux); se nenhum dos dois estiver disponível para o par de
+arquivos, cai para leitura/escrita em blocos. Os metadados são preservados
+como em shutil.copy2.
+
+Estratégias de cópia (COPY_STRATEGIES):
+- "copy": cópia normal do conteúdo
+- "reflink": clone copy-on-write (ioctl FICLONE no Linux, clonefile no macOS);
+  o destino compartilha os blocos da origem até um dos dois ser alterado, então
+  a cópia é quase instantânea e não ocupa espaço. Só funciona dentro do mesmo
+  sistema de arquivos e nos que suportam (btrfs, XFS, APFS...)
+- "hardlink": o destino vira outro nome do mesmo arquivo (como rsync
+  --link-dest), com as mesmas permissões e datas; só é seguro quando nenhum
+  dos dois nomes é alterado no lugar (a origem deve ser somente leitura e
+  quem edita o destino deve substituí-lo com os.replace)
+- "auto": resolve_strategy escolhe "reflink" se a pasta suportar, senão "copy"
+
+Quando o clone ou o link não é possível para um arquivo, ele é copiado
+normalmente.
+"""
+
+import errno
+import os
+import shutil
+import stat
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_COPY_WORKERS = min(8, os.cpu_count() or 4)
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+COPY_STRATEGIES = ("auto", "reflink", "hardlink", "copy")
+
+# _IOW(0x94, 9, int) de linux/fs.h: clona o arquivo inteiro
+FICLONE = 0x40049409
+
+# Erros que indicam que a cópia pelo kernel não vale para este par de arquivos
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                    errno.ENOTSUP, errno.EBADF, errno.EPERM, errno.ETXTBSY, errno.ENOTSOCK}
+# Erros de clone/link sem suporte (além dos acima)
+_UNSUPPORTED_ERRNOS = _FALLBACK_ERRNOS | {errno.ENOTTY, errno.EMLINK, errno.EACCES}
+
+# Estratégias suportadas por sistema de arquivos (st_dev), detectadas uma vez
+_supported_cache: Dict[int, Tuple[str, ...]] = {}
+_clonefile = None
+
+# (origem, destino, mtime_ns): com mtime_ns, o destino recebe esse mtime em
+# vez dos metadados da origem
+CopyJob = Tuple[str, str, Optional[int]]
+
+
+def _copy_data(src_fd: int, dst_fd: int):
+    """Copia o conteúdo entre dois descritores, a partir da posição atual de cada um"""
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+
+    # Só no Linux o sendfile aceita um arquivo comum como destino e offset None
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        try:
+            while os.sendfile(dst_fd, src_fd, None, COPY_CHUNK_SIZE):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+
+    while True:
+        data = os.read(src_fd, COPY_CHUNK_SIZE)
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view):]
+
+
+def _clone_data(src_fd: int, dst_fd: int) -> bool:
+    """
+    Clona o conteúdo de src_fd em dst_fd (Linux, FICLONE)
+
+    Returns:
+        bool: False se o clone não é suportado para este par de arquivos
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        return False
+    return True
+
+
+def _clone_path(src: str, dst: str) -> bool:
+    """
+    Clona src em dst pelo caminho (macOS, clonefile); dst não pode existir
+
+    Returns:
+        bool: False se o clone não é suportado para este par de arquivos
+    """
+    global _clonefile
+    if sys.platform != "darwin":
+        return False
+    if _clonefile is None:
+        # ctypes só é carregado quando um clone é de fato pedido
+        import ctypes
+        func = getattr(ctypes.CDLL(None, use_errno=True), "clonefile", None)
+        if func is not None:
+            func.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+            _clonefile = (func, ctypes.get_errno)
+        else:
+            _clonefile = False
+    if not _clonefile:
+        return False
+    func, get_errno = _clonefile
+    if func(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        return True
+    code = get_errno()
+    if code not in _UNSUPPORTED_ERRNOS:
+        raise OSError(code, os.strerror(code), dst)
+    return False
+
+
+def _link_path(src: str, dst: str) -> bool:
+    """
+    Cria dst como hardlink de src
+
+    Returns:
+        bool: False se o link não é suportado para este par de arquivos
+    """
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        return False
+    return True
+
+
+def remove_file(path: str):
+    """Remove um arquivo, mesmo se for somente leitura (no Windows, os.remove recusa)"""
+    try:
+        os.remove(path)
+    except PermissionError:
+        if os.name != "nt":
+            raise
+        os.chmod(path, stat.S_IWRITE)
+        os.remove(path)
+
+
+def _ensure_writable(path: str):
+    """Dá permissão de escrita ao dono de uma cópia feita de um arquivo somente leitura"""
+    mode = os.stat(path).st_mode
+    if not mode & stat.S_IWUSR:
+        os.chmod(path, stat.S_IMODE(mode) | stat.S_IWUSR)
+
+
+def copy_file(src: str, dst: str, preserve_metadata: bool = True, mtime_ns: Optional[int] = None,
+              strategy: str = "copy") -> int:
+    """
+    Copia um arquivo
+
+    Um destino existente com outros nomes (hardlink) ou somente leitura é
+    removido antes, para que a cópia não altere o arquivo compartilhado. A
+    cópia (ou o clone) de uma origem somente leitura sai com escrita para o
+    dono; um hardlink não: ele é o próprio arquivo de origem.
+
+    Args:
+        src: Arquivo de origem
+        dst: Arquivo de destino (sobrescrito se existir)
+        preserve_metadata: Se deve copiar permissões e datas (como shutil.copy2)
+        mtime_ns: Se informado, define este mtime no destino (ignorado em
+            hardlinks, que compartilham as datas da origem)
+        strategy: "copy", "reflink" ou "hardlink" (veja COPY_STRATEGIES); se
+            não for possível, o arquivo é copiado normalmente
+
+    Returns:
+        int: Número de bytes copiados
+    """
+    try:
+        dst_stat = os.lstat(dst)
+    except FileNotFoundError:
+        dst_stat = None
+    if dst_stat is not None and (dst_stat.st_nlink > 1 or strategy != "copy"
+                                 or not dst_stat.st_mode & stat.S_IWUSR):
+        # Link e clonefile exigem que o destino não exista
+        remove_file(dst)
+        dst_stat = None
+
+    if dst_stat is None and strategy == "hardlink" and _link_path(src, dst):
+        return os.path.getsize(dst)
+
+    if dst_stat is None and strategy == "reflink" and _clone_path(src, dst):
+        size = os.path.getsize(dst)
+        if preserve_metadata:
+            shutil.copystat(src, dst)
+        _ensure_writable(dst)
+        if mtime_ns is not None:
+            os.utime(dst, ns=(mtime_ns, mtime_ns))
+        return size
+
+    binary = getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | binary)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary, 0o666)
+        try:
+            if not (strategy == "reflink" and _clone_data(src_fd, dst_fd)):
+                _copy_data(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    if preserve_metadata:
+        shutil.copystat(src, dst)
+        _ensure_writable(dst)
+    if mtime_ns is not None:
+        os.utime(dst, ns=(mtime_ns, mtime_ns))
+    return size
+
+
+def copy_files(jobs: Iterable[CopyJob], workers: int = DEFAULT_COPY_WORKERS,
+               on_copied: Optional[Callable[[int], None]] = None,
+               preserve_metadata: bool = True, strategy: str = "copy") -> int:
+    """
+    Copia vários arquivos em paralelo
+
+    As pastas de destino já devem existir.
+
+    Args:
+        jobs: Cópias a fazer
+        workers: Número máximo de cópias simultâneas
+        on_copied: Chamado na thread que chamou copy_files com o tamanho de
+            cada arquivo copiado; se levantar uma exceção, as cópias que ainda
+            não começaram são canceladas e a exceção é repassada
+        preserve_metadata: Se deve copiar permissões e datas da origem
+        strategy: Estratégia de cada cópia (veja copy_file)
+
+    Returns:
+        int: Total de bytes copiados
+    """
+    jobs = list(jobs)
+    total = 0
+    if workers <= 1 or len(jobs) <= 1:
+        for src, dst, mtime_ns in jobs:
+            size = copy_file(src, dst, preserve_metadata, mtime_ns, strategy)
+            total += size
+            if on_copied:
+                on_copied(size)
+        return total
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="repo-copy") as executor:
+        futures = [executor.submit(copy_file, src, dst, preserve_metadata, mtime_ns, strategy)
+                   for src, dst, mtime_ns in jobs]
+        try:
+            for future in as_completed(futures):
+                size = future.result()
+                total += size
+                if on_copied:
+                    on_copied(size)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return total
+
+
+def copy_tree(src: str, dst: str, workers: int = DEFAULT_COPY_WORKERS,
+              on_copied: Optional[Callable[[int], None]] = None, strategy: str = "copy") -> int:
+    """
+    Copia uma pasta inteira, equivalente a shutil.copytree com cópias paralelas
+
+    Args:
+        src: Pasta de origem
+        dst: Pasta de destino (não pode existir)
+        workers: Número máximo de cópias simultâneas
+        on_copied: Veja copy_files
+        strategy: Estratégia de cada cópia (veja copy_file)
+
+    Returns:
+        int: Total de bytes copiados
+    """
+    jobs: List[CopyJob] = []
+    dirs = []
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        os.makedirs(dst_dir)
+        dirs.append((src_dir, dst_dir))
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                elif entry.is_dir():
+                    stack.append((entry.path, target))
+                else:
+                    jobs.append((entry.path, target, None))
+
+    total = copy_files(jobs, workers, on_copied, strategy=strategy)
+    # Como em copytree, as datas das pastas são copiadas depois do conteúdo
+    for src_dir, dst_dir in dirs:
+        shutil.copystat(src_dir, dst_dir)
+    return total
+
+
+def supported_strategies(directory: str) -> Tuple[str, ...]:
+    """
+    Detecta as estratégias de cópia que funcionam numa pasta
+
+    Cria dois arquivos temporários na pasta e tenta cloná-los e ligá-los. O
+    resultado fica guardado por sistema de arquivos.
+
+    Args:
+        directory: Pasta existente (origem e destino das cópias devem estar
+            no mesmo sistema de arquivos que ela)
+
+    Returns:
+        Tuple[str, ...]: Estratégias suportadas, sempre incluindo "copy"
+    """
+    device = os.stat(directory).st_dev
+    cached = _supported_cache.get(device)
+    if cached is not None:
+        return cached
+
+    supported = []
+    probe_dir = tempfile.mkdtemp(dir=directory, prefix=".probe-")
+    try:
+        src = os.path.join(probe_dir, "src")
+        with open(src, "wb") as f:
+            f.write(b"probe")
+        clone = os.path.join(probe_dir, "clone")
+        if sys.platform == "darwin":
+            cloned = _clone_path(src, clone)
+        else:
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                dst_fd = os.open(clone, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    cloned = _clone_data(src_fd, dst_fd)
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+        if cloned:
+            supported.append("reflink")
+        if _link_path(src, os.path.join(probe_dir, "link")):
+            supported.append("hardlink")
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(probe_dir, ignore_errors=True)
+    supported.append("copy")
+
+    _supported_cache[device] = tuple(supported)
+    return _supported_cache[device]
+
+
+def resolve_strategy(strategy: str, directory: str) -> str:
+    """
+    Escolhe a estratégia efetiva para cópias dentro de uma pasta
+
+    "auto" vira "reflink" quando suportado, senão "copy" (hardlink muda o
+    significado da cópia e só é usado quando pedido). Uma estratégia sem
+    suporte na pasta vira "copy".
+
+    Args:
+        strategy: Um dos COPY_STRATEGIES
+        directory: Pasta existente onde as cópias serão feitas
+
+    Returns:
+        str: "reflink", "hardlink" ou "copy"
+
+    Raises:
+        ValueError: Se a estratégia não existir
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(f"Estratégia de cópia inválida: {strategy}")
+    if strategy == "copy":
+        return strategy
+    supported = supported_strategies(directory)
+    if strategy == "auto":
+        return "reflink" if "reflink" in supported else "copy"
+    return strategy if strategy in supported else "copy"
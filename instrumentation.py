@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Medição de tempo das operações R.E.P.O (opcional)
+
+Mede as fases do trabalho pesado: leitura, derivação da chave, AES, GZip e
+JSON em SaveEditorCore; leitura da pasta, hashes, cópias e remoções em
+backups e restaurações; leitura das pastas ao atualizar as listas. Cada fase
+acumula o número de chamadas, o tempo total, os bytes e os arquivos
+processados, e guarda as últimas HISTORY_SIZE durações para os percentis e o
+histograma (janela móvel).
+
+Desligada (o padrão), phase() devolve sempre o mesmo objeto vazio e o custo
+é uma chamada de função. Os resultados podem ser exportados em JSON ou CSV
+(export) ou vistos no painel de depuração da interface.
+
+Com um diretório de perfis, profile_call roda a função sob o cProfile e grava
+um .prof (abra com python -m pstats ou snakeviz). O cProfile só enxerga a
+thread em que a função roda: as cópias feitas pelo pool de copy_engine e os
+processos de bulk_operations aparecem só como espera.
+
+Nomes das fases:
+    es3.read, es3.kdf, es3.aes, es3.gunzip, es3.gzip, es3.write
+    json.load, json.dump
+    backup.walk, backup.hash, backup.copy, backup.rmtree
+    restore.copy, restore.verify, restore.swap, restore.rmtree
+    lists.walk, lists.summaries
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+HISTORY_SIZE = 1000
+# Limites (em segundos) das faixas do histograma; a última faixa não tem limite
+HISTOGRAM_BOUNDS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+HISTOGRAM_LABELS = ("<0.1ms", "<1ms", "<10ms", "<100ms", "<1s", "<10s", ">=10s")
+CSV_FIELDS = ["phase", "count", "total_s", "mean_ms", "p50_ms", "p95_ms", "max_ms",
+              "bytes", "files", "mb_per_s"] + list(HISTOGRAM_LABELS)
+
+_enabled = False
+_profile_dir: Optional[str] = None
+_lock = threading.Lock()
+_phases: Dict[str, "_PhaseStats"] = {}
+_profile_count = 0
+# Só um cProfile pode estar ativo por vez (no Python 3.12+ um segundo levanta ValueError)
+_profile_lock = threading.Lock()
+
+
+class _PhaseStats:
+    """Totais de uma fase e as durações mais recentes"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.files = 0
+        self.recent = deque(maxlen=HISTORY_SIZE)
+
+
+class _Phase:
+    """Mede o tempo de um bloco with; bytes e arquivos podem ser somados dentro dele"""
+
+    __slots__ = ("name", "bytes", "files", "start")
+
+    def __init__(self, name: str, num_bytes: int, files: int):
+        self.name = name
+        self.bytes = num_bytes
+        self.files = files
+
+    def add(self, num_bytes: int = 0, files: int = 0):
+        self.bytes += num_bytes
+        self.files += files
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start, self.bytes, self.files)
+        return False
+
+
+class _NoPhase:
+    """Fase usada com a medição desligada: não faz nada"""
+
+    __slots__ = ()
+
+    def add(self, num_bytes: int = 0, files: int = 0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def enable(profile_dir: Optional[str] = None):
+    """
+    Liga a medição
+
+    Args:
+        profile_dir: Pasta dos .prof de profile_call; None não usa o cProfile
+    """
+    global _enabled, _profile_dir
+    _profile_dir = profile_dir
+    _enabled = True
+
+
+def disable():
+    """Desliga a medição (os resultados acumulados são mantidos)"""
+    global _enabled, _profile_dir
+    _enabled = False
+    _profile_dir = None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def profile_dir() -> Optional[str]:
+    """Pasta dos .prof, ou None se o cProfile não estiver ligado"""
+    return _profile_dir if _enabled else None
+
+
+def phase(name: str, num_bytes: int = 0, files: int = 0):
+    """
+    Mede um bloco with como uma fase
+
+    Exemplo:
+        with phase("backup.copy") as timer:
+            timer.add(copy_files(...))
+
+    Args:
+        name: Nome da fase (veja a lista no início do módulo)
+        num_bytes: Bytes processados, se já forem conhecidos
+        files: Arquivos processados
+
+    Returns:
+        Gerenciador de contexto com o método add(num_bytes, files)
+    """
+    if not _enabled:
+        return _NO_PHASE
+    return _Phase(name, num_bytes, files)
+
+
+def record(name: str, seconds: float, num_bytes: int = 0, files: int = 0):
+    """Registra uma medição feita fora de phase() (por exemplo, somada em um laço)"""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _phases.get(name)
+        if stats is None:
+            stats = _phases[name] = _PhaseStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        stats.bytes += num_bytes
+        stats.files += files
+        stats.recent.append(seconds)
+
+
+def reset():
+    """Descarta todos os resultados acumulados"""
+    with _lock:
+        _phases.clear()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def snapshot() -> List[Dict]:
+    """
+    Resume os resultados de cada fase
+
+    Returns:
+        List[Dict]: Uma linha por fase, em ordem de nome, com os campos de
+            CSV_FIELDS; percentis e histograma usam as últimas HISTORY_SIZE
+            medições, os demais campos contam todas
+    """
+    with _lock:
+        items = [(name, stats.count, stats.total, stats.max, stats.bytes, stats.files, sorted(stats.recent))
+                 for name, stats in sorted(_phases.items())]
+
+    rows = []
+    for name, count, total, longest, num_bytes, files, recent in items:
+        histogram = [0] * len(HISTOGRAM_LABELS)
+        bucket = 0
+        for seconds in recent:
+            while bucket < len(HISTOGRAM_BOUNDS) and seconds >= HISTOGRAM_BOUNDS[bucket]:
+                bucket += 1
+            histogram[bucket] += 1
+        row = {
+            "phase": name,
+            "count": count,
+            "total_s": round(total, 6),
+            "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(_percentile(recent, 0.5) * 1000, 3),
+            "p95_ms": round(_percentile(recent, 0.95) * 1000, 3),
+            "max_ms": round(longest * 1000, 3),
+            "bytes": num_bytes,
+            "files": files,
+            "mb_per_s": round(num_bytes / total / 1e6, 2) if num_bytes and total else None,
+        }
+        row.update(zip(HISTOGRAM_LABELS, histogram))
+        rows.append(row)
+    return rows
+
+
+def export(file_path: str) -> List[Dict]:
+    """
+    Grava os resultados (snapshot) em JSON ou, se o nome terminar em .csv, em CSV
+
+    Returns:
+        List[Dict]: As linhas gravadas
+    """
+    rows = snapshot()
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    if file_path.lower().endswith(".csv"):
+        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({"created": datetime.now().isoformat(timespec="seconds"), "phases": rows},
+                      f, indent=2, ensure_ascii=False)
+    return rows
+
+
+def profile_call(name: str, func: Callable, *args, **kwargs):
+    """
+    Chama func(*args, **kwargs), sob o cProfile se houver um diretório de perfis
+
+    O perfil é gravado em <profile_dir>/<name>_<data>_<n>.prof mesmo se a
+    função levantar uma exceção. Se outra chamada já estiver sendo perfilada
+    (por exemplo, a atualização das listas durante um backup), func roda sem
+    o cProfile em vez de esperar ou falhar.
+
+    Returns:
+        O resultado de func
+    """
+    global _profile_count
+    directory = profile_dir()
+    if directory is None or not _profile_lock.acquire(blocking=False):
+        return func(*args, **kwargs)
+
+    try:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            with _lock:
+                _profile_count += 1
+                count = _profile_count
+            os.makedirs(directory, exist_ok=True)
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            profiler.dump_stats(os.path.join(directory, f"{safe_name}_{timestamp}_{count}.prof"))
+    finally:
+        _profile_lock.release()
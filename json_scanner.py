@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leitor incremental de campos JSON
+
+Extrai apenas alguns campos de um documento JSON recebido em pedaços, sem
+montar a árvore de objetos. As subárvores que não levam a nenhum campo
+pedido são puladas com expressões regulares, contando só os colchetes e
+chaves, e a leitura pode parar assim que todos os campos forem encontrados.
+As subárvores puladas não são validadas.
+"""
+
+import json
+import re
+from typing import Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|NaN|-?Infinity')
+# Um número só termina num delimitador; antes disso ele pode continuar no próximo pedaço
+_TOKEN_RUN = re.compile(r'[^ \t\n\r,\]}]*')
+_LITERALS = {"true": True, "false": False, "null": None}
+# Trecho sem colchetes/chaves fora de strings: pulado de uma vez
+_SKIP_RUN = re.compile(r'[^"\[\]{}]*+(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"[^"\[\]{}]*+)*+')
+
+Path = Tuple
+
+
+class _Frame:
+    """Objeto ou lista aberta durante a leitura"""
+    __slots__ = ("is_object", "path", "state", "key", "index", "count_name", "count")
+
+    def __init__(self, is_object: bool, path: Path, count_name: Optional[str]):
+        self.is_object = is_object
+        self.path = path
+        self.state = "key_or_end" if is_object else "value_or_end"
+        self.key = None
+        self.index = 0
+        self.count_name = count_name
+        self.count = 0
+
+
+class JsonFieldScanner:
+    """Extrai valores escalares e contagens de filhos de caminhos específicos de um JSON"""
+
+    def __init__(self, values: Dict[str, Path], counts: Optional[Dict[str, Path]] = None):
+        """
+        Args:
+            values: Nome do resultado -> caminho de um valor escalar
+                (ex: {"level": ("runStats", "level")})
+            counts: Nome do resultado -> caminho de um objeto/lista cujos
+                filhos diretos devem ser contados
+        """
+        counts = counts or {}
+        self._value_paths = {tuple(path): name for name, path in values.items()}
+        self._count_paths = {tuple(path): name for name, path in counts.items()}
+        self._prefixes = {
+            tuple(path[:i])
+            for path in list(self._value_paths) + list(self._count_paths)
+            for i in range(len(path))
+        }
+        self._remaining = set(values) | set(counts)
+
+        self.results = {}
+        self.done = not self._remaining
+
+        self._buf = ""
+        self._pos = 0
+        self._stack = []
+        self._root_read = False
+        self._skip_depth = 0
+
+    def feed(self, text: str):
+        """
+        Processa mais um pedaço do documento
+
+        Args:
+            text: Próximo trecho do texto JSON
+        """
+        if self.done:
+            return
+        self._buf = self._buf[self._pos:] + text if self._pos else self._buf + text
+        self._pos = 0
+        self._run(final=False)
+
+    def close(self):
+        """
+        Indica o fim do documento
+
+        Raises:
+            ValueError: Se o JSON terminar no meio de um valor
+        """
+        if self.done:
+            return
+        self._run(final=True)
+        if not self.done and (self._stack or self._skip_depth or not self._root_read):
+            raise ValueError("JSON incompleto")
+
+    def _error(self):
+        raise ValueError(f"JSON inválido perto de: {self._buf[self._pos:self._pos + 20]!r}")
+
+    def _found(self, name: str, value):
+        self.results[name] = value
+        self._remaining.discard(name)
+        if not self._remaining:
+            self.done = True
+
+    def _value_path(self) -> Path:
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        return frame.path + ((frame.key,) if frame.is_object else (frame.index,))
+
+    def _after_value(self):
+        if not self._stack:
+            self._root_read = True
+            self.done = True
+            return
+        self._stack[-1].state = "comma_or_end"
+
+    def _read_scalar(self, final: bool):
+        """Lê um valor escalar; se faltam dados, devolve None sem avançar a posição"""
+        buf = self._buf
+        if buf[self._pos] == '"':
+            match = _STRING.match(buf, self._pos)
+            if not match:
+                if final:
+                    self._error()
+                return None
+            self._pos = match.end()
+            token = match.group()
+            return json.loads(token) if "\\" in token else token[1:-1]
+
+        token_end = _TOKEN_RUN.match(buf, self._pos).end()
+        if token_end == len(buf) and not final:
+            return None
+        match = _NUMBER.match(buf, self._pos)
+        if match and match.end() == token_end:
+            self._pos = match.end()
+            return json.loads(match.group())
+
+        literal = buf[self._pos:token_end]
+        if literal not in _LITERALS:
+            self._error()
+        self._pos = token_end
+        return _LITERALS[literal]
+
+    def _skip(self, final: bool) -> bool:
+        """Pula o restante de uma subárvore ignorada; devolve False se faltam dados"""
+        buf = self._buf
+        while self._skip_depth:
+            self._pos = _SKIP_RUN.match(buf, self._pos).end()
+            if self._pos >= len(buf):
+                return False
+            char = buf[self._pos]
+            if char == '"':
+                # String que continua no próximo pedaço
+                if final:
+                    self._error()
+                return False
+            self._pos += 1
+            self._skip_depth += 1 if char in "[{" else -1
+        self._after_value()
+        return True
+
+    def _start_value(self, final: bool) -> bool:
+        """Começa a ler o valor na posição atual; devolve False se faltam dados"""
+        path = self._value_path()
+        char = self._buf[self._pos]
+
+        if char in "[{":
+            self._pos += 1
+            is_object = char == "{"
+            if path in self._count_paths:
+                self._stack.append(_Frame(is_object, path, self._count_paths[path]))
+            elif path in self._prefixes:
+                self._stack.append(_Frame(is_object, path, None))
+            else:
+                self._skip_depth = 1
+                return self._skip(final)
+            return True
+
+        start = self._pos
+        value = self._read_scalar(final)
+        if self._pos == start:
+            return False
+        if path in self._value_paths:
+            self._found(self._value_paths[path], value)
+        self._after_value()
+        return True
+
+    def _close_frame(self):
+        self._pos += 1
+        frame = self._stack.pop()
+        if frame.count_name:
+            if not frame.is_object:
+                frame.count = frame.index + 1 if frame.state == "comma_or_end" else 0
+            self._found(frame.count_name, frame.count)
+        self._after_value()
+
+    def _run(self, final: bool):
+        buf = self._buf
+        while not self.done:
+            if self._skip_depth:
+                if not self._skip(final):
+                    return
+                continue
+
+            self._pos = _WHITESPACE.match(buf, self._pos).end()
+            if self._pos >= len(buf):
+                return
+
+            if not self._stack:
+                if not self._start_value(final):
+                    return
+                continue
+
+            frame = self._stack[-1]
+            char = buf[self._pos]
+            state = frame.state
+
+            if state == "key_or_end":
+                if char == "}":
+                    self._close_frame()
+                    continue
+                if char != '"':
+                    self._error()
+                key = self._read_scalar(final)
+                if key is None:
+                    return
+                frame.key = key
+                frame.count += 1
+                frame.state = "colon"
+            elif state == "colon":
+                if char != ":":
+                    self._error()
+                self._pos += 1
+                frame.state = "value"
+            elif state == "comma_or_end":
+                if char == ",":
+                    self._pos += 1
+                    if frame.is_object:
+                        frame.state = "key_or_end"
+                    else:
+                        frame.index += 1
+                        frame.state = "value"
+                elif char == ("}" if frame.is_object else "]"):
+                    self._close_frame()
+                else:
+                    self._error()
+            else:
+                if state == "value_or_end" and char == "]":
+                    self._close_frame()
+                    continue
+                if not self._start_value(final):
+                    return
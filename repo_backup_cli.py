@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Linha de comando do Backup/Editor de Saves R.E.P.O
+
+Executa as mesmas operações da interface sem abrir janela (e sem importar
+tkinter), para uso em scripts e tarefas agendadas. A saída é sempre JSON em
+stdout; mensagens de erro das operações vão para stderr.
+
+Exemplos:
+    python repo_backup_cli.py list
+    python repo_backup_cli.py backup --all
+    python repo_backup_cli.py restore REPO_SAVE_1_backup_20250501_120000
+    python repo_backup_cli.py prune --keep 10 --daily 7 --max-bytes 500000000
+    python repo_backup_cli.py watch --debounce 5
+    python repo_backup_cli.py verify
+    python repo_backup_cli.py diff REPO_SAVE_1_backup_20250501_120000
+    python repo_backup_cli.py summarize saves/REPO_SAVE_* --jobs 4
+    python repo_backup_cli.py decrypt saves/REPO_SAVE_1 --output-dir dump
+    python repo_backup_cli.py edit saves/REPO_SAVE_1/REPO_SAVE_1.es3 --set world.currency=500
+    python repo_backup_cli.py backup --all --timings tempos.csv --profile perfis
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List
+
+from bulk_operations import bulk_decrypt, bulk_encrypt, bulk_summarize
+from backup_scrub import scrub
+from backup_retention import RETENTION_KEYS, apply_retention, load_policy, policy_enabled
+from backup_store import (BackupStore, format_size, original_folder_name, scan_backups,
+                          scan_save_folders)
+from copy_engine import COPY_STRATEGIES, DEFAULT_COPY_WORKERS
+import instrumentation
+from save_diff import diff_backup, diff_save_files
+from save_editor_core import SaveEditorCore
+from save_schema import PLAYER_UPGRADES, WORLD_FIELDS
+from save_watcher import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, SaveWatcher
+
+CONFIG_FILE = "config.json"
+
+
+def load_config() -> Dict:
+    """Carrega o config.json da interface, se existir"""
+    try:
+        with open(os.path.abspath(CONFIG_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def default_saves_path(config: Dict) -> str:
+    """Pasta dos saves do config.json ou a pasta padrão do jogo"""
+    if config.get("saves_path"):
+        return config["saves_path"]
+    if platform.system() == "Windows":
+        username = os.environ.get("USERNAME", "Usuario")
+        return f"C:/Users/{username}/AppData/LocalLow/semiwork/Repo/saves"
+    return os.path.join(os.path.expanduser("~"), ".local/share/semiwork/Repo/saves")
+
+
+def expand_save_files(paths: List[str], suffix: str = ".es3") -> List[str]:
+    """Troca cada pasta da lista pelos seus arquivos com a extensão pedida"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(suffix)
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def output_path(file_path: str, output_dir, suffix: str) -> str:
+    """Arquivo de saída com a nova extensão, ao lado do original ou em output_dir"""
+    base = os.path.splitext(file_path)[0] + suffix
+    if not output_dir:
+        return base
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, os.path.basename(base))
+
+
+def _failure(key: str, value: str, error: Exception) -> Dict:
+    return {key: value, "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+def _store(args) -> BackupStore:
+    # Só backup e watch têm a opção --delta; os demais comandos leem deltas sem ela
+    return BackupStore(args.saves_path, args.workers, args.copy_strategy, getattr(args, "delta", False))
+
+
+def cmd_list(args) -> List[Dict]:
+    """Lista as pastas de save e os backups"""
+    backups, backup_dirs = scan_backups(args.saves_path)
+    folders = scan_save_folders(args.saves_path, backup_dirs)
+    index = None
+    if args.summary:
+        from save_index import SaveIndex
+        index = SaveIndex(os.path.abspath("save_index.json"))
+
+    results = []
+    for folder in sorted(folders, key=lambda folder: folder["name"]):
+        entry = {
+            "type": "save",
+            "name": folder["name"],
+            "path": folder["path"],
+            "modified": datetime.fromtimestamp(folder["modified"]).isoformat(timespec="seconds"),
+            "has_backup": folder["has_backup"]
+        }
+        if index:
+            entry["summary"] = index.folder_summary(folder["path"])
+        results.append(entry)
+    if index:
+        index.prune(args.saves_path)
+        index.save()
+
+    for backup in backups:
+        results.append({
+            "type": "backup",
+            "name": backup["name"],
+            "kind": backup["kind"],
+            "format": backup["format"],
+            "folder": original_folder_name(backup["name"]),
+            "created": datetime.fromtimestamp(backup["created"]).isoformat(timespec="seconds")
+        })
+    return results
+
+
+def _backup_folders(args, store: BackupStore, folders: List[str]) -> List[Dict]:
+    """Faz backup das pastas e aplica a política de retenção às que mudaram"""
+    results = []
+    for folder_name in folders:
+        try:
+            result = store.backup_folder(folder_name, incremental=not args.full, archive=args.archive)
+        except Exception as e:
+            results.append(_failure("folder", folder_name, e))
+            continue
+        results.append({
+            "folder": folder_name,
+            "ok": True,
+            "snapshot": result["snapshot"],
+            "changed": result["changed"],
+            "transferred": format_size(result["stats"]["bytes_transferred"]),
+            "stats": result["stats"]
+        })
+
+    # Política de retenção do config.json, só nas pastas que ganharam backup novo
+    changed = [result["folder"] for result in results if result.get("changed")]
+    if changed and policy_enabled(args.retention) and not args.no_prune:
+        try:
+            pruned = apply_retention(store, args.retention, changed)
+        except Exception as e:
+            results.append(_failure("prune", "retention", e))
+            return results
+        for result in results:
+            if result.get("changed"):
+                result["pruned"] = [entry["backup"] for entry in pruned["delete"]
+                                    if entry["folder"] == result["folder"]]
+        results.append({"prune": "retention", "ok": True, "deleted": len(pruned["delete"]),
+                        "freed": format_size(pruned["freed"])})
+    return results
+
+
+def cmd_backup(args) -> List[Dict]:
+    """Faz backup de uma ou mais pastas de save"""
+    folders = args.folders
+    if args.all:
+        _, backup_dirs = scan_backups(args.saves_path)
+        folders = sorted(folder["name"] for folder in scan_save_folders(args.saves_path, backup_dirs))
+    return _backup_folders(args, _store(args), folders)
+
+
+def cmd_watch(args) -> List[Dict]:
+    """Faz backup incremental de cada pasta de save quando o jogo termina de gravá-la"""
+    import queue
+    import time
+
+    ready = queue.Queue()
+    watcher = SaveWatcher(args.saves_path, ready.put, debounce=args.debounce,
+                          poll_interval=args.poll_interval, use_inotify=not args.poll)
+    watcher.start()
+    print(f"Observando {args.saves_path} ({watcher.backend}); Ctrl+C para parar")
+    store = _store(args)
+    results = []
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                folder_name = ready.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if args.folders and folder_name not in args.folders:
+                continue
+            for result in _backup_folders(args, store, [folder_name]):
+                # Cada backup aparece em stderr assim que termina; o JSON final traz todos
+                print(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return results
+
+
+def cmd_restore(args) -> List[Dict]:
+    """Restaura backups para as pastas de save originais, ou extrai um único arquivo"""
+    store = _store(args)
+    results = []
+    if args.file:
+        backup_name = args.backups[0]
+        output = args.output or os.path.basename(args.file)
+        try:
+            store.extract_file(backup_name, args.file, output)
+            results.append({"backup": backup_name, "ok": True, "file": args.file, "output": output})
+        except Exception as e:
+            results.append(_failure("backup", backup_name, e))
+        return results
+
+    for backup_name in args.backups:
+        try:
+            path = store.restore(backup_name, verify=not args.no_verify)
+            results.append({"backup": backup_name, "ok": True, "path": path})
+        except Exception as e:
+            results.append(_failure("backup", backup_name, e))
+    return results
+
+
+def cmd_verify(args) -> List[Dict]:
+    """Confere hashes e descriptografia dos backups em paralelo"""
+    return scrub(_store(args), args.backups or None, decrypt=not args.no_decrypt, workers=args.jobs or args.workers)
+
+
+def cmd_diff(args) -> List[Dict]:
+    """Compara um backup com outro backup (ou com o save atual), ou dois arquivos .es3"""
+    if os.path.isfile(args.old):
+        # main já recusa esse caso; a verificação vale para quem chama cmd_diff direto
+        if not (args.new and os.path.isfile(args.new)):
+            raise ValueError("para comparar arquivos .es3, informe os dois arquivos")
+        changes = diff_save_files(args.old, args.new)
+        return [{"file": args.new, "ok": True, "status": "changed" if changes else "same", "changes": changes}]
+
+    results = []
+    for result in diff_backup(_store(args), args.old, args.new):
+        if args.changed_only and result["status"] == "same":
+            continue
+        results.append({"backup": args.old, "against": args.new or "save", "ok": result["status"] != "error",
+                        **result})
+    return results
+
+
+def _policy(args) -> Dict[str, int]:
+    return load_policy({key: getattr(args, key) for key in RETENTION_KEYS})
+
+
+def cmd_prune(args) -> List[Dict]:
+    """Exclui os backups históricos que a política de retenção não mantém"""
+    plan = apply_retention(_store(args), _policy(args), args.folders, dry_run=args.dry_run)
+    results = [
+        {"backup": entry["backup"], "ok": True, "deleted": not args.dry_run, "reason": entry["reason"]}
+        for entry in plan["delete"]
+    ]
+    results.append({
+        "summary": True,
+        "ok": True,
+        "estimated": format_size(plan["estimated_bytes"]),
+        "freed": format_size(plan["freed"]),
+        "total_bytes": plan["total_bytes"],
+        "remaining_bytes": plan["remaining_bytes"]
+    })
+    return results
+
+
+def _bulk_options(args) -> Dict:
+    return {"workers": args.jobs, "chunk_size": args.chunk_size, "ordered": not args.unordered}
+
+
+def cmd_summarize(args) -> List[Dict]:
+    """Lê o resumo de muitos arquivos .es3 em paralelo"""
+    return list(bulk_summarize(expand_save_files(args.files), full=args.full, **_bulk_options(args)))
+
+
+def cmd_decrypt(args) -> List[Dict]:
+    """Descriptografa arquivos .es3 para JSON"""
+    pairs = [(path, output_path(path, args.output_dir, ".json")) for path in expand_save_files(args.files)]
+    return list(bulk_decrypt(pairs, **_bulk_options(args)))
+
+
+def cmd_encrypt(args) -> List[Dict]:
+    """Criptografa arquivos JSON para .es3"""
+    pairs = [(path, output_path(path, args.output_dir, ".es3")) for path in expand_save_files(args.files, ".json")]
+    return list(bulk_encrypt(pairs, should_gzip=args.gzip, **_bulk_options(args)))
+
+
+def parse_assignment(assignment: str):
+    """
+    Interpreta uma alteração no formato caminho=valor
+
+    O valor é lido como JSON (números, true/false) e, se não for JSON
+    válido, como texto.
+
+    Raises:
+        ValueError: Se faltar o "="
+    """
+    path, sep, raw_value = assignment.partition("=")
+    if not sep:
+        raise ValueError(f"Alteração inválida (use caminho=valor): {assignment}")
+    try:
+        value = json.loads(raw_value)
+    except json.JSONDecodeError:
+        value = raw_value
+    return path.strip().split("."), value
+
+
+def apply_edits(core: SaveEditorCore, assignments: List[str]) -> List[str]:
+    """
+    Aplica alterações no save carregado, validando como a interface
+
+    Caminhos aceitos:
+        world.<campo>                       (level, currency, lives, ...)
+        player.<id ou *>.health
+        player.<id ou *>.<upgrade>          (speed, strength, ...)
+
+    Returns:
+        List[str]: Caminhos alterados
+
+    Raises:
+        ValueError: Se um caminho ou valor for inválido
+    """
+    player_ids = [player["id"] for player in core.get_player_data()]
+    world = {}
+    player_changes = {}
+    changed = []
+
+    for assignment in assignments:
+        path, value = parse_assignment(assignment)
+        if len(path) == 2 and path[0] == "world" and path[1] in WORLD_FIELDS:
+            world[path[1]] = value
+        elif len(path) == 3 and path[0] == "player":
+            targets = player_ids if path[1] == "*" else [path[1]]
+            for player_id in targets:
+                if player_id not in player_ids:
+                    raise ValueError(f"ID do jogador inválido: {player_id}")
+                change = player_changes.setdefault(player_id, {"health": None, "upgrades": {}})
+                if path[2] == "health":
+                    change["health"] = value
+                elif path[2] in PLAYER_UPGRADES:
+                    change["upgrades"][path[2]] = value
+                else:
+                    raise ValueError(f"Campo do jogador inválido: {path[2]}")
+        else:
+            raise ValueError(f"Caminho inválido: {'.'.join(path)}")
+        changed.append(".".join(path))
+
+    # Só os campos informados são validados e aplicados
+    if world:
+        valid, message = core.validate_world_data(world, partial=True)
+        if not valid or not core.update_world_data(world):
+            raise ValueError(message)
+    for player_id in sorted(player_changes):
+        change = player_changes[player_id]
+        valid, message = core.validate_player_data(player_id, change["health"], change["upgrades"])
+        if not valid:
+            raise ValueError(message)
+    if player_changes and not core.update_players(player_changes):
+        raise ValueError("Erro ao atualizar dados dos jogadores")
+    return changed
+
+
+def cmd_edit(args) -> List[Dict]:
+    """Altera campos de um ou mais saves"""
+    results = []
+    for file_path in expand_save_files(args.files):
+        core = SaveEditorCore()
+        try:
+            success, message = core.open_save_file(file_path)
+            if not success:
+                raise ValueError(message)
+            changed = apply_edits(core, args.set)
+            # Valores iguais aos do arquivo não contam: sem alterações, nada é gravado
+            modified = core.is_modified()
+            if modified and not args.dry_run:
+                success, message = core.save_file(file_path, compact=args.compact)
+                if not success:
+                    raise OSError(message)
+            results.append({"file": file_path, "ok": True, "changed": changed, "modified": modified,
+                            "saved": modified and not args.dry_run, "info": core.get_file_info()})
+        except Exception as e:
+            results.append(_failure("file", file_path, e))
+    return results
+
+
+COMMANDS = {
+    "list": cmd_list,
+    "backup": cmd_backup,
+    "restore": cmd_restore,
+    "prune": cmd_prune,
+    "watch": cmd_watch,
+    "verify": cmd_verify,
+    "diff": cmd_diff,
+    "summarize": cmd_summarize,
+    "decrypt": cmd_decrypt,
+    "encrypt": cmd_encrypt,
+    "edit": cmd_edit,
+}
+
+
+def build_parser(config: Dict) -> argparse.ArgumentParser:
+    def add_common_options(target: argparse.ArgumentParser, suppress: bool):
+        # As opções gerais valem antes ou depois do subcomando; nos subcomandos
+        # o padrão é SUPPRESS para não sobrescrever o valor dado antes
+        defaults = {
+            "saves_path": default_saves_path(config),
+            "workers": config.get("copy_workers", DEFAULT_COPY_WORKERS),
+            "copy_strategy": config.get("copy_strategy", "auto"),
+            "pretty": False,
+            "timings": None,
+            "profile": None
+        }
+        if suppress:
+            defaults = dict.fromkeys(defaults, argparse.SUPPRESS)
+        target.add_argument("--saves-path", default=defaults["saves_path"], help="Pasta base dos saves")
+        target.add_argument("--workers", type=int, default=defaults["workers"],
+                            help="Cópias simultâneas ao atualizar/restaurar backups")
+        target.add_argument("--copy-strategy", choices=COPY_STRATEGIES, default=defaults["copy_strategy"],
+                            help="Como copiar arquivos: clone copy-on-write (reflink), hardlink no backup "
+                                 "atual (hardlink), cópia normal (copy) ou reflink quando suportado (auto)")
+        target.add_argument("--pretty", action="store_true", default=defaults["pretty"], help="JSON indentado")
+        target.add_argument("--timings", default=defaults["timings"], metavar="ARQUIVO",
+                            help="Mede o tempo de cada fase e grava o resultado em JSON (ou CSV, se terminar em .csv)")
+        target.add_argument("--profile", default=defaults["profile"], metavar="PASTA",
+                            help="Executa o comando sob o cProfile e grava um .prof nesta pasta")
+
+    parser = argparse.ArgumentParser(description="Backup e edição de saves R.E.P.O sem interface gráfica")
+    add_common_options(parser, suppress=False)
+    common = argparse.ArgumentParser(add_help=False)
+    add_common_options(common, suppress=True)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, help_text: str) -> argparse.ArgumentParser:
+        return commands.add_parser(name, help=help_text, parents=[common])
+
+    list_parser = add_command("list", "Lista saves e backups")
+    list_parser.add_argument("--summary", action="store_true", help="Inclui o resumo de cada save")
+
+    retention = load_policy(config.get("retention"))
+
+    backup_parser = add_command("backup", "Faz backup de pastas de save")
+    backup_parser.set_defaults(retention=retention)
+    backup_parser.add_argument("folders", nargs="*", help="Nomes das pastas de save")
+    backup_parser.add_argument("--all", action="store_true", help="Todas as pastas de save")
+    backup_parser.add_argument("--full", action="store_true", help="Relê todos os arquivos (sem índice incremental)")
+    backup_parser.add_argument("--archive", action="store_true", default=config.get("backup_format") == "archive",
+                               help="Grava o backup histórico como .zip")
+    backup_parser.add_argument("--delta", action="store_true", default=config.get("delta_saves", False),
+                               help="Guarda os .es3 como diferença para o backup anterior")
+    backup_parser.add_argument("--no-prune", action="store_true",
+                               help="Não aplica a política de retenção do config.json depois do backup")
+
+    restore_parser = add_command("restore", "Restaura backups")
+    restore_parser.add_argument("backups", nargs="+", help="Nomes dos backups")
+    restore_parser.add_argument("--file", help="Extrai só este arquivo (caminho dentro do backup)")
+    restore_parser.add_argument("--output", help="Destino do arquivo extraído com --file")
+    restore_parser.add_argument("--no-verify", action="store_true",
+                                help="Restaura sem conferir os hashes registrados no backup")
+
+    verify_parser = add_command("verify", "Confere a integridade dos backups")
+    verify_parser.add_argument("backups", nargs="*", help="Nomes dos backups (padrão: todos)")
+    verify_parser.add_argument("--no-decrypt", action="store_true", help="Só confere tamanho e hash, sem abrir os .es3")
+    verify_parser.add_argument("--jobs", type=int, help="Verificações simultâneas (padrão: --workers)")
+
+    diff_parser = add_command("diff", "Mostra os valores que mudaram entre dois saves")
+    diff_parser.add_argument("old", help="Backup (ou arquivo .es3) antigo")
+    diff_parser.add_argument("new", nargs="?",
+                             help="Backup (ou arquivo .es3) novo; padrão: a pasta de save atual do backup")
+    diff_parser.add_argument("--changed-only", action="store_true", help="Omite os arquivos iguais")
+
+    prune_parser = add_command("prune", "Exclui backups históricos antigos")
+    prune_parser.add_argument("folders", nargs="*", help="Pastas de save (padrão: todas)")
+    # Sem a opção, vale o valor de "retention" no config.json; 0 desliga a regra
+    prune_parser.add_argument("--keep", dest="keep_last", type=int, default=retention["keep_last"],
+                              help="Backups históricos mais recentes mantidos por pasta")
+    prune_parser.add_argument("--hourly", dest="keep_hourly", type=int, default=retention["keep_hourly"],
+                              help="Mantém o último backup de cada uma das N últimas horas")
+    prune_parser.add_argument("--daily", dest="keep_daily", type=int, default=retention["keep_daily"],
+                              help="Mantém o último backup de cada um dos N últimos dias")
+    prune_parser.add_argument("--weekly", dest="keep_weekly", type=int, default=retention["keep_weekly"],
+                              help="Mantém o último backup de cada uma das N últimas semanas")
+    prune_parser.add_argument("--max-bytes", dest="max_bytes", type=int, default=retention["max_bytes"],
+                              help="Exclui os backups mais antigos até o total caber neste limite")
+    prune_parser.add_argument("--dry-run", action="store_true", help="Só lista o que seria excluído")
+
+    watch_parser = add_command("watch", "Faz backup automático quando um save é gravado")
+    watch_parser.add_argument("folders", nargs="*", help="Pastas de save (padrão: todas)")
+    watch_parser.add_argument("--full", action="store_true", help="Relê todos os arquivos (sem índice incremental)")
+    watch_parser.add_argument("--archive", action="store_true", default=config.get("backup_format") == "archive",
+                              help="Grava o backup histórico como .zip")
+    watch_parser.add_argument("--delta", action="store_true", default=config.get("delta_saves", False),
+                              help="Guarda os .es3 como diferença para o backup anterior")
+    watch_parser.add_argument("--no-prune", action="store_true",
+                              help="Não aplica a política de retenção do config.json depois do backup")
+    watch_parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                              help="Segundos sem escrita antes do backup")
+    watch_parser.add_argument("--poll", action="store_true", help="Usa varredura periódica em vez do inotify")
+    watch_parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                              help="Segundos entre as varreduras")
+    watch_parser.add_argument("--duration", type=float, default=0,
+                              help="Para depois de tantos segundos (padrão: até Ctrl+C)")
+    watch_parser.set_defaults(retention=retention)
+
+    for name, suffix in (("summarize", ".es3"), ("decrypt", ".es3"), ("encrypt", ".json")):
+        bulk_parser = add_command(name, f"{name} de arquivos {suffix} em paralelo")
+        bulk_parser.add_argument("files", nargs="+", help=f"Arquivos {suffix} ou pastas que os contêm")
+        bulk_parser.add_argument("--jobs", type=int, help="Processos (padrão: número de CPUs)")
+        bulk_parser.add_argument("--chunk-size", type=int, help="Arquivos por lote enviado a cada processo")
+        bulk_parser.add_argument("--unordered", action="store_true",
+                                 help="Resultados na ordem em que terminam, não na de entrada")
+        if name != "summarize":
+            bulk_parser.add_argument("--output-dir", help="Pasta de saída (padrão: ao lado de cada arquivo)")
+    commands.choices["summarize"].add_argument("--full", action="store_true",
+                                               help="Interpreta o JSON inteiro e inclui mundo e jogadores")
+    commands.choices["encrypt"].add_argument("--gzip", action="store_true", help="Comprime antes de criptografar")
+
+    edit_parser = add_command("edit", "Altera campos de saves")
+    edit_parser.add_argument("files", nargs="+", help="Arquivos .es3 ou pastas que os contêm")
+    edit_parser.add_argument("--set", action="append", required=True, metavar="CAMINHO=VALOR",
+                             help="Ex: world.currency=500, player.*.health=100, player.<id>.speed=3")
+    edit_parser.add_argument("--dry-run", action="store_true", help="Valida sem salvar")
+    edit_parser.add_argument("--compact", action="store_true", default=config.get("compact_saves", False),
+                             help="Grava o JSON sem indentação (arquivo menor)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser(load_config())
+    args = parser.parse_args(argv)
+    if args.command == "restore" and args.file and len(args.backups) != 1:
+        parser.error("--file exige exatamente um backup")
+    if args.command == "diff" and os.path.isfile(args.old) and not (args.new and os.path.isfile(args.new)):
+        parser.error("para comparar arquivos .es3, informe os dois arquivos")
+    if args.command == "backup" and not args.folders and not args.all:
+        parser.error("informe as pastas ou --all")
+    if args.command == "watch" and (args.debounce < 0 or args.poll_interval <= 0 or args.duration < 0):
+        parser.error("--debounce e --duration não podem ser negativos, e --poll-interval deve ser positivo")
+    if args.command == "prune":
+        if any(getattr(args, key) < 0 for key in RETENTION_KEYS):
+            parser.error("os limites da política de retenção não podem ser negativos")
+        if not policy_enabled(_policy(args)):
+            parser.error("informe --keep, --hourly, --daily, --weekly ou --max-bytes "
+                         "(ou \"retention\" no config.json)")
+
+    if args.timings or args.profile:
+        instrumentation.enable(args.profile)
+
+    # As operações do núcleo escrevem mensagens com print; stdout fica só com o JSON
+    with redirect_stdout(sys.stderr):
+        try:
+            results = instrumentation.profile_call(args.command, COMMANDS[args.command], args)
+            output = {"command": args.command, "ok": all(result.get("ok", True) for result in results),
+                      "results": results}
+        except Exception as e:
+            output = {"command": args.command, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        if args.timings:
+            try:
+                instrumentation.export(args.timings)
+            except OSError as e:
+                output.update(ok=False, timings_error=f"{type(e).__name__}: {e}")
+
+    json.dump(output, sys.stdout, indent=2 if args.pretty else None, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0 if output["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codificação por diferença (delta) dos saves R.E.P.O
+
+Saves consecutivos da mesma partida diferem em poucos valores do JSON, mas o
+encrypt_es3 usa um IV aleatório a cada gravação: o arquivo criptografado muda
+por inteiro e a deduplicação por arquivo não ajuda. Por isso o repositório
+de backups pode guardar um .es3 como a diferença entre o texto
+descriptografado dele e o do save anterior, mais o IV original. Com a mesma
+chave, o mesmo IV e o mesmo texto, o AES-CBC produz exatamente os mesmos
+bytes, então o arquivo restaurado é idêntico ao original (e confere com o
+SHA-256 do manifesto).
+
+O texto é dividido em trechos que terminam em "," ou quebra de linha, o que
+vale tanto para o JSON indentado do jogo quanto para o compacto. Os trechos
+do save novo são procurados no anterior, preferindo a posição logo depois da
+última cópia; o delta é uma sequência de cópias (posição e tamanho no texto
+anterior) e de trechos novos, compactada com zlib.
+
+Formato do objeto delta no repositório:
+    DELTA_MAGIC | SHA-256 do save base (32 bytes) | IV (16 bytes) | delta
+"""
+
+import re
+import zlib
+from bisect import bisect_left
+from itertools import accumulate
+from typing import List, Tuple, Union
+
+DELTA_MAGIC = b"RDL1"
+DELTA_HEADER_SIZE = len(DELTA_MAGIC) + 32 + 16
+
+_TOKEN = re.compile(rb"[^,\n]*[,\n]|[^,\n]+")
+
+# Operação do delta: (posição, tamanho) copiados do texto base, ou bytes novos
+DeltaOp = Union[Tuple[int, int], bytes]
+
+
+def _write_varint(value: int, out: bytearray):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Delta truncado")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def diff_ops(base: bytes, target: bytes) -> List[DeltaOp]:
+    """
+    Calcula as operações que transformam base em target
+
+    Returns:
+        List[DeltaOp]: Cópias do texto base e trechos novos, em ordem
+    """
+    base_tokens = _TOKEN.findall(base)
+    offsets = list(accumulate(map(len, base_tokens), initial=0))
+    positions = {}
+    for index, token in enumerate(base_tokens):
+        positions.setdefault(token, []).append(index)
+
+    ops: List[DeltaOp] = []
+    literal = []
+    copy_start = copy_end = -1
+    expected = 0
+    count = len(base_tokens)
+
+    def flush_copy():
+        if copy_end > copy_start:
+            ops.append((copy_start, copy_end - copy_start))
+
+    for token in _TOKEN.findall(target):
+        if expected < count and base_tokens[expected] == token:
+            index = expected
+        else:
+            candidates = positions.get(token)
+            if not candidates:
+                if copy_end > copy_start:
+                    flush_copy()
+                    copy_start = copy_end = -1
+                literal.append(token)
+                continue
+            # A ocorrência mais próxima depois da última cópia, senão a primeira
+            found = bisect_left(candidates, expected)
+            index = candidates[found] if found < len(candidates) else candidates[0]
+
+        if literal:
+            ops.append(b"".join(literal))
+            literal = []
+        if offsets[index] != copy_end:
+            flush_copy()
+            copy_start = offsets[index]
+        copy_end = offsets[index + 1]
+        expected = index + 1
+
+    flush_copy()
+    if literal:
+        ops.append(b"".join(literal))
+    return ops
+
+
+def make_delta(base: bytes, target: bytes) -> bytes:
+    """
+    Codifica target como diferença em relação a base
+
+    Returns:
+        bytes: Delta compactado (veja apply_delta)
+    """
+    out = bytearray()
+    for op in diff_ops(base, target):
+        if isinstance(op, tuple):
+            offset, length = op
+            _write_varint(length << 1, out)
+            _write_varint(offset, out)
+        else:
+            _write_varint(len(op) << 1 | 1, out)
+            out += op
+    return zlib.compress(bytes(out), 9)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Reconstrói o texto a partir do texto base e do delta de make_delta
+
+    Raises:
+        ValueError: Se o delta estiver corrompido ou não combinar com base
+    """
+    try:
+        data = zlib.decompress(delta)
+    except zlib.error as e:
+        raise ValueError(f"Delta corrompido: {e}") from e
+
+    parts = []
+    pos = 0
+    while pos < len(data):
+        header, pos = _read_varint(data, pos)
+        length = header >> 1
+        if header & 1:
+            if pos + length > len(data):
+                raise ValueError("Delta truncado")
+            parts.append(data[pos:pos + length])
+            pos += length
+        else:
+            offset, pos = _read_varint(data, pos)
+            if offset + length > len(base):
+                raise ValueError("Delta não combina com o save base")
+            parts.append(base[offset:offset + length])
+    return b"".join(parts)
+
+
+def pack_delta_object(base_digest: str, iv: bytes, delta: bytes) -> bytes:
+    """Monta o conteúdo de um objeto delta do repositório"""
+    return DELTA_MAGIC + bytes.fromhex(base_digest) + iv + delta
+
+
+def unpack_delta_object(data: bytes) -> Tuple[str, bytes, bytes]:
+    """
+    Lê um objeto delta do repositório
+
+    Returns:
+        Tuple[str, bytes, bytes]: SHA-256 do save base, IV e delta
+
+    Raises:
+        ValueError: Se o conteúdo não for um objeto delta
+    """
+    if len(data) < DELTA_HEADER_SIZE or not data.startswith(DELTA_MAGIC):
+        raise ValueError("Objeto delta inválido")
+    start = len(DELTA_MAGIC)
+    return data[start:start + 32].hex(), data[start + 32:DELTA_HEADER_SIZE], data[DELTA_HEADER_SIZE:]
+
+
+def read_delta_base(file_path: str) -> str:
+    """SHA-256 do save base de um objeto delta, lendo só o cabeçalho"""
+    with open(file_path, 'rb') as f:
+        base_digest, _, _ = unpack_delta_object(f.read(DELTA_HEADER_SIZE))
+    return base_digest
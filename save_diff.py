@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Comparação estrutural de saves R.E.P.O
+
+Compara o JSON descriptografado de dois saves (dois backups, ou um backup e
+a pasta de save atual) e lista os caminhos alterados, por exemplo
+runStats.currency ou playerUpgradeSpeed[<id>].
+
+O custo fica concentrado no que mudou:
+- arquivos com o mesmo SHA-256 nem são descriptografados; os manifestos e o
+  índice já guardam o hash de cada arquivo dos backups;
+- antes de descer numa subárvore, ela é comparada com a do outro save pela
+  igualdade nativa do Python (feita em C, que para na primeira diferença);
+  subárvores diferentes são percorridas direto, e nas iguais só falta
+  conferir o tipo de cada valor, já que para o == 1, 1.0 e True são iguais
+  (e o jogo distingue int de float). Isso sai mais barato que calcular um
+  hash de cada subárvore, que exigiria serializá-la;
+- dicionários indexados pelo ID do jogador só são percorridos chave a chave
+  quando diferem, então saves com muitos jogadores continuam rápidos.
+"""
+
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+from backup_store import BackupStore, SAVE_SUFFIX, hash_file, original_folder_name
+from save_editor_core import SaveEditorCore, load_json
+from save_schema import DICTIONARIES_PATH
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_MISSING = object()
+
+
+def format_path(path: Sequence) -> str:
+    """
+    Formata um caminho do JSON para exibição
+
+    O prefixo dictionaryOfDictionaries.value é omitido; chaves que não são
+    identificadores (IDs de jogador) e índices de lista aparecem entre
+    colchetes, como em playerUpgradeSpeed[76561198000000000].
+    """
+    path = tuple(path)
+    if path[:len(DICTIONARIES_PATH)] == DICTIONARIES_PATH and len(path) > len(DICTIONARIES_PATH):
+        path = path[len(DICTIONARIES_PATH):]
+    parts = []
+    for key in path:
+        if isinstance(key, str) and _IDENTIFIER.fullmatch(key):
+            parts.append(f".{key}" if parts else key)
+        else:
+            parts.append(f"[{key}]")
+    return "".join(parts)
+
+
+def _change(kind: str, path: List, old: Any, new: Any) -> Dict:
+    return {"path": format_path(path), "keys": path, "change": kind, "old": old, "new": new}
+
+
+def _same_types(old: Any, new: Any) -> bool:
+    """Confere os tipos de duas árvores que o == já considerou iguais"""
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        # O == garante as mesmas chaves
+        return all(_same_types(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return all(map(_same_types, old, new))
+    return True
+
+
+def _same(old: Any, new: Any) -> bool:
+    # Igualdade estrita em todos os níveis: True, 1 e 1.0 são valores diferentes
+    return old is new or (type(old) is type(new) and old == new and _same_types(old, new))
+
+
+def _diff(old: Any, new: Any, path: List, changes: List[Dict]):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, old_value in old.items():
+            new_value = new.get(key, _MISSING)
+            if new_value is _MISSING:
+                changes.append(_change("removed", path + [key], old_value, None))
+            elif not _same(old_value, new_value):
+                _diff(old_value, new_value, path + [key], changes)
+        for key, new_value in new.items():
+            if key not in old:
+                changes.append(_change("added", path + [key], None, new_value))
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            if not _same(old[index], new[index]):
+                _diff(old[index], new[index], path + [index], changes)
+        for index in range(common, len(old)):
+            changes.append(_change("removed", path + [index], old[index], None))
+        for index in range(common, len(new)):
+            changes.append(_change("added", path + [index], None, new[index]))
+        return
+
+    changes.append(_change("changed", path, old, new))
+
+
+def diff_trees(old: Any, new: Any) -> List[Dict]:
+    """
+    Compara duas árvores JSON já carregadas
+
+    Args:
+        old: Árvore antiga
+        new: Árvore nova
+
+    Returns:
+        List[Dict]: Uma entrada por caminho alterado: "path" (formatado),
+            "keys" (chaves e índices), "change" ("changed", "added" ou
+            "removed"), "old" e "new". Subárvores adicionadas ou removidas
+            aparecem como uma entrada só
+    """
+    changes: List[Dict] = []
+    if not _same(old, new):
+        _diff(old, new, [], changes)
+    return changes
+
+
+def diff_save_files(old_file: str, new_file: str, core: Optional[SaveEditorCore] = None) -> List[Dict]:
+    """
+    Compara dois arquivos .es3
+
+    Arquivos idênticos (mesmo SHA-256) não são descriptografados.
+
+    Returns:
+        List[Dict]: Caminhos alterados (veja diff_trees)
+    """
+    if hash_file(old_file) == hash_file(new_file):
+        return []
+    core = core or SaveEditorCore()
+    old, _ = load_json(core.decrypt_es3(old_file))
+    new, _ = load_json(core.decrypt_es3(new_file))
+    return diff_trees(old, new)
+
+
+class _Side:
+    """Arquivos de um lado da comparação: um backup ou a pasta de save atual"""
+
+    def __init__(self, store: BackupStore, core: SaveEditorCore, backup_name: Optional[str], folder_name: str):
+        self.store = store
+        self.core = core
+        self.backup_name = backup_name
+        self.cache: Dict[str, bytes] = {}
+        self.snapshot = backup_name is not None and store.has_snapshot(backup_name)
+        self.archive = backup_name is not None and store.has_archive(backup_name)
+        if backup_name is None:
+            self.folder = os.path.join(store.saves_base_path, folder_name)
+        elif not (self.snapshot or self.archive):
+            self.folder = os.path.join(store.backup_path, backup_name)
+        else:
+            self.folder = None
+
+        expected = store.expected_files(backup_name) if backup_name is not None else None
+        if expected is not None:
+            self.files = {rel_path: entry.get("sha256") for rel_path, entry in expected.items()}
+        else:
+            if not os.path.isdir(self.folder):
+                raise FileNotFoundError(self.folder)
+            self.files = {}
+            for current, _, file_names in os.walk(self.folder):
+                rel_dir = os.path.relpath(current, self.folder).replace(os.sep, "/")
+                for file_name in file_names:
+                    self.files[file_name if rel_dir == "." else f"{rel_dir}/{file_name}"] = None
+
+    def path(self, rel_path: str) -> str:
+        return os.path.join(self.folder, *rel_path.split("/"))
+
+    def digest(self, rel_path: str) -> Optional[str]:
+        """SHA-256 registrado do arquivo, ou calculado se for um arquivo da pasta"""
+        digest = self.files[rel_path]
+        if digest is None and self.folder is not None:
+            digest = self.files[rel_path] = hash_file(self.path(rel_path))
+        return digest
+
+    def load(self, rel_path: str) -> Any:
+        """Árvore JSON de um .es3"""
+        if self.snapshot:
+            return load_json(self.store.read_plaintext(self.files[rel_path], self.cache))[0]
+        if self.folder is not None:
+            return load_json(self.core.decrypt_es3(self.path(rel_path)))[0]
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_file = os.path.join(tmp, os.path.basename(rel_path))
+            self.store.extract_file(self.backup_name, rel_path, tmp_file)
+            return load_json(self.core.decrypt_es3(tmp_file))[0]
+
+
+def diff_backup(store: BackupStore, backup_name: str, other: Optional[str] = None,
+                core: Optional[SaveEditorCore] = None) -> List[Dict]:
+    """
+    Compara um backup com outro backup ou com a pasta de save atual
+
+    Args:
+        store: Repositório de backups
+        backup_name: Backup antigo, como exibido na lista
+        other: Backup novo; None compara com a pasta de save de backup_name
+        core: Editor usado para descriptografar (um novo, se omitido)
+
+    Returns:
+        List[Dict]: Um item por arquivo: "file", "status" ("same",
+            "changed", "added", "removed" ou "error") e, nos .es3, os
+            caminhos alterados em "changes" (veja diff_trees)
+
+    Raises:
+        FileNotFoundError: Se um dos backups (ou a pasta de save) não existir
+    """
+    core = core or SaveEditorCore()
+    old_side = _Side(store, core, backup_name, original_folder_name(backup_name))
+    new_side = _Side(store, core, other, original_folder_name(backup_name))
+
+    results = []
+    for rel_path in sorted(set(old_side.files) | set(new_side.files)):
+        if rel_path not in new_side.files:
+            results.append({"file": rel_path, "status": "removed"})
+            continue
+        if rel_path not in old_side.files:
+            results.append({"file": rel_path, "status": "added"})
+            continue
+        try:
+            old_digest = old_side.digest(rel_path)
+            if old_digest is not None and old_digest == new_side.digest(rel_path):
+                results.append({"file": rel_path, "status": "same"})
+                continue
+            if not rel_path.endswith(SAVE_SUFFIX):
+                results.append({"file": rel_path, "status": "changed"})
+                continue
+            # IVs diferentes mudam o arquivo inteiro: o conteúdo pode ser o mesmo
+            changes = diff_trees(old_side.load(rel_path), new_side.load(rel_path))
+            results.append({"file": rel_path, "status": "changed" if changes else "same", "changes": changes})
+        except Exception as e:
+            results.append({"file": rel_path, "status": "error", "error": f"{type(e).__name__}: {e}"})
+    return results
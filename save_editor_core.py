@@ -10,14 +10,264 @@ Este módulo contém as funcionalidades essenciais para:
 - Criptografar e salvar os arquivos modificados
 """
 
+import codecs
 import json
 import gzip
+import hashlib
+import math
 import os
-from typing import Dict, List, Optional, Tuple
-from Crypto.Cipher import AES
-from Crypto.Protocol.KDF import PBKDF2
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Hash import HMAC, SHA1
+import stat
+import time
+import zlib
+from contextlib import closing
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from instrumentation import phase, record
+from json_scanner import JsonFieldScanner
+from save_schema import PLAYER_HEALTH, PLAYER_NAME, PLAYER_UPGRADES, WORLD_FIELDS, read_players, read_world
+
+# Parâmetros da derivação de chave usados pelo ES3
+KDF_ITERATIONS = 100
+KEY_SIZE = 16
+KEY_CACHE_SIZE = 256
+BLOCK_SIZE = 16
+
+# Serialização usada por save_file: indentada (como o jogo grava) ou compacta
+INDENTED_JSON = {"indent": 4}
+COMPACT_JSON = {"separators": (',', ':')}
+
+# Inteiros com 19 dígitos ou mais podem sair da faixa de 64 bits, que o
+# orjson leria como float; documentos com números assim são lidos pelo json.
+# A busca é feita no texto com todos os dígitos trocados por "0" (bem mais
+# rápido que uma expressão regular)
+_DIGIT_MASK = bytes(0x30 if 0x30 <= byte <= 0x39 else 0x20 for byte in range(256))
+_LONG_NUMBER = b"0" * 19
+
+# Tamanho dos blocos lidos na descriptografia em streaming (múltiplo de 16)
+STREAM_CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Campos de get_file_info, lidos direto do arquivo por read_file_summary
+SUMMARY_VALUES = {name: WORLD_FIELDS[name].path for name in ("team_name", "level", "currency", "lives")}
+SUMMARY_COUNTS = {
+    "player_count": PLAYER_NAME.path
+}
+SUMMARY_FIELDS = ["team_name", "player_count", "level", "currency", "lives"]
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def derive_key(password: str, salt: bytes) -> bytes:
+    """
+    Deriva a chave AES do ES3 (PBKDF2-HMAC-SHA1, 100 iterações)
+
+    Usa a implementação nativa do hashlib e guarda as últimas chaves em um
+    cache LRU, já que abrir o mesmo arquivo de novo repete o mesmo IV.
+
+    Args:
+        password: Senha do ES3
+        salt: Salt da derivação (o IV do arquivo)
+
+    Returns:
+        bytes: Chave AES-128
+    """
+    return hashlib.pbkdf2_hmac('sha1', password.encode('utf-8'), salt, KDF_ITERATIONS, KEY_SIZE)
+
+
+def _new_cipher(key: bytes, iv: bytes):
+    """
+    Cria um cifrador AES-128-CBC
+
+    O pycryptodome só é importado aqui, no primeiro uso, para não pesar na
+    inicialização da interface e da linha de comando.
+    """
+    from Crypto.Cipher import AES
+    return AES.new(key, AES.MODE_CBC, iv)
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    """
+    Carrega o orjson no primeiro uso
+
+    Returns:
+        O módulo orjson, ou None se não estiver instalado
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def json_backend() -> str:
+    """Nome da biblioteca usada em load_json/dump_json ("orjson" ou "json")"""
+    return "orjson" if _orjson() else "json"
+
+
+def load_json(data: bytes) -> Tuple[Any, bool]:
+    """
+    Interpreta um documento JSON, com o orjson se estiver instalado
+
+    O orjson dá o mesmo resultado que o json da biblioteca padrão (ordem das
+    chaves, int x float, unicode), mas recusa NaN/Infinity e surrogates
+    soltos e leria inteiros fora de 64 bits como float. Nesses casos o
+    documento é lido com o json.
+
+    Args:
+        data: Documento em UTF-8
+
+    Returns:
+        Tuple[Any, bool]: (dados, True se o orjson leu o documento e pode
+            gravá-lo de volta)
+
+    Raises:
+        ValueError: Se o documento não for JSON válido
+    """
+    with phase("json.load", len(data)):
+        orjson = _orjson()
+        if orjson and _LONG_NUMBER not in data.translate(_DIGIT_MASK):
+            try:
+                return orjson.loads(data), True
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data.decode('utf-8')), False
+
+
+def dump_json(value, compact: bool = False, fast: bool = True) -> bytes:
+    """
+    Serializa um documento em UTF-8
+
+    O formato indentado (o que o jogo grava) sempre usa o json, pois o orjson
+    só indenta com 2 espaços. O compacto usa o orjson quando fast é True; a
+    única diferença no texto é que o orjson grava caracteres não ASCII
+    direto em UTF-8 em vez de escapá-los.
+
+    Args:
+        value: Dados a serializar
+        compact: Se deve gravar sem indentação nem espaços
+        fast: False quando os dados podem ter NaN/Infinity, que o orjson
+            gravaria como null (veja load_json)
+
+    Returns:
+        bytes: Documento serializado
+    """
+    with phase("json.dump") as timer:
+        orjson = _orjson() if compact and fast else None
+        if orjson:
+            try:
+                data = orjson.dumps(value)
+                timer.add(len(data))
+                return data
+            except orjson.JSONEncodeError:
+                pass
+        data = json.dumps(value, **(COMPACT_JSON if compact else INDENTED_JSON)).encode('utf-8')
+        timer.add(len(data))
+        return data
+
+
+def _has_non_finite(value) -> bool:
+    """Verifica se há NaN/Infinity em um valor (o orjson não os grava)"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def write_file_atomic(file_path: str, data: bytes):
+    """
+    Grava um arquivo por um temporário na mesma pasta, trocado com os.replace
+
+    O destino nunca é aberto para escrita: se ele for um hardlink (o backup
+    atual ligado aos objetos do repositório), só este nome passa a apontar
+    para o conteúdo novo, e os snapshots continuam intactos.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    try:
+        with open(tmp_path, 'xb') as f:
+            f.write(data)
+        try:
+            os.replace(tmp_path, file_path)
+        except PermissionError:
+            # No Windows, os.replace não sobrescreve um arquivo somente leitura
+            if os.name != "nt" or not os.path.exists(file_path):
+                raise
+            os.chmod(file_path, stat.S_IWRITE)
+            os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_full(f, view: memoryview) -> int:
+    """Preenche o buffer com dados do arquivo, parando só no fim do arquivo"""
+    total = 0
+    while total < len(view):
+        n = f.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+def _pkcs7_length(block: memoryview) -> int:
+    """Valida o padding PKCS#7 do último bloco e devolve o tamanho dele"""
+    pad_len = block[-1]
+    if not 1 <= pad_len <= BLOCK_SIZE or any(b != pad_len for b in block[-pad_len:]):
+        raise ValueError("Padding is incorrect.")
+    return pad_len
+
+
+class _PlaintextStream:
+    """Descomprime (se for GZip) os blocos de texto já descriptografados"""
+
+    def __init__(self, max_output: int):
+        self._max_output = max_output
+        self._decompressor = None
+        self._detected = False
+        self._pending_gzip = False
+        # Tempo e bytes descomprimidos, para a fase es3.gunzip
+        self.gunzip_time = 0.0
+        self.gunzip_bytes = 0
+
+    def feed(self, data) -> Iterator[bytes]:
+        if not self._detected:
+            self._detected = True
+            if bytes(data[:2]) == GZIP_MAGIC:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor is None:
+            if data:
+                yield bytes(data)
+            return
+
+        # A saída de cada chamada é limitada para não inflar um bloco inteiro de uma vez
+        while data or self._pending_gzip:
+            self._pending_gzip = True
+            start = time.perf_counter()
+            chunk = self._decompressor.decompress(data, self._max_output)
+            self.gunzip_time += time.perf_counter() - start
+            self.gunzip_bytes += len(chunk)
+            if chunk:
+                yield chunk
+            if self._decompressor.eof:
+                # Fim de um membro GZip: pode haver outro em seguida
+                self._pending_gzip = False
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                continue
+            data = self._decompressor.unconsumed_tail
+            if not data and len(chunk) < self._max_output:
+                break
+
+    def flush(self) -> bytes:
+        if self._decompressor is None:
+            return b''
+        if self._pending_gzip:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        return self._decompressor.flush()
 
 
 class SaveEditorCore:
@@ -25,6 +275,11 @@ class SaveEditorCore:
     
     def __init__(self):
         self.json_data = None
+        # Arquivo aberto e valores alterados desde então (caminho -> valor original)
+        self.file_path = None
+        self._original_values = {}
+        # Se o documento pode ser gravado pelo orjson (veja load_json)
+        self._fast_json = True
         self.password = "Why would you want to cheat?... :o It's no fun. :') :'D"
     
     def decrypt_es3(self, file_path: str) -> bytes:
@@ -40,27 +295,128 @@ class SaveEditorCore:
         Raises:
             Exception: Se houver erro na descriptografia
         """
+        return b''.join(self.iter_decrypt_es3(file_path))
+
+    def iter_decrypt_es3(self, file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Descriptografa um arquivo .es3 em blocos, sem carregá-lo inteiro na memória
+
+        Os blocos AES-CBC são lidos em buffers reaproveitados e, se o conteúdo
+        for GZip, passam por um descompressor incremental.
+
+        Args:
+            file_path: Caminho para o arquivo .es3
+            chunk_size: Tamanho de cada leitura (múltiplo de 16)
+
+        Returns:
+            Iterator[bytes]: Blocos dos dados descriptografados
+
+        Raises:
+            Exception: Se houver erro na descriptografia
+        """
+        if chunk_size <= 0 or chunk_size % BLOCK_SIZE:
+            raise ValueError("chunk_size deve ser um múltiplo positivo de 16")
+
         with open(file_path, 'rb') as f:
-            encrypted_data = f.read()
+            # Extrair o IV (primeiros 16 bytes)
+            iv = f.read(BLOCK_SIZE)
+            if len(iv) != BLOCK_SIZE:
+                raise ValueError("Arquivo .es3 truncado")
 
-        # Extrair o IV (primeiros 16 bytes)
-        iv = encrypted_data[:16]
-        encrypted_data = encrypted_data[16:]
+            # Arquivos pequenos não precisam de buffers do tamanho máximo
+            remaining = os.fstat(f.fileno()).st_size - BLOCK_SIZE
+            chunk_size = min(chunk_size, max(BLOCK_SIZE, -(-remaining // BLOCK_SIZE) * BLOCK_SIZE))
 
-        # Derivar a chave usando PBKDF2
-        key = PBKDF2(self.password, iv, dkLen=16, count=100, 
-                     prf=lambda p, s: HMAC.new(p, s, SHA1).digest())
+            # Descriptografar os dados usando AES-128-CBC
+            with phase("es3.kdf"):
+                key = derive_key(self.password, iv)
+            cipher = _new_cipher(key, iv)
+            plaintext = _PlaintextStream(STREAM_CHUNK_SIZE)
+
+            # Dois buffers de leitura: o próximo bloco é lido antes de processar
+            # o atual, para saber qual é o último (o que contém o padding)
+            current = memoryview(bytearray(chunk_size))
+            following = memoryview(bytearray(chunk_size))
+            output = memoryview(bytearray(chunk_size))
 
-        # Descriptografar os dados usando AES-128-CBC
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        decrypted_data = unpad(cipher.decrypt(encrypted_data), AES.block_size)
+            # Tempos somados bloco a bloco e registrados uma vez por arquivo
+            # (também se a leitura parar antes do fim)
+            clock = time.perf_counter
+            read_time = aes_time = 0.0
+            read_bytes = BLOCK_SIZE
+            try:
+                start = clock()
+                length = _read_full(f, current)
+                read_time += clock() - start
+                read_bytes += length
+                if length == 0 or length % BLOCK_SIZE:
+                    raise ValueError("Dados criptografados com tamanho inválido")
 
-        # Verificar se os dados estão comprimidos com GZip
-        if decrypted_data[:2] == b'\x1f\x8b':  # Número mágico do GZip
-            decrypted_data = gzip.decompress(decrypted_data)
+                while length:
+                    start = clock()
+                    next_length = _read_full(f, following)
+                    read_time += clock() - start
+                    read_bytes += next_length
+                    if next_length % BLOCK_SIZE:
+                        raise ValueError("Dados criptografados com tamanho inválido")
 
-        return decrypted_data
+                    start = clock()
+                    cipher.decrypt(current[:length], output=output[:length])
+                    aes_time += clock() - start
+                    end = length
+                    if next_length == 0:
+                        end -= _pkcs7_length(output[:length])
+
+                    yield from plaintext.feed(output[:end])
+
+                    current, following = following, current
+                    length = next_length
+
+                chunk = plaintext.flush()
+                if chunk:
+                    yield chunk
+            finally:
+                record("es3.read", read_time, read_bytes, 1)
+                record("es3.aes", aes_time, read_bytes - BLOCK_SIZE)
+                if plaintext.gunzip_bytes:
+                    record("es3.gunzip", plaintext.gunzip_time, plaintext.gunzip_bytes)
     
+    def encrypt_bytes(self, data: bytes, should_gzip: bool = False, iv: Optional[bytes] = None) -> bytes:
+        """
+        Criptografa dados no formato .es3 (IV seguido do AES-128-CBC)
+
+        Args:
+            data: Dados para criptografar
+            should_gzip: Se deve comprimir com gzip antes de criptografar
+            iv: IV a usar; None gera um aleatório. Com o IV de um arquivo
+                existente e o mesmo texto, o resultado é idêntico ao arquivo
+
+        Returns:
+            bytes: Conteúdo do arquivo .es3
+        """
+        # Comprimir os dados se necessário
+        if should_gzip:
+            with phase("es3.gzip", len(data)):
+                data = gzip.compress(data)
+
+        # Gerar um IV aleatório
+        if iv is None:
+            iv = os.urandom(16)
+
+        # Derivar a chave usando PBKDF2
+        with phase("es3.kdf"):
+            key = derive_key(self.password, iv)
+
+        # Criptografar os dados usando AES-128-CBC
+        with phase("es3.aes", len(data)):
+            cipher = _new_cipher(key, iv)
+            # Padding PKCS#7 (o inverso de _pkcs7_length)
+            pad_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
+            encrypted_data = cipher.encrypt(data + bytes([pad_len]) * pad_len)
+
+        # Adicionar o IV no início dos dados criptografados
+        return iv + encrypted_data
+
     def encrypt_es3(self, data: bytes, output_file: str, should_gzip: bool = False) -> bool:
         """
         Criptografa dados e salva em um arquivo .es3
@@ -74,27 +430,11 @@ class SaveEditorCore:
             bool: True se salvou com sucesso, False caso contrário
         """
         try:
-            # Comprimir os dados se necessário
-            if should_gzip:
-                data = gzip.compress(data)
-
-            # Gerar um IV aleatório
-            iv = os.urandom(16)
-
-            # Derivar a chave usando PBKDF2
-            key = PBKDF2(self.password, iv, dkLen=16, count=100,
-                         prf=lambda p, s: HMAC.new(p, s, SHA1).digest())
-
-            # Criptografar os dados usando AES-128-CBC
-            cipher = AES.new(key, AES.MODE_CBC, iv)
-            encrypted_data = cipher.encrypt(pad(data, AES.block_size))
-
-            # Adicionar o IV no início dos dados criptografados
-            result = iv + encrypted_data
+            result = self.encrypt_bytes(data, should_gzip)
             
             # Salvar o resultado no arquivo
-            with open(output_file, 'wb') as f:
-                f.write(result)
+            with phase("es3.write", len(result), 1):
+                write_file_atomic(output_file, result)
                 
             return True
         except Exception as e:
@@ -113,17 +453,26 @@ class SaveEditorCore:
         """
         try:
             decrypted_data = self.decrypt_es3(file_path)
-            self.json_data = json.loads(decrypted_data.decode('utf-8'))
+            self.json_data, self._fast_json = load_json(decrypted_data)
+            self.file_path = file_path
+            self._original_values = {}
             return True, "Arquivo aberto com sucesso"
         except Exception as e:
             return False, f"Erro ao abrir o arquivo: {str(e)}"
     
-    def save_file(self, file_path: str) -> Tuple[bool, str]:
+    def save_file(self, file_path: str, compact: bool = False) -> Tuple[bool, str]:
         """
         Salva e codifica os dados no arquivo de save
         
+        Se nada foi alterado desde a abertura e o destino é o próprio arquivo
+        aberto, nada é gravado. Só as alterações feitas pelos métodos desta
+        classe (update_*, set_value) são registradas; quem substituir
+        json_data diretamente deve salvar em outro caminho ou reabrir.
+        
         Args:
             file_path: Caminho onde salvar o arquivo
+            compact: Se deve gravar o JSON sem indentação nem espaços
+                (arquivo menor e criptografia mais rápida)
             
         Returns:
             Tuple[bool, str]: (sucesso, mensagem)
@@ -131,16 +480,76 @@ class SaveEditorCore:
         if not self.json_data:
             return False, "Nenhum dado para salvar"
             
+        if not self.is_modified() and self.file_path and os.path.abspath(file_path) == os.path.abspath(self.file_path):
+            return True, "Nenhuma alteração para salvar"
+            
         try:
-            json_str = json.dumps(self.json_data, indent=4)
-            success = self.encrypt_es3(json_str.encode('utf-8'), file_path)
+            data = dump_json(self.json_data, compact=compact, fast=self._fast_json)
+            success = self.encrypt_es3(data, file_path)
             if success:
+                self.file_path = file_path
+                self._original_values = {}
                 return True, "Arquivo salvo com sucesso"
             else:
                 return False, "Erro ao salvar o arquivo"
         except Exception as e:
             return False, f"Erro ao salvar o arquivo: {str(e)}"
     
+    def _assign(self, path: Sequence, value, parent=None):
+        """
+        Altera um valor existente do JSON registrando a alteração
+        
+        Args:
+            path: Caminho do valor
+            value: Novo valor
+            parent: Objeto que contém o valor, se já localizado
+            
+        Raises:
+            KeyError, IndexError, TypeError: Se o caminho não existir
+        """
+        if parent is None:
+            parent = self.json_data
+            for key in path[:-1]:
+                parent = parent[key]
+        if isinstance(parent, dict) and path[-1] not in parent:
+            raise KeyError(path[-1])
+        current = parent[path[-1]]
+        if type(current) is type(value) and current == value:
+            return
+            
+        if self._fast_json and _has_non_finite(value):
+            self._fast_json = False
+        path = tuple(path)
+        original = self._original_values.setdefault(path, current)
+        # Voltar ao valor original desfaz o registro
+        if type(original) is type(value) and original == value:
+            del self._original_values[path]
+        parent[path[-1]] = value
+        
+    def is_modified(self) -> bool:
+        """
+        Verifica se algum valor foi alterado desde a abertura ou o último salvamento
+        
+        Returns:
+            bool: True se há alterações a salvar
+        """
+        return bool(self._original_values)
+        
+    def get_changes(self) -> Dict[tuple, Tuple]:
+        """
+        Obtém as alterações feitas desde a abertura ou o último salvamento
+        
+        Returns:
+            Dict[tuple, Tuple]: Caminho -> (valor original, valor atual)
+        """
+        changes = {}
+        for path, original in self._original_values.items():
+            current = self.json_data
+            for key in path:
+                current = current[key]
+            changes[path] = (original, current)
+        return changes
+    
     def get_player_data(self) -> List[Dict]:
         """
         Obtém os dados dos jogadores do save
@@ -153,27 +562,7 @@ class SaveEditorCore:
             return players
             
         try:
-            player_names = self.json_data["playerNames"]["value"]
-            dictionaries = self.json_data["dictionaryOfDictionaries"]["value"]
-            
-            for player_id, player_name in player_names.items():
-                player_health = dictionaries["playerHealth"][player_id]
-                players.append({
-                    "id": player_id,
-                    "name": player_name,
-                    "health": player_health,
-                    "upgrades": {
-                        "health": dictionaries["playerUpgradeHealth"][player_id],
-                        "stamina": dictionaries["playerUpgradeStamina"][player_id],
-                        "extra_jump": dictionaries["playerUpgradeExtraJump"][player_id],
-                        "launch": dictionaries["playerUpgradeLaunch"][player_id],
-                        "map_player_count": dictionaries["playerUpgradeMapPlayerCount"][player_id],
-                        "speed": dictionaries["playerUpgradeSpeed"][player_id],
-                        "strength": dictionaries["playerUpgradeStrength"][player_id],
-                        "range": dictionaries["playerUpgradeRange"][player_id],
-                        "throw": dictionaries["playerUpgradeThrow"][player_id]
-                    }
-                })
+            players = read_players(self.json_data)
         except KeyError as e:
             print(f"Erro ao acessar dados do jogador: {e}")
             
@@ -190,27 +579,32 @@ class SaveEditorCore:
             return {}
             
         try:
-            run_stats = self.json_data["dictionaryOfDictionaries"]["value"]["runStats"]
-            return {
-                "level": run_stats["level"],
-                "currency": run_stats["currency"],
-                "lives": run_stats["lives"],
-                "charging_station": run_stats["chargingStationCharge"],
-                "total_haul": run_stats["totalHaul"],
-                "team_name": self.json_data["teamName"]["value"]
-            }
+            return read_world(self.json_data)
         except KeyError as e:
             print(f"Erro ao acessar dados do mundo: {e}")
             return {}
     
-    def update_player_data(self, player_id: str, health: int, upgrades: Dict) -> bool:
+    def update_player_data(self, player_id: str, health: Optional[int], upgrades: Dict) -> bool:
         """
         Atualiza os dados de um jogador
         
         Args:
             player_id: ID do jogador
-            health: Nova vida do jogador
-            upgrades: Dicionário com upgrades do jogador
+            health: Nova vida do jogador (None mantém a atual)
+            upgrades: Upgrades a alterar (os ausentes são mantidos)
+            
+        Returns:
+            bool: True se atualizou com sucesso
+        """
+        return self.update_players({player_id: {"health": health, "upgrades": upgrades}})
+    
+    def update_players(self, changes: Dict[str, Dict]) -> bool:
+        """
+        Atualiza os dados de vários jogadores numa só passada
+        
+        Args:
+            changes: ID do jogador -> {"health": vida ou None,
+                "upgrades": upgrades a alterar}
             
         Returns:
             bool: True se atualizou com sucesso
@@ -219,17 +613,17 @@ class SaveEditorCore:
             return False
             
         try:
-            dictionaries = self.json_data["dictionaryOfDictionaries"]["value"]
-            dictionaries["playerHealth"][player_id] = health
-            dictionaries["playerUpgradeHealth"][player_id] = upgrades["health"]
-            dictionaries["playerUpgradeStamina"][player_id] = upgrades["stamina"]
-            dictionaries["playerUpgradeExtraJump"][player_id] = upgrades["extra_jump"]
-            dictionaries["playerUpgradeLaunch"][player_id] = upgrades["launch"]
-            dictionaries["playerUpgradeMapPlayerCount"][player_id] = upgrades["map_player_count"]
-            dictionaries["playerUpgradeSpeed"][player_id] = upgrades["speed"]
-            dictionaries["playerUpgradeStrength"][player_id] = upgrades["strength"]
-            dictionaries["playerUpgradeRange"][player_id] = upgrades["range"]
-            dictionaries["playerUpgradeThrow"][player_id] = upgrades["throw"]
+            # Cada dicionário é localizado uma vez para todos os jogadores
+            tables = {}
+            for player_id, change in changes.items():
+                fields = [(PLAYER_HEALTH, change.get("health"))]
+                fields += [(PLAYER_UPGRADES[name], value) for name, value in change.get("upgrades", {}).items()]
+                for field, value in fields:
+                    if value is None:
+                        continue
+                    if field not in tables:
+                        tables[field] = field.get(self.json_data)
+                    self._assign(field.path + (player_id,), value, tables[field])
             return True
         except KeyError as e:
             print(f"Erro ao atualizar dados do jogador: {e}")
@@ -240,7 +634,7 @@ class SaveEditorCore:
         Atualiza os dados do mundo
         
         Args:
-            data: Dicionário com novos dados do mundo
+            data: Campos a alterar (os ausentes são mantidos)
             
         Returns:
             bool: True se atualizou com sucesso
@@ -249,17 +643,34 @@ class SaveEditorCore:
             return False
             
         try:
-            run_stats = self.json_data["dictionaryOfDictionaries"]["value"]["runStats"]
-            run_stats["level"] = data["level"]
-            run_stats["currency"] = data["currency"]
-            run_stats["lives"] = data["lives"]
-            run_stats["chargingStationCharge"] = data["charging_station"]
-            run_stats["totalHaul"] = data["total_haul"]
-            self.json_data["teamName"]["value"] = data["team_name"]
+            for name, value in data.items():
+                field = WORLD_FIELDS[name]
+                self._assign(field.path, value, field.container(self.json_data))
             return True
         except KeyError as e:
             print(f"Erro ao atualizar dados do mundo: {e}")
             return False
+
+    def set_value(self, path: Sequence, value) -> bool:
+        """
+        Altera um valor qualquer do JSON carregado (usado pelo editor JSON)
+        
+        Args:
+            path: Chaves e índices do valor, a partir da raiz
+            value: Novo valor
+            
+        Returns:
+            bool: True se o caminho existia e o valor foi alterado
+        """
+        if not self.json_data or not path:
+            return False
+            
+        try:
+            self._assign(path, value)
+            return True
+        except (KeyError, IndexError, TypeError) as e:
+            print(f"Erro ao alterar valor {'/'.join(map(str, path))}: {e}")
+            return False
     
     def get_file_info(self) -> Dict:
         """
@@ -272,17 +683,47 @@ class SaveEditorCore:
             return {}
             
         try:
-            return {
-                "team_name": self.json_data["teamName"]["value"],
-                "player_count": len(self.json_data["playerNames"]["value"]),
-                "level": self.json_data["dictionaryOfDictionaries"]["value"]["runStats"]["level"],
-                "currency": self.json_data["dictionaryOfDictionaries"]["value"]["runStats"]["currency"],
-                "lives": self.json_data["dictionaryOfDictionaries"]["value"]["runStats"]["lives"]
-            }
+            info = {name: WORLD_FIELDS[name].get(self.json_data) for name in SUMMARY_VALUES}
+            info["player_count"] = len(PLAYER_NAME.get(self.json_data))
+            return {field: info[field] for field in SUMMARY_FIELDS}
         except KeyError as e:
             print(f"Erro ao obter informações do arquivo: {e}")
             return {}
     
+    def read_file_summary(self, file_path: str) -> Dict:
+        """
+        Obtém as mesmas informações de get_file_info direto de um arquivo .es3
+
+        Não monta o JSON inteiro nem altera self.json_data: os campos são
+        extraídos durante a descriptografia em streaming, que para assim que
+        todos forem encontrados.
+
+        Args:
+            file_path: Caminho para o arquivo .es3
+
+        Returns:
+            Dict: Informações do arquivo (vazio se algum campo não existir)
+
+        Raises:
+            Exception: Se houver erro na descriptografia ou o JSON for inválido
+        """
+        scanner = JsonFieldScanner(SUMMARY_VALUES, SUMMARY_COUNTS)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        with closing(self.iter_decrypt_es3(file_path)) as chunks:
+            for chunk in chunks:
+                scanner.feed(decoder.decode(chunk))
+                if scanner.done:
+                    break
+            else:
+                scanner.feed(decoder.decode(b'', final=True))
+                scanner.close()
+
+        missing = [field for field in SUMMARY_FIELDS if field not in scanner.results]
+        if missing:
+            print(f"Erro ao obter informações do arquivo: {missing}")
+            return {}
+        return {field: scanner.results[field] for field in SUMMARY_FIELDS}
+
     def is_file_loaded(self) -> bool:
         """
         Verifica se um arquivo foi carregado
@@ -292,14 +733,14 @@ class SaveEditorCore:
         """
         return bool(self.json_data)
     
-    def validate_player_data(self, player_id: str, health: int, upgrades: Dict) -> Tuple[bool, str]:
+    def validate_player_data(self, player_id: str, health: Optional[int], upgrades: Dict) -> Tuple[bool, str]:
         """
         Valida os dados de um jogador antes da atualização
         
         Args:
             player_id: ID do jogador
-            health: Vida do jogador
-            upgrades: Upgrades do jogador
+            health: Vida do jogador (None se não for alterada)
+            upgrades: Upgrades a alterar
             
         Returns:
             Tuple[bool, str]: (válido, mensagem)
@@ -307,24 +748,30 @@ class SaveEditorCore:
         if not self.json_data:
             return False, "Nenhum arquivo carregado"
             
-        if player_id not in self.json_data["playerNames"]["value"]:
+        if player_id not in PLAYER_NAME.get(self.json_data):
             return False, f"ID do jogador inválido: {player_id}"
             
-        if not isinstance(health, int) or health < 0 or health > 200:
-            return False, "A vida deve ser um número inteiro entre 0 e 200"
+        error = PLAYER_HEALTH.validate(health) if health is not None else None
+        if error:
+            return False, error
             
         for key, value in upgrades.items():
-            if not isinstance(value, int) or value < 0:
-                return False, f"O upgrade {key} deve ser um número inteiro não negativo"
+            if key not in PLAYER_UPGRADES:
+                return False, f"Upgrade desconhecido: {key}"
+            error = PLAYER_UPGRADES[key].validate(value)
+            if error:
+                return False, error
                 
         return True, "Dados válidos"
     
-    def validate_world_data(self, data: Dict) -> Tuple[bool, str]:
+    def validate_world_data(self, data: Dict, partial: bool = False) -> Tuple[bool, str]:
         """
         Valida os dados do mundo antes da atualização
         
         Args:
             data: Dados do mundo
+            partial: Se data traz só os campos alterados (os ausentes não
+                são exigidos nem validados)
             
         Returns:
             Tuple[bool, str]: (válido, mensagem)
@@ -332,28 +779,18 @@ class SaveEditorCore:
         if not self.json_data:
             return False, "Nenhum arquivo carregado"
             
-        required_fields = ["level", "currency", "lives", "charging_station", "total_haul", "team_name"]
-        for field in required_fields:
-            if field not in data:
-                return False, f"Campo obrigatório: {field}"
-                
-        if not isinstance(data["level"], int) or data["level"] < 1:
-            return False, "O nível deve ser um número inteiro positivo"
-            
-        if not isinstance(data["currency"], int) or data["currency"] < 0:
-            return False, "A moeda deve ser um número inteiro não negativo"
-            
-        if not isinstance(data["lives"], int) or data["lives"] < 0:
-            return False, "As vidas devem ser um número inteiro não negativo"
-            
-        if not isinstance(data["charging_station"], int) or data["charging_station"] < 0:
-            return False, "A carga da estação deve ser um número inteiro não negativo"
-            
-        if not isinstance(data["total_haul"], int) or data["total_haul"] < 0:
-            return False, "O total de carga deve ser um número inteiro não negativo"
-            
-        if not isinstance(data["team_name"], str) or not data["team_name"]:
-            return False, "O nome da equipe não pode estar vazio"
+        for field in data:
+            if field not in WORLD_FIELDS:
+                return False, f"Campo desconhecido: {field}"
+        if not partial:
+            for field in WORLD_FIELDS:
+                if field not in data:
+                    return False, f"Campo obrigatório: {field}"
+                    
+        for name, field in WORLD_FIELDS.items():
+            error = field.validate(data[name]) if name in data else None
+            if error:
+                return False, error
             
         return True, "Dados válidos"
 
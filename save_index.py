@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice persistente das informações dos saves R.E.P.O
+
+Guarda, num JSON compacto ao lado do config.json, o tamanho, o mtime e o
+resumo (get_file_info) de cada arquivo .es3 já lido. Ao atualizar a lista,
+cada arquivo é apenas consultado com stat; só os que mudaram desde a última
+leitura são descriptografados de novo.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+from save_editor_core import SaveEditorCore
+
+INDEX_FORMAT = 1
+
+
+class SaveIndex:
+    """Cache em disco dos resumos dos arquivos de save"""
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        self.entries = {}
+        self._dirty = False
+        self._seen = set()
+        self._core = None
+        self.load()
+
+    def load(self):
+        """Carrega o índice do disco (um índice ausente ou corrompido começa vazio)"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("format") == INDEX_FORMAT:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+
+    def save(self):
+        """Grava o índice no disco, se houve alterações"""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.index_file))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"format": INDEX_FORMAT, "files": self.entries}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            print(f"Erro ao salvar índice de saves: {e}")
+
+    def file_summary(self, file_path: str, stat: Optional[os.stat_result] = None) -> Optional[Dict]:
+        """
+        Obtém o resumo de um arquivo .es3, usando o cache se ele não mudou
+
+        Args:
+            file_path: Caminho do arquivo .es3
+            stat: Resultado de os.stat do arquivo, se já disponível
+
+        Returns:
+            Optional[Dict]: Resumo do arquivo ou None se não puder ser lido
+        """
+        try:
+            stat = stat or os.stat(file_path)
+        except OSError:
+            return None
+
+        key = os.path.abspath(file_path)
+        self._seen.add(key)
+        entry = self.entries.get(key)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["summary"]
+
+        if self._core is None:
+            self._core = SaveEditorCore()
+        try:
+            summary = self._core.read_file_summary(file_path) or None
+        except Exception as e:
+            print(f"Erro ao ler resumo de {file_path}: {e}")
+            summary = None
+
+        # Mesmo arquivos ilegíveis são guardados, para não tentar de novo até mudarem
+        self.entries[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "summary": summary}
+        self._dirty = True
+        return summary
+
+    def folder_summary(self, folder_path: str) -> Optional[Dict]:
+        """
+        Obtém o resumo do arquivo de save principal de uma pasta
+
+        O arquivo principal é <pasta>.es3; se não existir, usa o primeiro .es3
+        em ordem alfabética.
+
+        Args:
+            folder_path: Caminho da pasta de save
+
+        Returns:
+            Optional[Dict]: Resumo do save ou None se não houver .es3 legível
+        """
+        main_file = os.path.join(folder_path, os.path.basename(os.path.normpath(folder_path)) + ".es3")
+        try:
+            return self.file_summary(main_file, os.stat(main_file))
+        except OSError:
+            pass
+        try:
+            es3_files = sorted(name for name in os.listdir(folder_path) if name.endswith(".es3"))
+        except OSError:
+            return None
+        if not es3_files:
+            return None
+        return self.file_summary(os.path.join(folder_path, es3_files[0]))
+
+    def prune(self, saves_base_path: str):
+        """
+        Remove do índice os arquivos de saves_base_path que não foram
+        consultados desde o último prune (pastas ou arquivos que sumiram)
+
+        Args:
+            saves_base_path: Pasta base dos saves que acabou de ser listada
+        """
+        prefix = os.path.abspath(saves_base_path) + os.sep
+        for key in list(self.entries):
+            if key.startswith(prefix) and key not in self._seen:
+                del self.entries[key]
+                self._dirty = True
+        self._seen.clear()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Esquema dos campos editáveis dos saves R.E.P.O
+
+Cada campo é descrito uma única vez: nome lógico, caminho no JSON, tipo e
+limites. Ao carregar o módulo, o caminho é compilado em uma função de
+acesso (compile_path), usada por SaveEditorCore para ler, validar e
+alterar os campos.
+
+Os campos dos jogadores são dicionários indexados pelo ID do jogador
+(dictionaryOfDictionaries.value.<dicionário>.<id>): cada dicionário é
+localizado uma vez e então lido para todos os jogadores numa só passada.
+
+Quando o jogo ganhar um upgrade novo, basta acrescentá-lo em
+PLAYER_UPGRADES (e a tradução do nome em translations.json).
+"""
+
+from functools import reduce
+from operator import getitem
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DICTIONARIES_PATH = ("dictionaryOfDictionaries", "value")
+RUN_STATS_PATH = DICTIONARIES_PATH + ("runStats",)
+
+
+def compile_path(path: Sequence) -> Callable[[Any], Any]:
+    """
+    Cria uma função que lê um caminho fixo do JSON
+
+    Args:
+        path: Chaves e índices, a partir da raiz
+
+    Returns:
+        Callable: Função data -> valor (levanta KeyError se faltar algo)
+    """
+    path = tuple(path)
+    # Os caminhos do esquema são curtos: funções com os índices já
+    # encadeados evitam o laço a cada acesso
+    if len(path) == 0:
+        return lambda data: data
+    if len(path) == 1:
+        (a,) = path
+        return lambda data: data[a]
+    if len(path) == 2:
+        a, b = path
+        return lambda data: data[a][b]
+    if len(path) == 3:
+        a, b, c = path
+        return lambda data: data[a][b][c]
+    if len(path) == 4:
+        a, b, c, d = path
+        return lambda data: data[a][b][c][d]
+    return lambda data: reduce(getitem, path, data)
+
+
+class Field:
+    """Campo do save: caminho no JSON, tipo, limites e mensagem de erro"""
+
+    __slots__ = ("name", "path", "type", "minimum", "maximum", "default", "message", "get", "container")
+
+    def __init__(self, name: str, path: Sequence, value_type: type = int,
+                 minimum: Optional[int] = None, maximum: Optional[int] = None,
+                 default: Any = 0, message: str = ""):
+        """
+        Args:
+            name: Nome lógico (também a chave de tradução)
+            path: Caminho do valor; nos campos de jogador, do dicionário
+                indexado pelo ID
+            value_type: Tipo aceito (int ou str)
+            minimum: Menor valor aceito (em textos, o menor comprimento)
+            maximum: Maior valor aceito
+            default: Valor exibido quando o campo não existe no save
+            message: Mensagem de validate quando o valor é inválido
+        """
+        self.name = name
+        self.path = tuple(path)
+        self.type = value_type
+        self.minimum = minimum
+        self.maximum = maximum
+        self.default = default
+        self.message = message
+        self.get = compile_path(self.path)
+        self.container = compile_path(self.path[:-1])
+
+    def validate(self, value) -> Optional[str]:
+        """
+        Valida um valor do campo
+
+        Returns:
+            Optional[str]: Mensagem de erro, ou None se o valor for válido
+        """
+        if not isinstance(value, self.type):
+            return self.message
+        size = len(value) if isinstance(value, str) else value
+        if self.minimum is not None and size < self.minimum:
+            return self.message
+        if self.maximum is not None and size > self.maximum:
+            return self.message
+        return None
+
+
+def _upgrade(name: str, dictionary: str) -> Field:
+    return Field(name, DICTIONARIES_PATH + (dictionary,), minimum=0,
+                 message=f"O upgrade {name} deve ser um número inteiro não negativo")
+
+
+# Campos do mundo, na ordem em que aparecem no editor
+WORLD_FIELDS: Dict[str, Field] = {field.name: field for field in [
+    Field("team_name", ("teamName", "value"), str, minimum=1, default="",
+          message="O nome da equipe não pode estar vazio"),
+    Field("level", RUN_STATS_PATH + ("level",), minimum=1, default=1,
+          message="O nível deve ser um número inteiro positivo"),
+    Field("currency", RUN_STATS_PATH + ("currency",), minimum=0,
+          message="A moeda deve ser um número inteiro não negativo"),
+    Field("lives", RUN_STATS_PATH + ("lives",), minimum=0, default=3,
+          message="As vidas devem ser um número inteiro não negativo"),
+    Field("charging_station", RUN_STATS_PATH + ("chargingStationCharge",), minimum=0, default=100,
+          message="A carga da estação deve ser um número inteiro não negativo"),
+    Field("total_haul", RUN_STATS_PATH + ("totalHaul",), minimum=0,
+          message="O total de carga deve ser um número inteiro não negativo"),
+]}
+
+# Campos dos jogadores (dicionários indexados pelo ID)
+PLAYER_NAME = Field("name", ("playerNames", "value"), str)
+PLAYER_HEALTH = Field("health", DICTIONARIES_PATH + ("playerHealth",), minimum=0, maximum=200,
+                      message="A vida deve ser um número inteiro entre 0 e 200")
+PLAYER_UPGRADES: Dict[str, Field] = {field.name: field for field in [
+    _upgrade("health", "playerUpgradeHealth"),
+    _upgrade("stamina", "playerUpgradeStamina"),
+    _upgrade("extra_jump", "playerUpgradeExtraJump"),
+    _upgrade("launch", "playerUpgradeLaunch"),
+    _upgrade("map_player_count", "playerUpgradeMapPlayerCount"),
+    _upgrade("speed", "playerUpgradeSpeed"),
+    _upgrade("strength", "playerUpgradeStrength"),
+    _upgrade("range", "playerUpgradeRange"),
+    _upgrade("throw", "playerUpgradeThrow"),
+]}
+
+
+def read_world(data) -> Dict[str, Any]:
+    """
+    Lê todos os campos do mundo
+
+    Raises:
+        KeyError: Se algum campo não existir
+    """
+    return {name: field.get(data) for name, field in WORLD_FIELDS.items()}
+
+
+def read_players(data) -> List[Dict]:
+    """
+    Lê os campos de todos os jogadores numa só passada
+
+    Cada dicionário (vida, upgrades) é localizado uma vez, e não uma vez
+    por jogador.
+
+    Returns:
+        List[Dict]: "id", "name", "health" e "upgrades" de cada jogador
+
+    Raises:
+        KeyError: Se algum campo não existir
+    """
+    health = PLAYER_HEALTH.get(data)
+    upgrades = [(name, field.get(data)) for name, field in PLAYER_UPGRADES.items()]
+    return [
+        {
+            "id": player_id,
+            "name": player_name,
+            "health": health[player_id],
+            "upgrades": {name: table[player_id] for name, table in upgrades}
+        }
+        for player_id, player_name in PLAYER_NAME.get(data).items()
+    ]
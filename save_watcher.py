@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monitoramento da pasta de saves R.E.P.O para backup automático
+
+Observa as pastas de save dentro de saves_base_path e avisa quando o jogo
+termina de gravar os arquivos .es3 de uma delas, para que só essa pasta
+receba um backup incremental.
+
+No Linux os eventos vêm do inotify (via ctypes, importado só quando o
+monitor começa; sem dependências): a thread fica bloqueada em select
+enquanto nada acontece. Nos demais sistemas, ou se
+o inotify não estiver disponível, as pastas são varridas a cada
+poll_interval comparando tamanho e mtime dos .es3.
+
+Uma pasta só é considerada pronta quando:
+- nenhuma escrita aconteceu nos últimos `debounce` segundos (rajadas de
+  gravação geram um único aviso);
+- nenhum .es3 foi modificado sem ser fechado depois (inotify);
+- tamanho e mtime dos .es3 não mudaram entre duas leituras separadas por
+  STABLE_DELAY e todos podem ser abertos para leitura (no Windows o jogo
+  mantém o arquivo travado enquanto grava).
+Assim um arquivo gravado pela metade nunca é copiado.
+"""
+
+import os
+import platform
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backup_store import BACKUP_DIR_NAME
+
+WATCH_SUFFIX = ".es3"
+DEFAULT_DEBOUNCE = 3.0
+DEFAULT_POLL_INTERVAL = 2.0
+# Intervalo entre as duas leituras que confirmam que os arquivos pararam de mudar
+STABLE_DELAY = 0.5
+# Um arquivo aberto para escrita há mais tempo que isso não segura mais o backup
+MAX_WRITE_WAIT = 60.0
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_BASE_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+_FOLDER_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+                | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+# (pasta de save, arquivo ou None para a pasta inteira, True se a escrita terminou)
+WatchEvent = Tuple[str, Optional[str], bool]
+
+
+def is_save_folder(saves_base_path: str, name: str) -> bool:
+    """Verifica se um nome dentro de saves_base_path é uma pasta de save a observar"""
+    return (name != BACKUP_DIR_NAME and not name.startswith(".")
+            and os.path.isdir(os.path.join(saves_base_path, name)))
+
+
+def folder_signature(folder_path: str) -> Optional[Tuple]:
+    """
+    Lê nome, tamanho e mtime dos .es3 de uma pasta de save
+
+    Returns:
+        Optional[Tuple]: Assinatura da pasta, ou None se algum arquivo
+            ainda não puder ser aberto (travado pelo jogo)
+
+    Raises:
+        FileNotFoundError: Se a pasta não existir mais
+    """
+    entries = []
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if not entry.name.endswith(WATCH_SUFFIX) or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, 'rb'):
+                    pass
+                stat = entry.stat()
+            except PermissionError:
+                return None
+            except FileNotFoundError:
+                # Substituído no meio da leitura: a próxima assinatura será diferente
+                return None
+            entries.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+class _InotifySource:
+    """Eventos das pastas de save pelo inotify do Linux"""
+
+    name = "inotify"
+
+    def __init__(self, saves_base_path: str):
+        """
+        Raises:
+            OSError: Se o inotify não estiver disponível
+        """
+        import ctypes
+
+        self.saves_base_path = saves_base_path
+        self._get_errno = ctypes.get_errno
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        for function in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch"):
+            if not hasattr(self._libc, function):
+                raise OSError(f"{function} indisponível")
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 falhou")
+        self._wake_r, self._wake_w = os.pipe()
+        # wd -> (pasta, inode): o inotify devolve o mesmo wd para a mesma pasta
+        # observada, mesmo renomeada
+        self._folders: Dict[int, Tuple[str, int]] = {}
+        try:
+            self._base_wd = self._add_watch(saves_base_path, _BASE_MASK)
+            for name in os.listdir(saves_base_path):
+                if is_save_folder(saves_base_path, name):
+                    self._watch_folder(name)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno_value = self._get_errno()
+            raise OSError(errno_value, os.strerror(errno_value), path)
+        return wd
+
+    def _watch_folder(self, name: str) -> bool:
+        path = os.path.join(self.saves_base_path, name)
+        try:
+            wd = self._add_watch(path, _FOLDER_MASK)
+            self._folders[wd] = (name, os.stat(path).st_ino)
+        except OSError:
+            # Removida ou renomeada antes de ser observada
+            return False
+        return True
+
+    def _still_watched(self, wd: int) -> bool:
+        """Verifica se a pasta de um wd continua (ou voltou a estar) no lugar registrado"""
+        name, inode = self._folders[wd]
+        try:
+            return os.stat(os.path.join(self.saves_base_path, name)).st_ino == inode
+        except OSError:
+            return False
+
+    def _read_events(self) -> List[Tuple[int, int, str]]:
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append((wd, mask, name))
+
+    def wait(self, timeout: Optional[float]) -> List[WatchEvent]:
+        """Espera eventos por até timeout segundos (None: sem limite)"""
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            os.read(self._wake_r, _READ_SIZE)
+        if self._fd not in ready:
+            return []
+
+        results = []
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Eventos perdidos: todas as pastas precisam ser conferidas
+                results.extend((folder, None, True) for folder, _ in self._folders.values())
+            elif wd == self._base_wd:
+                if mask & IN_ISDIR and is_save_folder(self.saves_base_path, name) and self._watch_folder(name):
+                    # Pasta nova (ou trocada por uma restauração): os arquivos
+                    # podem ter sido gravados antes de a pasta ser observada
+                    results.append((name, None, True))
+            elif mask & IN_IGNORED:
+                self._folders.pop(wd, None)
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # A pasta observada saiu do lugar (se entrou em outro nome da
+                # pasta base, o evento da base já a registrou de novo)
+                if wd in self._folders and not self._still_watched(wd):
+                    del self._folders[wd]
+                    self._libc.inotify_rm_watch(self._fd, wd)
+            elif wd in self._folders and name.endswith(WATCH_SUFFIX):
+                results.append((self._folders[wd][0], name, not mask & IN_MODIFY))
+        return results
+
+    def wake(self):
+        """Interrompe um wait em andamento"""
+        os.write(self._wake_w, b"\0")
+
+    def close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class _PollingSource:
+    """Eventos das pastas de save por varredura periódica (tamanho e mtime dos .es3)"""
+
+    name = "polling"
+
+    def __init__(self, saves_base_path: str, poll_interval: float):
+        self.saves_base_path = saves_base_path
+        self.poll_interval = poll_interval
+        self._wake_event = threading.Event()
+        self._state = self._scan()
+
+    def _scan(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        state = {}
+        try:
+            with os.scandir(self.saves_base_path) as folders:
+                for folder in folders:
+                    if folder.name == BACKUP_DIR_NAME or folder.name.startswith(".") or not folder.is_dir():
+                        continue
+                    try:
+                        with os.scandir(folder.path) as files:
+                            for entry in files:
+                                if entry.name.endswith(WATCH_SUFFIX) and entry.is_file():
+                                    stat = entry.stat()
+                                    state[folder.name, entry.name] = (stat.st_size, stat.st_mtime_ns)
+                    except (FileNotFoundError, NotADirectoryError, PermissionError):
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return state
+
+    def wait(self, timeout: Optional[float]) -> List[WatchEvent]:
+        """Espera até a próxima varredura (ou até timeout, se for antes)"""
+        if timeout is None or timeout > self.poll_interval:
+            timeout = self.poll_interval
+        if self._wake_event.wait(timeout):
+            self._wake_event.clear()
+        state = self._scan()
+        changed = {key for key in state.keys() | self._state.keys() if state.get(key) != self._state.get(key)}
+        self._state = state
+        return [(folder, name, True) for folder, name in sorted(changed)]
+
+    def wake(self):
+        """Interrompe um wait em andamento"""
+        self._wake_event.set()
+
+    def close(self):
+        pass
+
+
+class SaveWatcher:
+    """Observa a pasta de saves e avisa quando uma pasta de save termina de ser gravada"""
+
+    def __init__(self, saves_base_path: str, on_change: Callable[[str], None],
+                 debounce: float = DEFAULT_DEBOUNCE, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_inotify: bool = True):
+        """
+        Args:
+            saves_base_path: Pasta base dos saves
+            on_change: Chamado (na thread do monitor) com o nome de cada pasta
+                de save pronta para backup
+            debounce: Segundos sem escrita antes de considerar a gravação terminada
+            poll_interval: Intervalo da varredura quando o inotify não é usado
+            use_inotify: Se deve tentar o inotify antes da varredura
+        """
+        self.saves_base_path = saves_base_path
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._source = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # Pasta -> prazo, início da espera, assinatura conferida e .es3 em escrita
+        self._pending: Dict[str, Dict] = {}
+
+    @property
+    def backend(self) -> Optional[str]:
+        """"inotify" ou "polling", depois de start"""
+        return self._source.name if self._source else None
+
+    def start(self):
+        """
+        Começa a observar em uma thread própria
+
+        Raises:
+            FileNotFoundError: Se a pasta de saves não existir
+        """
+        if not os.path.isdir(self.saves_base_path):
+            raise FileNotFoundError(self.saves_base_path)
+        self._source = None
+        if self.use_inotify and platform.system() == "Linux":
+            try:
+                self._source = _InotifySource(self.saves_base_path)
+            except OSError:
+                self._source = None
+        if self._source is None:
+            self._source = _PollingSource(self.saves_base_path, self.poll_interval)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="save-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Para de observar; avisos pendentes são descartados"""
+        self._stopped.set()
+        if self._source:
+            self._source.wake()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                now = time.monotonic()
+                deadlines = [state["deadline"] for state in self._pending.values()]
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                for folder, name, finished in self._source.wait(timeout):
+                    self._record(folder, name, finished)
+                if not self._stopped.is_set():
+                    self._flush_ready()
+        finally:
+            self._source.close()
+
+    def _record(self, folder: str, name: Optional[str], finished: bool):
+        """Registra uma escrita e adia o aviso da pasta"""
+        now = time.monotonic()
+        state = self._pending.setdefault(folder, {"since": now, "writing": set()})
+        state["deadline"] = now + self.debounce
+        state["signature"] = None
+        if name is not None:
+            if finished:
+                state["writing"].discard(name)
+            else:
+                state["writing"].add(name)
+
+    def _flush_ready(self):
+        """Avisa as pastas cujo prazo venceu e cujos arquivos estão estáveis"""
+        now = time.monotonic()
+        for folder, state in list(self._pending.items()):
+            if state["deadline"] > now:
+                continue
+            if state["writing"] and now - state["since"] < MAX_WRITE_WAIT:
+                # O jogo ainda não fechou o arquivo
+                state["deadline"] = now + self.debounce
+                continue
+            try:
+                signature = folder_signature(os.path.join(self.saves_base_path, folder))
+            except (FileNotFoundError, NotADirectoryError):
+                del self._pending[folder]
+                continue
+            if signature is None or signature != state["signature"]:
+                # Primeira leitura, arquivo travado ou ainda mudando: conferir de novo
+                state["signature"] = signature
+                state["deadline"] = now + STABLE_DELAY
+                continue
+            del self._pending[folder]
+            try:
+                self.on_change(folder)
+            except Exception as e:
+                print(f"Erro ao processar alteração em {folder}: {e}")